@@ -1,4 +1,6 @@
 
+import json
+from concurrent.futures import ProcessPoolExecutor
 from enum           import Enum
 from pathlib        import Path
 from re             import compile as re_compile
@@ -24,6 +26,10 @@ class SourceFile:
 		self.SeeAlso =                ""  # seeAlso
 
 
+class NoEntityException(Exception):
+	pass
+
+
 class Extract:
 	def __init__(self):
 		self.sourceDirectory =     Path("../src")
@@ -32,50 +38,97 @@ class Extract:
 
 		self.templateFile =     Path("Entity.template")
 		self.templateContent =  ""
+		self.templateMTime =    0
+
+		# modification times of source and template, and whether the source has an entity, after the last successful run
+		self.stampFile =        self.outputDirectory / ".poc.stamps"
 
 	def Run(self):
-		result = self.recursion(self.sourceDirectory)
+		sourceFiles = self.recursion(self.sourceDirectory)
 
 		print("Reading template file...")
 		with self.templateFile.open('r') as templateFileHandle:
 			self.templateContent = templateFileHandle.read()
+		self.templateMTime = self.templateFile.stat().st_mtime
+
+		stamps = self.readStamps()
+		staleFiles = [sourceFile for sourceFile in sourceFiles if self.isStale(sourceFile, stamps)]
+		print("Writing reStructuredText files for {0} of {1} source files...".format(len(staleFiles), len(sourceFiles)))
+
+		# the state machine is pure Python, so use processes instead of threads
+		with ProcessPoolExecutor() as pool:
+			for sourceFile, messages, stamp in pool.map(self.processFile, staleFiles, chunksize=8):
+				for message in messages:
+					print(message)
+				if (stamp is None):
+					stamps.pop(sourceFile.relative_to(self.sourceDirectory).as_posix(), None)
+				else:
+					stamps[sourceFile.relative_to(self.sourceDirectory).as_posix()] = stamp
 
-		print("Writing reStructuredText files...")
-		self.recursion2(result)
+		self.writeStamps(stamps)
 
 	def recursion(self, sourceDirectory):
-		result = {}
+		result = []
 
-		for item in sourceDirectory.iterdir():
+		for item in sorted(sourceDirectory.iterdir()):
 			if item.is_dir():
 				stem = item.stem
 				if (stem not in ["Altera", "altera", "Lattice", "lattice", "Xilinx", "xilinx"]):
 					print("cd {0}".format(stem))
-					result[stem] = self.recursion(item)
+					result += self.recursion(item)
 			elif item.is_file():
 				if (item.suffix == ".vhdl"):
 					if (not item.stem.endswith(("Altera", "altera", "Lattice", "lattice", "Xilinx", "xilinx"))):
-						try:
-							result[item.stem] = self.ExtractComments(item)
-						except Exception as ex:
-							print("    " + str(ex))
+						result.append(item)
 
 		return result
 
-	def recursion2(self, result):
-		for item in result.values():
-			if isinstance(item, dict):
-				self.recursion2(item)
-			elif isinstance(item, SourceFile):
-				self.writeReST(item)
+	def readStamps(self):
+		try:
+			with self.stampFile.open('r') as stampFileHandle:
+				return json.load(stampFileHandle)
+		except (OSError, ValueError):
+			return {}
+
+	def writeStamps(self, stamps):
+		with self.stampFile.open('w') as stampFileHandle:
+			json.dump(stamps, stampFileHandle, indent=1, sort_keys=True)
+
+	def isStale(self, sourceFile, stamps):
+		relPath =     sourceFile.relative_to(self.sourceDirectory)
+		outputFile =  self.outputDirectory / relPath.with_suffix(".rst")
+		sourceMTime = sourceFile.stat().st_mtime
+
+		# files without an entity have no output; unchanged outputs are not
+		# rewritten, so check the stamp before the output's modification time
+		stamp = stamps.get(relPath.as_posix())
+		if (stamp == [sourceMTime, self.templateMTime, False]):
+			return False
+		if (not outputFile.exists()):
+			return True
+		if (stamp == [sourceMTime, self.templateMTime, True]):
+			return False
+		return (max(sourceMTime, self.templateMTime) > outputFile.stat().st_mtime)
+
+	def processFile(self, sourceFile):
+		"""Runs in a worker process. Returns the messages to print and the new stamp, which is None after an error."""
+		messages = ["  Reading '{0!s}'...".format(sourceFile)]
+		sourceMTime = sourceFile.stat().st_mtime
+		try:
+			messages.append(self.writeReST(self.ExtractComments(sourceFile)))
+		except NoEntityException as ex:
+			messages.append("    " + str(ex))
+			return sourceFile, messages, [sourceMTime, self.templateMTime, False]
+		except Exception as ex:
+			messages.append("    " + str(ex))
+			return sourceFile, messages, None
+		return sourceFile, messages, [sourceMTime, self.templateMTime, True]
 
 	def writeReST(self, sourceFile):
 		relPath =     sourceFile.File.relative_to(self.sourceDirectory)
 		outputFile =  self.outputDirectory / relPath.with_suffix(".rst")
 		relSourceFile = ("../" * (len(relPath.parents) - 1)) / self.relSourceDirectory / relPath
 
-		print("Writing reST file '{0!s}'.".format(outputFile))
-
 		# print("  Authors: {0}".format(", ".join(sourceFile.Authors)))
 		# print("  Summary: {0}".format(sourceFile.Summary))
 		# print("  Entity '{0}' at {1}..{2}.".format(sourceFile.EntityName, sourceFile.EntitySourceCodeRange.StartRow, sourceFile.EntitySourceCodeRange.EndRow))
@@ -97,12 +150,17 @@ class Extract:
 			SeeAlsoBox=seeAlsoBox
 		)
 
+		# keep unchanged files, otherwise Sphinx would read them again
+		if outputFile.exists():
+			with outputFile.open('r') as restructuredTextHandle:
+				if (restructuredTextHandle.read() == outputContent):
+					return "Unchanged reST file '{0!s}'.".format(outputFile)
+
 		with outputFile.open('w') as restructuredTextHandle:
 			restructuredTextHandle.write(outputContent)
+		return "Writing reST file '{0!s}'.".format(outputFile)
 
 	def ExtractComments(self, sourceFile):
-		print("  Reading '{0!s}'...".format(sourceFile))
-
 		entityStartRegExpStr = r"(?i)\s*entity\s+(?P<EntityName>\w+)\s+is"
 		entityEndRegExpStr =   r"(?i)\s*end\s+entity(?:\s+\w+)?\s*;"
 
@@ -193,7 +251,7 @@ class Extract:
 						break
 
 			else:
-				raise Exception("No entity found. LastState = {0}".format(state.name))
+				raise NoEntityException("No entity found. LastState = {0}".format(state.name))
 
 		if (state is not State.EntityEnd):
 			raise Exception("Last state not reached. LastState = {0}".format(state.name))
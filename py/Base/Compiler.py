@@ -42,18 +42,34 @@ else:
 
 
 # load dependencies
+import hashlib
+import locale
+import mmap
+import multiprocessing
 import re
 import shutil
+import sys
+from collections        import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.util import Finalize as multiprocessing_Finalize
+from os                 import getpid, link as os_link, replace as os_replace, unlink as os_unlink
+from os.path            import samefile
 from pathlib            import Path
 
 from lib.Functions      import Init
 from lib.Parser         import ParserException
 from Base.Exceptions    import ExceptionBase, SkipableException
+from Base.Logging       import ILogable
 from Base.Project       import VHDLVersion, Environment, FileTypes
 from Base.Shared        import Shared
 from Parser.RulesParser import CopyRuleMixIn, ReplaceRuleMixIn, DeleteRuleMixIn, AppendLineRuleMixIn
 from PoC.Solution       import RulesFile
 
+try:
+	import fcntl
+except ImportError:
+	fcntl = None
+
 
 class CompilerException(ExceptionBase):
 	pass
@@ -74,23 +90,356 @@ class AppendLineTask(AppendLineRuleMixIn):
 	pass
 
 
+class RuleEngine(ILogable):
+	"""Applies replace and append-line tasks file by file.
+
+	All tasks of a file are applied in one in-memory pass and the file is
+	written (atomically) at most once. Compiled regular expressions are cached
+	until :meth:`ClearCache` is called, e.g. when a new rules file is loaded.
+	"""
+	_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+	def __init__(self, logger=None):
+		super().__init__(logger)
+		self._regExpCache = {}
+
+	def ClearCache(self):
+		self._regExpCache = {}
+
+	def GetRegExp(self, task):
+		regExpFlags = 0
+		if task.RegExpOption_CaseInsensitive: regExpFlags |= re.IGNORECASE
+		if task.RegExpOption_MultiLine:       regExpFlags |= re.MULTILINE
+		if task.RegExpOption_DotAll:          regExpFlags |= re.DOTALL
+
+		key = (task.SearchPattern, regExpFlags)
+		try:
+			return self._regExpCache[key]
+		except KeyError:
+			self._regExpCache[key] = regExp = re.compile(task.SearchPattern, regExpFlags)
+			return regExp
+
+	def ExecuteReplaceTasks(self, tasks, text):
+		# group tasks by file, but keep the order of tasks within a file
+		fileTasks = OrderedDict()
+		for task in tasks:
+			fileTasks.setdefault(task.FilePath, []).append(task)
+
+		for filePath, tasksOfFile in fileTasks.items():
+			if not filePath.exists(): raise CompilerException("Cannot {0}-replace in file '{1!s}'.".format(text, filePath)) from FileNotFoundError(str(filePath))
+
+			content =     self.ReadFile(filePath)
+			newContent =  content
+			for task in tasksOfFile:
+				if isinstance(task, AppendLineRuleMixIn):
+					self._LogDebug("{0}-append in file '{1!s}': '{2}'.".format(text, filePath, task.AppendPattern))
+					if (newContent and not newContent.endswith("\n")):
+						newContent += "\n"
+					newContent += task.AppendPattern + "\n"
+				else:
+					self._LogDebug("{0}-replace in file '{1!s}': search for '{2}' replace by '{3}'.".format(text, filePath, task.SearchPattern, task.ReplacePattern))
+					newContent, replaceCount = self.GetRegExp(task).subn(task.ReplacePattern, newContent)
+					if (replaceCount == 0):
+						self._LogWarning("  Search pattern '{0}' not found in file '{1!s}'.".format(task.SearchPattern, filePath))
+
+			if (newContent != content):
+				self.WriteFile(filePath, newContent)
+
+	def ReadFile(self, filePath):
+		try:
+			if (filePath.stat().st_size < self._MMAP_THRESHOLD):
+				with filePath.open('r') as fileHandle:
+					return fileHandle.read()
+
+			# map large generated files into memory instead of decoding them through a text stream
+			with filePath.open('rb') as fileHandle:
+				with mmap.mmap(fileHandle.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+					content = mappedFile[:].decode(locale.getpreferredencoding(False))
+		except (OSError, ValueError) as ex:
+			raise CompilerException("Error while reading '{0!s}'.".format(filePath)) from ex
+		# same newline translation as a file opened in text mode
+		if ("\r" in content):
+			content = content.replace("\r\n", "\n").replace("\r", "\n")
+		return content
+
+	def WriteFile(self, filePath, content):
+		temporaryPath = filePath.with_name(filePath.name + ".tmp")
+		try:
+			with temporaryPath.open('w') as fileHandle:
+				fileHandle.write(content)
+			os_replace(str(temporaryPath), str(filePath))
+		except OSError as ex:
+			raise CompilerException("Error while writing '{0!s}'.".format(filePath)) from ex
+
+
+class CopyEngine(ILogable):
+	"""Executes copy tasks in parallel.
+
+	A destination file is skipped, if its content is already identical to the
+	source file. Otherwise the file is hard linked (if allowed by the caller),
+	reflinked or copied - whatever the filesystem supports first. Bytes moved
+	and bytes saved are reported for every call.
+	"""
+	_MAX_THREADS =  8
+	_BLOCK_SIZE =   1024 * 1024
+	_FICLONE =      0x40049409    # Linux ioctl to share the extents of a file (reflink)
+
+	_UNCHANGED =  "unchanged"
+	_HARDLINK =   "hardlink"
+	_REFLINK =    "reflink"
+	_COPY =       "copy"
+
+	def __init__(self, logger=None):
+		super().__init__(logger)
+
+	def ExecuteCopyTasks(self, tasks, text, allowHardLinks=False):
+		for task in tasks:
+			if not task.SourcePath.exists(): raise CompilerException("Cannot {0}-copy '{1!s}' to destination.".format(text, task.SourcePath)) from FileNotFoundError(str(task.SourcePath))
+
+		for directory in set(task.DestinationPath.parent for task in tasks):
+			if not directory.exists():
+				try:
+					directory.mkdir(parents=True, exist_ok=True)
+				except OSError as ex:
+					raise CompilerException("Error while creating '{0!s}'.".format(directory)) from ex
+
+		with ThreadPoolExecutor(max_workers=min(self._MAX_THREADS, len(tasks))) as executor:
+			futures = [executor.submit(self.CopyFile, task.SourcePath, task.DestinationPath, allowHardLinks) for task in tasks]
+
+		bytesMoved =  0
+		bytesSaved =  0
+		methods =     {self._UNCHANGED: 0, self._HARDLINK: 0, self._REFLINK: 0, self._COPY: 0}
+		for task, future in zip(tasks, futures):
+			try:
+				method, size = future.result()
+			except OSError as ex:
+				raise CompilerException("Error while copying '{0!s}'.".format(task.SourcePath)) from ex
+
+			self._LogDebug("{0}-copying '{1!s}' ({2}).".format(text, task.SourcePath, method))
+			methods[method] += 1
+			if (method == self._COPY):  bytesMoved += size
+			else:                       bytesSaved += size
+
+		self._LogVerbose("{0}-copied {1} files: {2} moved, {3} saved ({4} unchanged, {5} hard linked, {6} reflinked, {7} copied)".format(
+			text, len(tasks), self._FormatSize(bytesMoved), self._FormatSize(bytesSaved),
+			methods[self._UNCHANGED], methods[self._HARDLINK], methods[self._REFLINK], methods[self._COPY]))
+		return bytesMoved, bytesSaved
+
+	def CopyFile(self, sourcePath, destinationPath, allowHardLinks=False):
+		"""Copy a single file; returns the used method and the file size."""
+		size = sourcePath.stat().st_size
+		if self._IsUnchanged(sourcePath, destinationPath, size):
+			return self._UNCHANGED, size
+
+		# fill a temporary file and rename it, so a destination file is never seen half-written
+		temporaryPath = destinationPath.with_name(destinationPath.name + ".tmp")
+		try:
+			os_unlink(str(temporaryPath))
+		except FileNotFoundError:
+			pass
+
+		if allowHardLinks:
+			try:
+				os_link(str(sourcePath), str(temporaryPath))
+				os_replace(str(temporaryPath), str(destinationPath))
+				return self._HARDLINK, size
+			except OSError:
+				pass		# e.g. different filesystems or no hard link support
+
+		if self._Reflink(sourcePath, temporaryPath):
+			shutil.copymode(str(sourcePath), str(temporaryPath))
+			os_replace(str(temporaryPath), str(destinationPath))
+			return self._REFLINK, size
+
+		shutil.copy(str(sourcePath), str(temporaryPath))
+		os_replace(str(temporaryPath), str(destinationPath))
+		return self._COPY, size
+
+	def _IsUnchanged(self, sourcePath, destinationPath, size):
+		try:
+			if (destinationPath.stat().st_size != size):
+				return False
+			if samefile(str(sourcePath), str(destinationPath)):
+				return True
+		except FileNotFoundError:
+			return False
+		return (self._HashFile(sourcePath) == self._HashFile(destinationPath))
+
+	def _HashFile(self, filePath):
+		fileHash = hashlib.sha256()
+		with filePath.open('rb') as fileHandle:
+			for block in iter(lambda: fileHandle.read(self._BLOCK_SIZE), b""):
+				fileHash.update(block)
+		return fileHash.digest()
+
+	def _Reflink(self, sourcePath, destinationPath):
+		if (fcntl is None):
+			return False
+		try:
+			with sourcePath.open('rb') as sourceHandle, destinationPath.open('wb') as destinationHandle:
+				fcntl.ioctl(destinationHandle.fileno(), self._FICLONE, sourceHandle.fileno())
+			return True
+		except OSError:
+			return False
+
+	@staticmethod
+	def _FormatSize(size):
+		for unit in ("B", "KiB", "MiB"):
+			if (size < 1024):
+				return "{0:.1f} {1}".format(size, unit) if (unit != "B") else "{0} {1}".format(size, unit)
+			size /= 1024
+		return "{0:.1f} GiB".format(size)
+
+
+# state of a parallel run, which is inherited by every forked worker process
+_parallelRun = None
+
+def _InitializeParallelWorker():
+	# pool workers leave with os._exit(), so close the tool sessions of this worker in a finalizer
+	compiler = _parallelRun[0]
+	multiprocessing_Finalize(None, compiler._CloseToolSessions, exitpriority=10)
+
+def _RunParallelJob(jobIndex):
+	compiler, netlists, args, kwargs = _parallelRun
+	return compiler._RunJob(jobIndex, netlists[jobIndex], *args, **kwargs)
+
+
 class Compiler(Shared):
 	_ENVIRONMENT = Environment.Synthesis
 
 	class __Directories__(Shared.__Directories__):
-		Netlist =     None
-		Source =      None
-		Destination = None
+		Netlist =      None
+		NetlistCache = None
+		Source =       None
+		Destination =  None
 
-	def __init__(self, host, dryRun, noCleanUp):
+	def __init__(self, host, dryRun, noCleanUp, jobs=1, force=False):
 		super().__init__(host, dryRun)
 
 		self._noCleanUp =    noCleanUp
+		self._jobs =         jobs
+		self._force =        force
 		self._vhdlVersion =  VHDLVersion.VHDL93
 
+		self._postCopyLock =      None
+		self._persistentWorkers = False
+		self._workingDirectory =  None
+		self._fingerprint =       None
+		self._ruleEngine =        RuleEngine(self.Logger)
+		self._copyEngine =        CopyEngine(self.Logger)
+
+		configSection = host.PoCConfig['CONFIG.DirectoryNames']
+		self.Directories.NetlistCache = host.Directories.Root / configSection['NetlistCacheFiles']
+
+	def _GetNetlists(self, entity):
+		raise NotImplementedError("Compiler._GetNetlists() is not implemented by '{0}'.".format(self.__class__.__name__))
+
+	def RunAll(self, fqnList, *args, **kwargs):
+		netlists = []
+		for fqn in fqnList:
+			netlists.extend(self._GetNetlists(fqn.Entity))
+		netlists = self._SelectShard(netlists)
+
+		if (self._coordinator is not None):
+			failedNetlists = self._RunOnWorkers(netlists, args[0] if (len(args) > 0) else kwargs["board"])
+		elif ((self._jobs <= 1) or (len(netlists) <= 1)):
+			failedNetlists = [netlist for netlist in netlists if not self.TryRun(netlist, *args, **kwargs)]
+		else:
+			failedNetlists = self._RunParallel(netlists, *args, **kwargs)
+			self._LogQuiet("{CYAN}Synthesized {0} of {1} netlists.{NOCOLOR}".format(len(netlists) - len(failedNetlists), len(netlists), **Init.Foreground))
+			for netlist in failedNetlists:
+				self._LogQuiet("  {RED}FAILED:{NOCOLOR} {0!s}".format(netlist.Parent, **Init.Foreground))
+
+		return (len(failedNetlists) == 0)
+
+	def _RunParallel(self, netlists, *args, **kwargs):
+		global _parallelRun
+
+		try:
+			context = multiprocessing.get_context("fork")
+		except ValueError:
+			self._LogWarning("Parallel synthesis is not supported on this platform. Running {0} netlists sequentially.".format(len(netlists)))
+			return [netlist for netlist in netlists if not self.TryRun(netlist, *args, **kwargs)]
+
+		jobs = min(self._jobs, len(netlists))
+		self._LogNormal("Synthesizing {0} netlists with {1} parallel jobs...".format(len(netlists), jobs))
+
+		# flush buffered output, otherwise every forked worker would repeat it
+		sys.stdout.flush()
+		sys.stderr.flush()
+
+		self._postCopyLock =     context.Lock()
+		self._workingDirectory = self.Directories.Working
+		_parallelRun =           (self, netlists, args, kwargs)
+		try:
+			# fork a fresh worker for every netlist, so each job works on its own copy of the configuration;
+			# compilers with long-lived tool sessions keep their workers (and sessions) for all netlists
+			maxTasksPerChild = None if self._persistentWorkers else 1
+			with context.Pool(processes=jobs, initializer=_InitializeParallelWorker, maxtasksperchild=maxTasksPerChild) as pool:
+				results = pool.map(_RunParallelJob, range(len(netlists)), chunksize=1)
+				# let the workers exit normally, so their finalizers shut down their tool sessions
+				pool.close()
+				pool.join()
+		finally:
+			_parallelRun =           None
+			self._postCopyLock =     None
+			self._workingDirectory = None
+
+		return [netlist for netlist, passed in zip(netlists, results) if not passed]
+
+	def _CloseToolSessions(self):
+		"""Close all long-lived tool sessions of this process. Compilers with tool sessions override this method."""
+		pass
+
+	def _RunOnWorkers(self, netlists, board):
+		"""Run all netlists on the workers of the coordinator. Returns all failed netlists."""
+		jobs, failedNetlists = self._GetJobs(netlists, board)
+		self._LogNormal("Synthesizing {0} netlists on {1} workers...".format(len(jobs), len(self._coordinator.Addresses)))
+
+		def _OnStart(job, worker):
+			self._LogVerbose("Worker {0}: synthesizing {1}".format(worker, job.Name))
+
+		def _OnFinish(job, worker, result):
+			if (result is None):
+				passed = False
+			elif ("error" in result):
+				self._LogError("Worker {0}: {1}".format(worker, result["error"]))
+				passed = False
+			else:
+				self._LogVerbose(result["output"])
+				passed = (result["exitCode"] == 0)
+
+			if passed:
+				self._LogQuiet("{CYAN}IP core:{NOCOLOR} {0} {GREEN}[DONE]{NOCOLOR}".format(job.Name, **Init.Foreground))
+			else:
+				self._LogQuiet("{CYAN}IP core:{NOCOLOR} {0} {RED}[FAILED]{NOCOLOR}".format(job.Name, **Init.Foreground))
+				failedNetlists.append(job.Item)
+
+		self._coordinator.Run(jobs, _OnStart, _OnFinish)
+		return failedNetlists
+
+	def _GetSourceFiles(self, netlist, board):
+		filePaths = [] if (netlist.RulesFile is None) else [netlist.RulesFile]
+		if (netlist.FilesFile is not None):
+			filePaths.extend(super()._GetSourceFiles(netlist, board))
+		filePaths.extend(filePath for filePath in self._GetFingerprintFiles(netlist) if (filePath is not None))
+		return filePaths
+
+	def _RunJob(self, jobIndex, netlist, *args, **kwargs):
+		# executed in a worker process: use a private working directory, so
+		# SPECIAL:OutputDir and all relative paths are unique per job
+		self.Directories.Working = self._workingDirectory / "job{0}".format(jobIndex)
+		try:
+			return self.TryRun(netlist, *args, **kwargs)
+		except ExceptionBase as ex:
+			self._LogQuiet("  {RED}ERROR:{NOCOLOR} {0}".format(ex.message, **Init.Foreground))
+			self._LogQuiet("  {RED}[SKIPPED DUE TO ERRORS]{NOCOLOR}".format(**Init.Foreground))
+			return False
+
 	def TryRun(self, netlist, *args, **kwargs):
 		try:
 			self.Run(netlist, *args, **kwargs)
+			return True
 		except SkipableCompilerException as ex:
 			self._LogQuiet("  {RED}ERROR:{NOCOLOR} {0}".format(ex.message, **Init.Foreground))
 			cause = ex.__cause__
@@ -100,6 +449,7 @@ class Compiler(Shared):
 				if (cause is not None):
 					self._LogQuiet("      {YELLOW}{ExType}:{NOCOLOR} {ExMsg!s}".format(ExType=cause.__class__.__name__, ExMsg=cause, **Init.Foreground))
 			self._LogQuiet("  {RED}[SKIPPED DUE TO ERRORS]{NOCOLOR}".format(**Init.Foreground))
+			return False
 
 	def Run(self, netlist, board):
 		self._LogQuiet("{CYAN}IP core:{NOCOLOR} {0!s}".format(netlist.Parent, **Init.Foreground))
@@ -107,6 +457,8 @@ class Compiler(Shared):
 		# setup all needed paths to execute fuse
 		self._PrepareCompilerEnvironment(board.Device)
 		self._WriteSpecialSectionIntoConfig(board.Device)
+		# SPECIAL might have changed since the last netlist, so drop all cached interpolation results
+		self.Host.PoCConfig.Interpolation.clear_cache()
 
 		self._CreatePoCProject(netlist.ModuleName, board)
 		if netlist.FilesFile is not None: self._AddFileListFile(netlist.FilesFile)
@@ -124,7 +476,7 @@ class Compiler(Shared):
 			self._LogVerbose("Creating output directory for generated files.")
 			self._LogDebug("Output directory: {0!s}.".format(self.Directories.Destination))
 			try:
-				self.Directories.Destination.mkdir(parents=True)
+				self.Directories.Destination.mkdir(parents=True, exist_ok=True)
 			except OSError as ex:
 				raise CompilerException("Error while creating '{0!s}'.".format(self.Directories.Destination)) from ex
 
@@ -137,6 +489,7 @@ class Compiler(Shared):
 
 	def _AddRulesFiles(self, rulesFilePath):
 		self._LogVerbose("Reading rules from '{0!s}'".format(rulesFilePath))
+		self._ruleEngine.ClearCache()
 		# add the *.rules file, parse and evaluate it
 		try:
 			rulesFile = self._pocProject.AddFile(RulesFile(rulesFilePath))
@@ -172,8 +525,7 @@ class Compiler(Shared):
 		else:
 			self._LogDebug("nothing to copy")
 
-	def _RunPostCopy(self, netlist):
-		self._LogVerbose("copy generated files into netlist directory...")
+	def _GetPostCopyTasks(self, netlist):
 		rulesFiles = [file for file in self.PoCProject.Files(fileType=FileTypes.RulesFile)]		# FIXME: get rulefile from netlist object as a rulefile object instead of a path
 		postCopyTasks = []
 		if (rulesFiles):
@@ -187,11 +539,134 @@ class Compiler(Shared):
 			postCopyRules = self.Host.PoCConfig[netlist.ConfigSectionName]['PostCopyRules']
 			if (len(postCopyRules) != 0):
 				self._ParseCopyRules(postCopyRules, postCopyTasks)
+		return postCopyTasks
 
-		if (len(postCopyTasks) != 0):
-			self._ExecuteCopyTasks(postCopyTasks, "post")
-		else:
+	def _RunPostCopy(self, netlist):
+		self._LogVerbose("copy generated files into netlist directory...")
+		postCopyTasks = self._GetPostCopyTasks(netlist)
+
+		# generated files are never modified in place, so they can be hard linked from the working directory
+		if (len(postCopyTasks) == 0):
 			self._LogDebug("nothing to copy")
+		elif (self._postCopyLock is not None):
+			# parallel jobs copy into the same netlist directory
+			with self._postCopyLock:
+				self._ExecuteCopyTasks(postCopyTasks, "post", allowHardLinks=True)
+		else:
+			self._ExecuteCopyTasks(postCopyTasks, "post", allowHardLinks=True)
+
+	def _GetFingerprintFiles(self, netlist):
+		"""Returns additional input files of a netlist, which are not listed in the *.files file."""
+		return []
+
+	def _GetNetlistFingerprint(self, netlist, device):
+		fingerprint = hashlib.sha256()
+
+		def _Update(text):
+			fingerprint.update(text.encode("utf-8"))
+			fingerprint.update(b"\0")
+
+		def _UpdateFile(filePath, content=None):
+			_Update(str(filePath))
+			try:
+				if (content is None):
+					with filePath.open('rb') as fileHandle:
+						for chunk in iter(lambda: fileHandle.read(1 << 20), b""):
+							fingerprint.update(chunk)
+				else:
+					fingerprint.update(content)
+			except OSError as ex:
+				raise CompilerException("Error while reading '{0!s}'.".format(filePath)) from ex
+			fingerprint.update(b"\0")
+
+		_Update(str(netlist))
+		_Update(str(self._TOOL))
+		_Update(self._toolChain.Version)
+		_Update(str(device))
+
+		# all files from the *.files and *.rules file, and the netlist's own input files
+		for file in self.PoCProject.Files():
+			_Update(str(file.FileType))
+			_UpdateFile(file.Path)
+		for filePath in self._GetFingerprintFiles(netlist):
+			if (filePath is not None):
+				_UpdateFile(filePath)
+
+		# all generated tool inputs (options, project and script files) and pre-copied files;
+		# the working directory itself differs per job, so it's excluded from the fingerprint
+		workingDirectory = self.Directories.Working
+		workingPaths =     [workingDirectory.as_posix().encode("utf-8"), str(workingDirectory).encode("utf-8")]
+		for filePath in sorted(workingDirectory.rglob("*")):
+			if filePath.is_file():
+				try:
+					with filePath.open('rb') as fileHandle:
+						content = fileHandle.read()
+				except OSError as ex:
+					raise CompilerException("Error while reading '{0!s}'.".format(filePath)) from ex
+				for workingPath in workingPaths:
+					content = content.replace(workingPath, b"${SPECIAL:OutputDir}")
+				_UpdateFile(filePath.relative_to(workingDirectory), content)
+
+		return fingerprint.hexdigest()
+
+	def _GetNetlistCachePath(self, fingerprint, sourcePath):
+		try:
+			return self.Directories.NetlistCache / fingerprint / sourcePath.relative_to(self.Directories.Working)
+		except ValueError:
+			return self.Directories.NetlistCache / fingerprint / sourcePath.name
+
+	def _RestoreNetlistFromCache(self, netlist, device):
+		"""Restores a netlist from the netlist cache instead of running the synthesis tool.
+
+		Returns True, if all post-copy rules were satisfied by cached files.
+		"""
+		self._fingerprint = self._GetNetlistFingerprint(netlist, device)
+		self._LogDebug("Netlist fingerprint: {0}".format(self._fingerprint))
+		if self._force:
+			self._LogVerbose("Netlist cache is bypassed (--force).")
+			return False
+
+		postCopyTasks = self._GetPostCopyTasks(netlist)
+		if (len(postCopyTasks) == 0):
+			return False
+
+		cachedTasks = []
+		for task in postCopyTasks:
+			cachePath = self._GetNetlistCachePath(self._fingerprint, task.SourcePath)
+			if (not cachePath.exists()):
+				self._LogVerbose("Netlist cache miss.")
+				return False
+			cachedTasks.append(CopyTask(cachePath, task.DestinationPath))
+
+		self._LogNormal("{GREEN}Netlist is up-to-date.{NOCOLOR} Restoring files from netlist cache...".format(**Init.Foreground))
+		if (self._postCopyLock is not None):
+			with self._postCopyLock:
+				self._ExecuteCopyTasks(cachedTasks, "cache")
+		else:
+			self._ExecuteCopyTasks(cachedTasks, "cache")
+		return True
+
+	def _StoreNetlistInCache(self, netlist):
+		postCopyTasks = self._GetPostCopyTasks(netlist)
+		if ((self._fingerprint is None) or (len(postCopyTasks) == 0)):
+			return
+
+		cacheDirectory = self.Directories.NetlistCache / self._fingerprint
+		if cacheDirectory.exists():
+			return
+
+		# fill a private directory first and rename it, so concurrent jobs never see an incomplete entry
+		self._LogVerbose("Storing generated files in netlist cache...")
+		temporaryDirectory = self.Directories.NetlistCache / "{0}.{1}.tmp".format(self._fingerprint, getpid())
+		try:
+			for task in postCopyTasks:
+				cachePath = temporaryDirectory / self._GetNetlistCachePath(self._fingerprint, task.SourcePath).relative_to(cacheDirectory)
+				cachePath.parent.mkdir(parents=True, exist_ok=True)
+				self._copyEngine.CopyFile(task.SourcePath, cachePath)
+			temporaryDirectory.rename(cacheDirectory)
+		except OSError as ex:
+			self._LogWarning("Cannot store netlist in cache: {0!s}".format(ex))
+			shutil.rmtree(str(temporaryDirectory), ignore_errors=True)
 
 	def _ParseCopyRules(self, rawList, copyTasks):
 		# read copy tasks
@@ -211,21 +686,13 @@ class Compiler(Shared):
 
 				copyTasks.append(CopyTask(Path(preCopyRegExpMatch.group('SourceFilename')), Path(preCopyRegExpMatch.group('DestFilename'))))
 
-	def _ExecuteCopyTasks(self, tasks, text):
-		for task in tasks:
-			if not task.SourcePath.exists(): raise CompilerException("Cannot {0}-copy '{1!s}' to destination.".format(text, task.SourcePath)) from FileNotFoundError(str(task.SourcePath))
-
-			if not task.DestinationPath.parent.exists():
-				try:
-					task.DestinationPath.parent.mkdir(parents=True)
-				except OSError as ex:
-					raise CompilerException("Error while creating '{0!s}'.".format(task.DestinationPath.parent)) from ex
+	def _ExecuteCopyTasks(self, tasks, text, allowHardLinks=False):
+		self._copyEngine.ExecuteCopyTasks(tasks, text, allowHardLinks)
 
-			self._LogDebug("{0}-copying '{1!s}'.".format(text, task.SourcePath))
-			try:
-				shutil.copy(str(task.SourcePath), str(task.DestinationPath))
-			except OSError as ex:
-				raise CompilerException("Error while copying '{0!s}'.".format(task.SourcePath)) from ex
+	def _RunPostProcessing(self, netlist):
+		"""Patch and delete files in the netlist directory, after it was filled by the synthesis tool or the netlist cache."""
+		self._RunPostReplace(netlist)
+		self._RunPostDelete(netlist)
 
 	def _RunPostDelete(self, netlist):
 		self._LogVerbose("copy generated files into netlist directory...")
@@ -365,24 +832,4 @@ class Compiler(Shared):
 			))
 
 	def _ExecuteReplaceTasks(self, tasks, text):
-		for task in tasks:
-			if not task.FilePath.exists(): raise CompilerException("Cannot {0}-replace in file '{1!s}'.".format(text, task.FilePath)) from FileNotFoundError(str(task.FilePath))
-			self._LogDebug("{0}-replace in file '{1!s}': search for '{2}' replace by '{3}'.".format(text, task.FilePath, task.SearchPattern, task.ReplacePattern))
-
-			regExpFlags = 0
-			if task.RegExpOption_CaseInsensitive: regExpFlags |= re.IGNORECASE
-			if task.RegExpOption_MultiLine:       regExpFlags |= re.MULTILINE
-			if task.RegExpOption_DotAll:          regExpFlags |= re.DOTALL
-
-			# compile regexp
-			regExp = re.compile(task.SearchPattern, regExpFlags)
-			# open file and read all lines
-			with task.FilePath.open('r') as fileHandle:
-				FileContent = fileHandle.read()
-			# replace
-			NewContent,replaceCount = re.subn(regExp, task.ReplacePattern, FileContent)
-			if (replaceCount == 0):
-				self._LogWarning("  Search pattern '{0}' not found in file '{1!s}'.".format(task.SearchPattern, task.FilePath))
-			# open file to write the replaced data
-			with task.FilePath.open('w') as fileHandle:
-				fileHandle.write(NewContent)
+		self._ruleEngine.ExecuteReplaceTasks(tasks, text)
@@ -0,0 +1,416 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      A persistent index of all VHDL design units
+#
+# Description:
+# ------------------------------------
+#		Scans VHDL files for design units (entities, architectures, packages,
+#		package bodies, configurations and contexts):
+#		- records the kind, the defining file, the line range, generics, ports
+#		  and the libraries of the context clause
+#		- the index is stored as JSON and updated incrementally: only files with
+#		  a new modification time or size are scanned again
+#		- the scanner uses regular expressions on the comment-free text; it's no
+#		  full VHDL parser, but fast enough for every PoC.py invocation
+#		- this module depends only on the standard library and Base.Exceptions,
+#		  so it can be reused by the documentation generator
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module Base.DesignUnits")
+
+
+# load dependencies
+import json
+import re
+from collections      import namedtuple, OrderedDict
+from enum             import Enum, unique
+from fnmatch          import fnmatchcase
+from os               import getpid, replace as os_replace, walk as os_walk, stat as os_stat
+from pathlib          import Path
+
+from Base.Exceptions  import ExceptionBase
+
+
+class DesignUnitException(ExceptionBase):
+	pass
+
+
+@unique
+class UnitKind(Enum):
+	Entity =        "entity"
+	Architecture =  "architecture"
+	Package =       "package"
+	PackageBody =   "package body"
+	Configuration = "configuration"
+	Context =       "context"
+
+	def __str__(self):
+		return self.value
+
+
+Generic = namedtuple("Generic", ["Name", "Type", "Default"])
+Port =    namedtuple("Port",    ["Name", "Mode", "Type", "Default"])
+
+
+class DesignUnit:
+	__slots__ = ("Kind", "Name", "Of", "File", "StartLine", "EndLine", "Generics", "Ports", "Libraries")
+
+	def __init__(self, kind, name, of, file, startLine, endLine, generics=(), ports=(), libraries=()):
+		self.Kind =       kind
+		self.Name =       name
+		self.Of =         of					# the entity of an architecture or configuration, the package of a package body
+		self.File =       file				# path relative to the root directory of the index
+		self.StartLine =  startLine
+		self.EndLine =    endLine
+		self.Generics =   list(generics)
+		self.Ports =      list(ports)
+		self.Libraries =  list(libraries)
+
+	def __str__(self):
+		if (self.Kind in (UnitKind.Architecture, UnitKind.Configuration)):
+			return "{0!s} {1} of {2}".format(self.Kind, self.Name, self.Of)
+		return "{0!s} {1}".format(self.Kind, self.Name)
+
+	def ToDict(self):
+		return OrderedDict([
+			("Kind",      self.Kind.value),
+			("Name",      self.Name),
+			("Of",        self.Of),
+			("Lines",     [self.StartLine, self.EndLine]),
+			("Generics",  [list(generic) for generic in self.Generics]),
+			("Ports",     [list(port) for port in self.Ports]),
+			("Libraries", self.Libraries)
+		])
+
+	@classmethod
+	def FromDict(cls, file, content):
+		return cls(UnitKind(content["Kind"]), content["Name"], content["Of"], file, content["Lines"][0], content["Lines"][1],
+			[Generic(*generic) for generic in content["Generics"]], [Port(*port) for port in content["Ports"]], content["Libraries"])
+
+
+# comments are replaced by blanks, so offsets and line numbers are kept; strings
+# and character literals are matched, so '--' or '"' in literals are no comments
+_COMMENT =        re.compile(r"\"(?:[^\"\n]|\"\")*\"|'[^\n]'|--[^\n]*|/\*.*?\*/", re.DOTALL)
+_LIBRARY_CLAUSE = re.compile(r"\blibrary\s+([\w\s,]+?)\s*;", re.IGNORECASE)
+_CONTEXT_REGION = re.compile(r"(?:\s*(?:library|use|context)\b[^;]*;)*\s*", re.IGNORECASE)
+_UNIT_START =     re.compile(r"\b(entity|architecture|package\s+body|package|configuration|context)\s+(\w+)(?:\s+of\s+(\w+))?\s+is\b", re.IGNORECASE)
+_UNIT_END =       re.compile(
+	r"\bend(?:\s+(?:entity|architecture|package\s+body|package|configuration|context))?"
+	r"(?:\s+(?!(?:process|function|procedure|component|record|units|generate|if|loop|case|block|protected|for)\b)\w+)?\s*;",
+	re.IGNORECASE)
+_HEADER_ITEM =    re.compile(r"\b(generic|port)\s*\(|\bbegin\b", re.IGNORECASE)
+_PACKAGE_HEADER = re.compile(r"\s*generic\s*\(", re.IGNORECASE)
+_MODES =          ("in", "out", "inout", "buffer", "linkage")
+_CLASSES =        ("signal", "constant", "variable", "file")
+
+
+def _StripComments(text):
+	def _Replace(match):
+		token = match.group(0)
+		if token.startswith("--"):
+			return " " * len(token)
+		elif token.startswith("/*"):
+			return re.sub(r"[^\n]", " ", token)
+		return token
+	return _COMMENT.sub(_Replace, text)
+
+
+def _FindClosingParenthesis(text, position):
+	"""Return the position of the parenthesis closing the one before 'position'; strings are skipped."""
+	depth =     1
+	inString =  False
+	for i in range(position, len(text)):
+		char = text[i]
+		if (char == '"'):
+			inString = not inString
+		elif inString:
+			continue
+		elif (char == "("):
+			depth += 1
+		elif (char == ")"):
+			depth -= 1
+			if (depth == 0):
+				return i
+	raise DesignUnitException("Missing ')'.")
+
+
+def _SplitInterfaceList(text):
+	"""Split an interface list at all semicolons outside of parentheses and strings."""
+	items =     []
+	depth =     0
+	inString =  False
+	start =     0
+	for i, char in enumerate(text):
+		if (char == '"'):
+			inString = not inString
+		elif inString:
+			continue
+		elif (char == "("):
+			depth += 1
+		elif (char == ")"):
+			depth -= 1
+		elif ((char == ";") and (depth == 0)):
+			items.append(text[start:i])
+			start = i + 1
+	items.append(text[start:])
+	return [" ".join(item.split()) for item in items if (item.strip() != "")]
+
+
+def _ParseInterfaceList(text, isPort):
+	result = []
+	for item in _SplitInterfaceList(text):
+		if (":" not in item):
+			# VHDL-2008 generic types, packages and subprograms
+			words = item.split(None, 2)
+			if (len(words) >= 2):
+				result.append(Generic(words[1], words[0].lower(), None))
+			continue
+
+		names, _, declaration = item.partition(":")
+		subtype, _, default = declaration.partition(":=")
+		words = names.split(None, 1)
+		if ((len(words) == 2) and (words[0].lower() in _CLASSES)):
+			names = words[1]
+		subtype = subtype.strip()
+		default = default.strip() or None
+
+		if isPort:
+			mode, _, rest = subtype.partition(" ")
+			if (mode.lower() in _MODES):
+				mode, subtype = mode.lower(), rest.strip()
+			else:
+				mode = "in"
+			result += [Port(name.strip(), mode, subtype, default) for name in names.split(",")]
+		else:
+			result += [Generic(name.strip(), subtype, default) for name in names.split(",")]
+	return result
+
+
+def _ParseEntityHeader(text, start, end):
+	"""Parse generic and port clauses between 'start' and 'end' (the entity's end or 'begin')."""
+	generics =  []
+	ports =     []
+	position =  start
+	while True:
+		match = _HEADER_ITEM.search(text, position, end)
+		if ((match is None) or (match.group(1) is None)):
+			break
+		closing = _FindClosingParenthesis(text, match.end())
+		if (match.group(1).lower() == "generic"):
+			generics = _ParseInterfaceList(text[match.end():closing], isPort=False)
+		else:
+			ports =    _ParseInterfaceList(text[match.end():closing], isPort=True)
+		position = closing + 1
+	return generics, ports
+
+
+def ScanText(text, file=None):
+	"""Return all design units declared in the VHDL source 'text'."""
+	text = _StripComments(text)
+
+	# find all design units at the top level: a unit starts after the end of the
+	# previous unit and its context clause, otherwise it's a nested declaration
+	starts =        []
+	contextStart =  0
+	for match in _UNIT_START.finditer(text):
+		if (len(starts) > 0):
+			ends = list(_UNIT_END.finditer(text, starts[-1][0].end(), match.start()))
+			if (len(ends) == 0):
+				continue
+			contextStart = ends[-1].end()
+		if (_CONTEXT_REGION.fullmatch(text, contextStart, match.start()) is None):
+			continue
+		starts.append((match, contextStart))
+
+	units = []
+	for i, (match, contextStart) in enumerate(starts):
+		nextStart = starts[i + 1][1] if (i + 1 < len(starts)) else len(text)
+		ends =      list(_UNIT_END.finditer(text, match.end(), nextStart))
+		endOffset = ends[-1].end() if (len(ends) > 0) else nextStart
+
+		keyword = " ".join(match.group(1).lower().split())
+		kind =    UnitKind(keyword)
+		name =    match.group(2)
+		of =      match.group(3) if (kind is not UnitKind.PackageBody) else name
+
+		libraries = []
+		for clause in _LIBRARY_CLAUSE.finditer(text, contextStart, match.start()):
+			libraries += [library.strip() for library in clause.group(1).split(",") if (library.strip() not in libraries)]
+
+		generics, ports = [], []
+		if (kind is UnitKind.Entity):
+			try:
+				generics, ports = _ParseEntityHeader(text, match.end(), endOffset)
+			except DesignUnitException as ex:
+				raise DesignUnitException("Error while parsing entity '{0}' in '{1!s}'. {2!s}".format(name, file, ex)) from ex
+		elif (kind is UnitKind.Package):
+			# the generic clause of a generic package follows directly after 'is'
+			header = _PACKAGE_HEADER.match(text, match.end(), endOffset)
+			if (header is not None):
+				generics = _ParseInterfaceList(text[header.end():_FindClosingParenthesis(text, header.end())], isPort=False)
+
+		units.append(DesignUnit(kind, name, of, file,
+			text.count("\n", 0, match.start()) + 1,
+			text.count("\n", 0, max(endOffset - 1, match.start())) + 1,
+			generics, ports, libraries))
+	return units
+
+
+def ScanFile(filePath, file=None):
+	"""Return all design units declared in a VHDL file."""
+	try:
+		with filePath.open('r', encoding="latin-1") as fileHandle:
+			text = fileHandle.read()
+	except OSError as ex:
+		raise DesignUnitException("Error while reading '{0!s}'.".format(filePath)) from ex
+	return ScanText(text, filePath if (file is None) else file)
+
+
+class DesignUnitIndex:
+	"""A persistent index of all design units in some directories of a source tree."""
+	_FORMAT =     "PoC design unit index"
+	_VERSION =    1
+	_SUFFIXES =   (".vhd", ".vhdl")
+
+	def __init__(self, indexFilePath, rootDirectory, directories):
+		self._indexFilePath = indexFilePath
+		self._rootDirectory = rootDirectory
+		self._directories =   directories
+		self._files =         OrderedDict()		# relative path -> (mtime in ns, size, [DesignUnit, ...])
+		self._errors =        OrderedDict()		# relative path -> message
+
+	@property
+	def Errors(self):   return self._errors
+
+	@property
+	def Units(self):
+		for _, _, units in self._files.values():
+			yield from units
+
+	def Read(self):
+		if (not self._indexFilePath.exists()):
+			return
+		try:
+			with self._indexFilePath.open('r') as fileHandle:
+				content = json.load(fileHandle)
+		except (OSError, ValueError):
+			return			# the index is rebuilt
+		if ((content.get("Format") != self._FORMAT) or (content.get("Version") != self._VERSION)):
+			return
+
+		for file, entry in content["Files"].items():
+			self._files[file] = (entry["MTime"], entry["Size"], [DesignUnit.FromDict(file, unit) for unit in entry["Units"]])
+		self._errors.update(content.get("Errors", {}))
+
+	def Write(self):
+		content = OrderedDict([
+			("Format",  self._FORMAT),
+			("Version", self._VERSION),
+			("Files",   OrderedDict(
+				(file, OrderedDict([("MTime", mtime), ("Size", size), ("Units", [unit.ToDict() for unit in units])]))
+				for file, (mtime, size, units) in self._files.items()
+			)),
+			("Errors",  self._errors)
+		])
+
+		temporaryPath = self._indexFilePath.with_name("{0}.{1}.tmp".format(self._indexFilePath.name, getpid()))
+		try:
+			self._indexFilePath.parent.mkdir(parents=True, exist_ok=True)
+			with temporaryPath.open('w') as fileHandle:
+				json.dump(content, fileHandle)
+			os_replace(str(temporaryPath), str(self._indexFilePath))
+		except OSError as ex:
+			raise DesignUnitException("Error while writing '{0!s}'.".format(self._indexFilePath)) from ex
+
+	def _GetSourceFiles(self):
+		for directory in self._directories:
+			for path, directoryNames, fileNames in os_walk(str(self._rootDirectory / directory)):
+				directoryNames.sort()
+				for fileName in sorted(fileNames):
+					if fileName.lower().endswith(self._SUFFIXES):
+						yield Path(path) / fileName
+
+	def Update(self):
+		"""Read the index, scan new and modified files, and write the index, if it changed.
+
+		Returns the number of scanned and removed files.
+		"""
+		self.Read()
+
+		files =   OrderedDict()
+		scanned = 0
+		for filePath in self._GetSourceFiles():
+			file = filePath.relative_to(self._rootDirectory).as_posix()
+			try:
+				stat = os_stat(str(filePath))
+			except OSError:
+				continue
+			entry = self._files.get(file)
+			if ((entry is None) or (entry[0] != stat.st_mtime_ns) or (entry[1] != stat.st_size)):
+				scanned += 1
+				self._errors.pop(file, None)
+				try:
+					units = ScanFile(filePath, file)
+				except DesignUnitException as ex:
+					self._errors[file] = str(ex) if (ex.__cause__ is None) else "{0!s} {1!s}".format(ex, ex.__cause__)
+					units = []
+				entry = (stat.st_mtime_ns, stat.st_size, units)
+			files[file] = entry
+
+		removed = len(set(self._files) - set(files))
+		for file in set(self._errors) - set(files):
+			del self._errors[file]
+		self._files = files
+		if ((scanned > 0) or (removed > 0)):
+			self.Write()
+		return scanned, removed
+
+	def Find(self, patterns=None, kinds=None):
+		"""Return all units, whose names match one of the case-insensitive wildcard patterns.
+
+		Architectures, package bodies and configurations match by their own name
+		and by the name of their entity or package; they are sorted after it.
+		"""
+		patterns = None if (patterns is None) else [pattern.lower() for pattern in patterns]
+		result = []
+		for unit in self.Units:
+			if ((kinds is not None) and (unit.Kind not in kinds)):
+				continue
+			names = [unit.Name.lower()] if (unit.Of is None) else [unit.Name.lower(), unit.Of.lower()]
+			if ((patterns is None) or any(fnmatchcase(name, pattern) for name in names for pattern in patterns)):
+				result.append(unit)
+		kinds = list(UnitKind)
+		return sorted(result, key=lambda unit: ((unit.Of or unit.Name).lower(), kinds.index(unit.Kind), unit.Name.lower(), unit.File))
+
+	def GetUnits(self, file):
+		"""Return all units of a file relative to the root directory."""
+		entry = self._files.get(file)
+		return [] if (entry is None) else entry[2]
@@ -0,0 +1,370 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      Coordinator and Worker
+#
+# Description:
+# ------------------------------------
+#		Distributes the testbenches or netlists of a run onto worker processes,
+#		which can run on other machines:
+#		- a Worker ('poc.sh serve-worker') listens on a TCP port and runs one job
+#		  at a time by PoC's wrapper script (poc.sh or poc.ps1) in its own PoC
+#		  tree, so the vendor tool environment of each command is loaded
+#		- the Coordinator connects to all workers and hands out the next job to
+#		  every worker, which finished its previous job
+#		- each job carries a fingerprint (SHA-256 per source file) of its sources,
+#		  so a worker refuses jobs, if its PoC tree is not in sync
+#
+#		Messages are JSON objects, one per line. Workers run arbitrary jobs of
+#		the allowed commands for everyone, who can connect. A worker listens on a
+#		non-loopback address only, if a shared token is set in the environment
+#		variable 'PoCWorkerToken' of the worker and the coordinator. The token is
+#		sent in clear text, so use workers only in trusted networks or tunnel
+#		the connections, e.g. by SSH.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module Base.Distributed")
+
+
+# load dependencies
+import hashlib
+import hmac
+import json
+import socket
+import subprocess
+from collections      import deque
+from ipaddress        import ip_address
+from pathlib          import Path
+from platform         import system as platform_system
+from tempfile         import TemporaryDirectory
+from threading        import Condition, Thread
+
+from Base.Exceptions  import CommonException
+from Base.Logging     import ILogable
+
+
+PROTOCOL_VERSION =  1
+DEFAULT_PORT =      10501
+
+
+def ParseAddress(address, defaultHost="localhost"):
+	"""Parse '[host:]port' into a (host, port) tuple."""
+	host, _, port = address.rpartition(":")
+	try:
+		return ((host if (host != "") else defaultHost), int(port))
+	except ValueError as ex:
+		raise CommonException("Worker address '{0}' is not of the form 'host:port'.".format(address)) from ex
+
+
+def IsLoopbackAddress(host):
+	"""Return True, if host resolves only to loopback addresses."""
+	if (host == ""):  return False		# all interfaces
+	try:
+		addresses = {info[4][0] for info in socket.getaddrinfo(host, None, socket.AF_INET)}
+	except OSError:
+		return False
+	return (len(addresses) > 0) and all(ip_address(address).is_loopback for address in addresses)
+
+
+def GetSourceFingerprint(rootDirectory, filePaths):
+	"""Return the SHA-256 of all files inside rootDirectory, keyed by their POSIX path relative to rootDirectory."""
+	fingerprint = {}
+	for filePath in filePaths:
+		try:
+			relativePath = filePath.resolve().relative_to(rootDirectory.resolve())
+		except ValueError:
+			continue		# e.g. vendor libraries, which are installed on every machine
+		fingerprint[relativePath.as_posix()] = _HashFile(filePath)
+	return fingerprint
+
+
+def _HashFile(filePath):
+	fileHash = hashlib.sha256()
+	try:
+		with filePath.open('rb') as fileHandle:
+			for block in iter(lambda: fileHandle.read(1 << 20), b""):
+				fileHash.update(block)
+	except OSError:
+		return None
+	return fileHash.hexdigest()
+
+
+class Connection:
+	"""A TCP connection, which exchanges JSON messages line by line."""
+	def __init__(self, sock):
+		self._socket =      sock
+		self._fileHandle =  sock.makefile('rwb')
+
+	def Send(self, message):
+		self._fileHandle.write(json.dumps(message).encode("utf-8") + b"\n")
+		self._fileHandle.flush()
+
+	def Receive(self):
+		line = self._fileHandle.readline()
+		if (line == b""):
+			raise ConnectionError("Connection closed by peer.")
+		return json.loads(line.decode("utf-8"))
+
+	def Close(self):
+		try:
+			self._fileHandle.close()
+		finally:
+			self._socket.close()
+
+
+class Job:
+	def __init__(self, item, name, fingerprint):
+		self.Item =         item
+		self.Name =         name
+		self.Fingerprint =  fingerprint
+
+
+class Coordinator(ILogable):
+	"""
+	Hands out jobs on demand: every worker gets its next job, when it returned
+	the result of its previous one. Jobs of a lost worker are handed to the
+	remaining workers.
+	"""
+	_CONNECT_TIMEOUT = 10.0
+
+	def __init__(self, logger, addresses, command, arguments, resultFile=False, token=None):
+		super().__init__(logger)
+		self._addresses =   addresses
+		self._command =     command
+		self._arguments =   arguments
+		self._resultFile =  resultFile
+		self._token =       token
+		self._jobs =        deque()
+		self._running =     0
+		self._condition =   Condition()
+
+	@property
+	def Addresses(self):  return self._addresses
+
+	def Run(self, jobs, onStart, onFinish, onAbort=None):
+		"""
+		Run all jobs on the workers. onStart(job, worker), onFinish(job, worker,
+		result) and onAbort(job, worker) are called under a lock; result is None,
+		if the job could not be run. Aborted jobs are handed to another worker. If
+		a callback raises an error, the job fails with an "error" result.
+		"""
+		self._jobs.extend(jobs)
+		threads = [Thread(target=self._Serve, args=("{0}:{1}".format(*address), address, onStart, onFinish, onAbort), daemon=True) for address in self._addresses]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		# all workers are lost
+		while (len(self._jobs) > 0):
+			job = self._jobs.popleft()
+			self._LogError("No worker left to run '{0}'.".format(job.Name))
+			onFinish(job, None, None)
+
+	def _GetJob(self):
+		with self._condition:
+			# a running job might still be handed back by a lost worker
+			while ((len(self._jobs) == 0) and (self._running > 0)):
+				self._condition.wait()
+			if (len(self._jobs) == 0):
+				return None
+			self._running += 1
+			return self._jobs.popleft()
+
+	def _ReleaseJob(self, job, abort=False):
+		with self._condition:
+			self._running -= 1
+			if abort:
+				self._jobs.appendleft(job)
+			self._condition.notify_all()
+
+	def _Serve(self, worker, address, onStart, onFinish, onAbort):
+		try:
+			sock = socket.create_connection(address, timeout=self._CONNECT_TIMEOUT)
+			sock.settimeout(None)
+		except OSError as ex:
+			self._LogWarning("Cannot connect to worker {0}: {1!s}".format(worker, ex))
+			return
+
+		connection = Connection(sock)
+		try:
+			connection.Send({"type": "hello", "version": PROTOCOL_VERSION, "token": self._token})
+			reply = connection.Receive()
+			if (reply.get("type") != "ready"):
+				self._LogWarning("Worker {0} refused the connection: {1}".format(worker, reply.get("error", reply)))
+				return
+
+			while True:
+				job = self._GetJob()
+				if (job is None):
+					connection.Send({"type": "bye"})
+					break
+				if (not self._RunJob(connection, worker, job, onStart, onFinish, onAbort)):
+					break
+		except (OSError, ValueError) as ex:
+			self._LogWarning("Lost connection to worker {0}: {1!s}".format(worker, ex))
+		finally:
+			connection.Close()
+
+	def _RunJob(self, connection, worker, job, onStart, onFinish, onAbort):
+		"""Run a job on a worker. Returns False, if the connection to the worker is lost."""
+		abort = False
+		try:
+			failed = not self._Call(onStart, job, worker)
+			if (not failed):
+				try:
+					connection.Send({
+						"type":         "job",
+						"command":      self._command,
+						"arguments":    self._arguments + [job.Name],
+						"resultFile":   self._resultFile,
+						"fingerprint":  job.Fingerprint
+					})
+					result = connection.Receive()
+				except (OSError, ValueError) as ex:
+					self._LogWarning("Lost connection to worker {0}: {1!s}".format(worker, ex))
+					# hand the job to the next free worker
+					abort = True
+					if (onAbort is not None): self._Call(onAbort, job, worker)
+					return False
+				failed = not self._Call(onFinish, job, worker, result)
+
+			if failed:
+				# report the job as failed, not the connection as lost
+				self._Call(onFinish, job, worker, {"error": "Error while processing the job '{0}'.".format(job.Name)})
+			return True
+		finally:
+			# a job is always released, otherwise all other workers wait for it forever
+			self._ReleaseJob(job, abort=abort)
+
+	def _Call(self, callback, job, worker, *args):
+		"""Call a callback under the lock. Returns False, if the callback raised an error."""
+		try:
+			with self._condition:
+				callback(job, worker, *args)
+			return True
+		except Exception as ex:
+			self._LogError("Error while processing the job '{0}' of worker {1}: {2!s}".format(job.Name, worker, ex))
+			return False
+
+
+class Worker(ILogable):
+	"""Runs the jobs of one coordinator at a time as PoC subprocesses."""
+	def __init__(self, logger, rootDirectory, address, commands, token=None):
+		super().__init__(logger)
+		self._rootDirectory = rootDirectory
+		self._address =       address
+		self._commands =      commands
+		self._token =         token
+
+	def Serve(self):
+		if ((self._token is None) and (not IsLoopbackAddress(self._address[0]))):
+			raise CommonException("Refusing to listen on '{0}:{1}' without a shared token. Set 'PoCWorkerToken' on the worker and the coordinator.".format(*self._address))
+
+		server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		try:
+			server.bind(self._address)
+			server.listen(1)
+		except OSError as ex:
+			server.close()
+			raise CommonException("Error while listening on '{0}:{1}'.".format(*self._address)) from ex
+
+		self._LogNormal("Waiting for jobs on {0}:{1}...".format(*server.getsockname()))
+		try:
+			while True:
+				sock, peer = server.accept()
+				self._LogNormal("Coordinator {0}:{1} connected.".format(*peer))
+				connection = Connection(sock)
+				try:
+					self._HandleConnection(connection)
+				except (OSError, ValueError) as ex:
+					self._LogWarning("Lost connection to coordinator {0}:{1}: {2!s}".format(peer[0], peer[1], ex))
+				finally:
+					connection.Close()
+		finally:
+			server.close()
+
+	def _HandleConnection(self, connection):
+		hello = connection.Receive()
+		if ((hello.get("type") != "hello") or (hello.get("version") != PROTOCOL_VERSION)):
+			connection.Send({"type": "error", "error": "Expected protocol version {0}.".format(PROTOCOL_VERSION)})
+			return
+		if ((self._token is not None) and (not hmac.compare_digest(str(hello.get("token")).encode("utf-8"), self._token.encode("utf-8")))):
+			self._LogWarning("Coordinator sent an invalid token.")
+			connection.Send({"type": "error", "error": "Invalid token."})
+			return
+		connection.Send({"type": "ready"})
+
+		while True:
+			message = connection.Receive()
+			if (message.get("type") != "job"):
+				break
+			connection.Send(self._RunJob(message))
+
+	def _RunJob(self, job):
+		command = job["command"]
+		if (command not in self._commands):
+			return {"type": "result", "error": "Command '{0}' is not allowed on this worker.".format(command)}
+
+		mismatches = [filePath for filePath, fileHash in sorted(job["fingerprint"].items()) if (_HashFile(self._rootDirectory / filePath) != fileHash)]
+		if (len(mismatches) > 0):
+			return {"type": "result", "error": "Source files differ from the coordinator: {0}".format(", ".join(mismatches))}
+
+		self._LogNormal("Running '{0} {1}'...".format(command, " ".join(job["arguments"])))
+		with TemporaryDirectory() as temporaryDirectory:
+			resultFilePath = Path(temporaryDirectory) / "results.json"
+			parameters = self._GetWrapperCommand() + [command] + job["arguments"]
+			if job.get("resultFile"):
+				parameters += ["--result-file", str(resultFilePath)]
+
+			try:
+				process = subprocess.Popen(parameters, cwd=str(self._rootDirectory), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+				output, _ = process.communicate()
+			except OSError as ex:
+				return {"type": "result", "error": "Error while starting PoC: {0!s}".format(ex)}
+
+			results = None
+			if resultFilePath.exists():
+				try:
+					with resultFilePath.open('r') as fileHandle:
+						results = json.load(fileHandle)
+				except (OSError, ValueError) as ex:
+					return {"type": "result", "error": "Error while reading the result file: {0!s}".format(ex)}
+
+		self._LogNormal("Finished with exit code {0}.".format(process.returncode))
+		return {"type": "result", "exitCode": process.returncode, "results": results, "output": output.decode("utf-8", "replace")}
+
+	def _GetWrapperCommand(self):
+		# the wrapper scripts load the vendor tool environment of a command, e.g. Xilinx ISE for xst
+		if (platform_system() == "Windows"):
+			return ["powershell.exe", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", str(self._rootDirectory / "poc.ps1")]
+		else:
+			return ["bash", str(self._rootDirectory / "poc.sh")]
@@ -324,11 +324,12 @@ class Executable(ILogable):
 	def Path(self):
 		return self._executablePath
 
-	def StartProcess(self, parameterList):
-		# start child process
+	def StartProcess(self, parameterList, workingDirectory=None):
+		# start child process, optionally in another working directory than the current one
 		# parameterList.insert(0, str(self._executablePath))
+		cwd = None if (workingDirectory is None) else str(workingDirectory)
 		try:
-			self._process = Subprocess_Popen(parameterList, stdin=Subprocess_Pipe, stdout=Subprocess_Pipe, stderr=Subprocess_StdOut, universal_newlines=True, bufsize=256)
+			self._process = Subprocess_Popen(parameterList, stdin=Subprocess_Pipe, stdout=Subprocess_Pipe, stderr=Subprocess_StdOut, universal_newlines=True, bufsize=256, cwd=cwd)
 		except OSError as ex:
 			raise CommonException("Error while accessing '{0!s}'.".format(self._executablePath)) from ex
 
@@ -352,6 +353,15 @@ class Executable(ILogable):
 		# finally:
 			# self._process.terminate()
 
+	def GetReaderUntilBoundary(self):
+		if (self._iterator is None):
+			self._iterator = iter(self.GetReader())
+
+		for line in self._iterator:
+			if (self._POC_BOUNDARY in line):
+				break
+			yield line
+
 	def ReadUntilBoundary(self, indent=0):
 		__indent = "  " * indent
 		if (self._iterator is None):
@@ -0,0 +1,278 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      Exports the resolved compile order of an IP core or testbench
+#
+# Description:
+# ------------------------------------
+#		Resolves the *.files file of an IP core for a board, device and VHDL
+#		version like a synthesis tool does (or of its testbench like a simulator
+#		does), and exports the ordered list of source files with their VHDL
+#		libraries and all external library references as JSON, CSV or a Tcl
+#		script. The result is cached in 'temp/filelists'; a
+#		cache entry is valid as long as all parsed *.files files and PoC's
+#		configuration files are unchanged, and all paths checked by '?{...}'
+#		expressions in these files still (or still not) exist.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module Base.FileList")
+
+
+# load dependencies
+import csv
+import hashlib
+import json
+from collections        import namedtuple, OrderedDict
+from enum               import Enum, unique
+from io                 import StringIO
+from os                 import getpid, replace as os_replace, stat as os_stat
+from pathlib            import Path
+
+from Base.Exceptions    import ExceptionBase
+from Base.Project       import Environment, FileTypes
+from Base.Shared        import Shared
+
+
+class FileListException(ExceptionBase):
+	pass
+
+
+@unique
+class FileListFormat(Enum):
+	JSON =  "json"
+	CSV =   "csv"
+	Tcl =   "tcl"
+
+	def __str__(self):
+		return self.value
+
+
+SourceFile =      namedtuple("SourceFile",      ["Type", "Library", "Path"])
+ExternalLibrary = namedtuple("ExternalLibrary", ["Library", "Path"])
+
+
+class FileList:
+	"""The resolved compile order of an IP core or testbench: all source files in order, and all external VHDL libraries."""
+	_FORMAT =   "PoC.FileList"
+	_VERSION =  2
+
+	_FILE_TYPES = OrderedDict([
+		(FileTypes.VHDLSourceFile,    "vhdl"),
+		(FileTypes.VerilogSourceFile, "verilog"),
+		(FileTypes.CocotbSourceFile,  "cocotb")
+	])
+
+	def __init__(self, entity, environment, board, device, vhdlVersion):
+		self.Entity =             entity
+		self.Environment =        environment
+		self.Board =              board
+		self.Device =             device
+		self.VHDLVersion =        vhdlVersion
+		self.Files =              []
+		self.ExternalLibraries =  []
+
+	@classmethod
+	def FromProject(cls, entity, project):
+		fileList = cls(entity, project.Environment.name, project.Board.Name, str(project.Device), project.VHDLVersion.value)
+		fileTypes = FileTypes.VHDLSourceFile | FileTypes.VerilogSourceFile | FileTypes.CocotbSourceFile
+		for file in project.Files(fileType=fileTypes):
+			library = file.LibraryName if (file.FileType is FileTypes.VHDLSourceFile) else None
+			fileList.Files.append(SourceFile(cls._FILE_TYPES[file.FileType], library, file.Path.as_posix()))
+		for library in project.ExternalVHDLLibraries:
+			fileList.ExternalLibraries.append(ExternalLibrary(library.Name, library.Path.as_posix()))
+		return fileList
+
+	def ToDict(self):
+		return OrderedDict([
+			("Format",            self._FORMAT),
+			("Version",           self._VERSION),
+			("Entity",            self.Entity),
+			("Environment",       self.Environment),
+			("Board",             self.Board),
+			("Device",            self.Device),
+			("VHDLVersion",       self.VHDLVersion),
+			("Files",             [OrderedDict(file._asdict()) for file in self.Files]),
+			("ExternalLibraries", [OrderedDict(library._asdict()) for library in self.ExternalLibraries])
+		])
+
+	@classmethod
+	def FromDict(cls, content):
+		if ((content.get("Format") != cls._FORMAT) or (content.get("Version") != cls._VERSION)):
+			raise FileListException("Not a file list of this PoC version.")
+		try:
+			fileList = cls(content["Entity"], content["Environment"], content["Board"], content["Device"], content["VHDLVersion"])
+			fileList.Files =              [SourceFile(file["Type"], file["Library"], file["Path"]) for file in content["Files"]]
+			fileList.ExternalLibraries =  [ExternalLibrary(library["Library"], library["Path"]) for library in content["ExternalLibraries"]]
+		except (KeyError, TypeError) as ex:
+			raise FileListException("Not a file list of this PoC version.") from ex
+		return fileList
+
+	def Format(self, fileListFormat):
+		if   (fileListFormat is FileListFormat.JSON):  return json.dumps(self.ToDict(), indent=2) + "\n"
+		elif (fileListFormat is FileListFormat.CSV):   return self._FormatCSV()
+		elif (fileListFormat is FileListFormat.Tcl):   return self._FormatTcl()
+		raise FileListException("Unsupported file list format '{0!s}'.".format(fileListFormat))
+
+	def _FormatCSV(self):
+		buffer = StringIO()
+		writer = csv.writer(buffer, lineterminator="\n")
+		writer.writerow(["Type", "Library", "Path"])
+		for file in self.Files:
+			writer.writerow([file.Type, file.Library or "", file.Path])
+		for library in self.ExternalLibraries:
+			writer.writerow(["library", library.Library, library.Path])
+		return buffer.getvalue()
+
+	def _FormatTcl(self):
+		def _Quote(value):
+			if (value is None):                                return "{}"
+			elif any(c in value for c in " \t\"$[]{};\\"):   return "{" + value + "}"
+			return value
+
+		lines = [
+			"# PoC file list of '{0}' ({1}; board: {2}, device: {3}, VHDL-{4})".format(self.Entity, self.Environment, self.Board, self.Device, self.VHDLVersion),
+			"set PoC_Files {"
+		]
+		for file in self.Files:
+			lines.append("  {{{0} {1} {2}}}".format(file.Type, _Quote(file.Library), _Quote(file.Path)))
+		lines.append("}")
+		lines.append("set PoC_ExternalLibraries {")
+		for library in self.ExternalLibraries:
+			lines.append("  {{{0} {1}}}".format(_Quote(library.Library), _Quote(library.Path)))
+		lines.append("}")
+		return "\n".join(lines) + "\n"
+
+
+class FileListExporter(Shared):
+	"""Exports the compile order of an IP core for synthesis."""
+	_ENVIRONMENT =  Environment.Synthesis
+
+	class __Directories__(Shared.__Directories__):
+		FileListCache = None
+
+	def __init__(self, host, dryRun, force=False):
+		super().__init__(host, dryRun)
+
+		self._force = force
+
+		configSection = host.PoCConfig['CONFIG.DirectoryNames']
+		self.Directories.FileListCache = host.Directories.Root / configSection['FileListCacheFiles']
+
+	def Export(self, entity, board, vhdlVersion):
+		"""Return the file list of an entity from the cache, or resolve its *.files file and update the cache."""
+		self._vhdlVersion = vhdlVersion
+		cacheFilePath = self.Directories.FileListCache / "{0}.json".format(self._GetCacheKey(entity, board))
+
+		if self._force:
+			self._LogVerbose("File list cache is bypassed (--force).")
+		else:
+			fileList = self._ReadCache(cacheFilePath)
+			if (fileList is not None):
+				self._LogVerbose("Using the cached file list '{0!s}'.".format(cacheFilePath))
+				return fileList
+
+		self._CreatePoCProject(self._GetModuleName(entity), board)
+		self._AddFileListFile(entity.FilesFile)
+		fileList = FileList.FromProject(self._GetEntityName(entity), self._pocProject)
+
+		# the file list depends on the content of all *.files files and config files, and on the results of
+		# all '?{...}' existence checks in these files, e.g. for precompiled vendor libraries
+		fileListFiles = list(self._pocProject.Files(fileType=FileTypes.FileListFile))
+		inputFiles =    [file.Path for file in fileListFiles]
+		inputFiles +=   [self.Host.ConfigFiles.Private, self.Host.ConfigFiles.Defaults, self.Host.ConfigFiles.Boards,
+										 self.Host.ConfigFiles.Structure, self.Host.ConfigFiles.IPCores]
+		existsChecks =  OrderedDict((str(path), result) for file in fileListFiles for path, result in file.ExistsChecks)
+		self._WriteCache(cacheFilePath, fileList, inputFiles, existsChecks)
+		return fileList
+
+	def _GetModuleName(self, ipCore):
+		return ipCore.FilesFile.stem
+
+	def _GetEntityName(self, ipCore):
+		return str(ipCore)
+
+	def _GetCacheKey(self, entity, board):
+		key = hashlib.sha256()
+		for value in (self._GetEntityName(entity), str(self._ENVIRONMENT), str(self._TOOL), str(board), str(board.Device), repr(self._vhdlVersion)):
+			key.update(value.encode("utf-8"))
+			key.update(b"\0")
+		return key.hexdigest()
+
+	def _GetFingerprint(self, filePath):
+		try:
+			stat = os_stat(str(filePath))
+		except OSError:
+			return None
+		return [stat.st_mtime_ns, stat.st_size]
+
+	def _ReadCache(self, cacheFilePath):
+		if (not cacheFilePath.exists()):
+			return None
+		try:
+			with cacheFilePath.open('r') as fileHandle:
+				content = json.load(fileHandle)
+			for filePath, fingerprint in content["Inputs"].items():
+				if (self._GetFingerprint(filePath) != fingerprint):
+					self._LogVerbose("Cached file list is outdated: '{0}' has changed.".format(filePath))
+					return None
+			for filePath, result in content["Exists"].items():
+				if (Path(filePath).exists() is not result):
+					self._LogVerbose("Cached file list is outdated: '{0}' has been {1}.".format(filePath, "removed" if result else "created"))
+					return None
+			return FileList.FromDict(content["FileList"])
+		except (OSError, ValueError, KeyError, AttributeError, FileListException):
+			return None			# the file list is resolved again
+
+	def _WriteCache(self, cacheFilePath, fileList, inputFiles, existsChecks):
+		content = OrderedDict([
+			("Inputs",    OrderedDict((str(filePath), self._GetFingerprint(filePath)) for filePath in inputFiles)),
+			("Exists",    existsChecks),
+			("FileList",  fileList.ToDict())
+		])
+
+		temporaryPath = cacheFilePath.with_name("{0}.{1}.tmp".format(cacheFilePath.name, getpid()))
+		try:
+			cacheFilePath.parent.mkdir(parents=True, exist_ok=True)
+			with temporaryPath.open('w') as fileHandle:
+				json.dump(content, fileHandle)
+			os_replace(str(temporaryPath), str(cacheFilePath))
+		except OSError as ex:
+			raise FileListException("Error while writing '{0!s}'.".format(cacheFilePath)) from ex
+
+
+class TestbenchFileListExporter(FileListExporter):
+	"""Exports the compile order of the VHDL testbench of an IP core for simulation."""
+	_ENVIRONMENT =  Environment.Simulation
+
+	def _GetModuleName(self, testbench):
+		return testbench.ModuleName
+
+	def _GetEntityName(self, testbench):
+		return str(testbench.Parent)
@@ -122,6 +122,15 @@ class Logger:
 		self._logLevel =      logLevel
 		self._printToStdOut = printToStdOut
 		self._entries =       []
+		self._statusLine =    None
+
+	@property
+	def StatusLine(self):
+		"""A status line (e.g. a ProgressDisplay), which is cleared and redrawn around each message."""
+		return self._statusLine
+	@StatusLine.setter
+	def StatusLine(self, value):
+		self._statusLine = value
 
 	@property
 	def LogLevel(self):
@@ -145,7 +154,11 @@ class Logger:
 		if (entry.Severity >= self._logLevel):
 			self._entries.append(entry)
 			if self._printToStdOut:
-				print(self.__LOG_MESSAGE_FORMAT__[entry.Severity].format(message=entry.Message, **Init.Foreground))
+				message = self.__LOG_MESSAGE_FORMAT__[entry.Severity].format(message=entry.Message, **Init.Foreground)
+				if (self._statusLine is not None):
+					self._statusLine.Print(message)
+				else:
+					print(message)
 			return True
 		else:
 			return False
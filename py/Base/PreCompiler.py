@@ -0,0 +1,560 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      Base class for all PreCompiler classes
+#
+# Description:
+# ------------------------------------
+#		Precompiles vendor libraries (Xilinx, Altera, Lattice primitives and
+#		OSVVM) for a simulator:
+#		- the sources of each vendor are described by a *.files file in
+#		  'tools/precompile'; paths may end with a wildcard like '*.vhd'
+#		- the files of a library are compiled in order, but libraries are
+#		  compiled in parallel, if they don't reference each other
+#		- failed files are summarized at the end
+#		- a manifest per library records the tool version, the VHDL version and
+#		  the sources; only stale libraries are rebuilt
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module Base.PreCompiler")
+
+
+# load dependencies
+import hashlib
+import json
+import multiprocessing
+import re
+import sys
+from collections        import namedtuple, OrderedDict
+from configparser       import Error as ConfigParser_Error
+from os                 import getpid, replace as os_replace, stat as os_stat, unlink as os_unlink
+from pathlib            import Path
+from queue              import Queue
+from uuid               import uuid4
+
+from lib.Functions      import Init
+from Base.Exceptions    import ExceptionBase, SkipableException, SkipableCommonException
+from Base.Progress      import ProgressDisplay
+from Base.Project       import Environment, FileTypes, VHDLVersion
+from Base.Shared        import Shared
+
+
+class PreCompilerException(ExceptionBase):
+	pass
+
+class SkipablePreCompilerException(PreCompilerException, SkipableException):
+	pass
+
+
+# FilesFile:     *.files file in 'tools/precompile'
+# DirectoryName: option in CONFIG.DirectoryNames for the vendor's subdirectory, or None
+# Synopsys:      compile with Synopsys' IEEE packages (std_logic_arith, ...)
+Vendor = namedtuple("Vendor", ["Name", "FilesFile", "DirectoryName", "Synopsys", "VHDLVersion"])
+
+VENDORS = OrderedDict((vendor.Name, vendor) for vendor in [
+	Vendor("altera",        "altera.files",         "AlteraSpecificFiles",  True,   VHDLVersion.VHDL93),
+	Vendor("lattice",       "lattice.files",        "LatticeSpecificFiles", True,   VHDLVersion.VHDL93),
+	Vendor("osvvm",         "osvvm.files",          None,                   False,  VHDLVersion.VHDL2008),
+	Vendor("xilinx-ise",    "xilinx-ise.files",     "XilinxSpecificFiles",  True,   VHDLVersion.VHDL93),
+	Vendor("xilinx-vivado", "xilinx-vivado.files",  "XilinxSpecificFiles",  True,   VHDLVersion.VHDL93)
+])
+
+
+class Library:
+	def __init__(self, name, files, dependencies):
+		self.Name =         name
+		self.Files =        files
+		self.Dependencies = dependencies		# names of the libraries, which must be compiled before
+
+
+def _HashFile(filePath):
+	fileHash = hashlib.sha256()
+	try:
+		with filePath.open('rb') as fileHandle:
+			for block in iter(lambda: fileHandle.read(1 << 20), b""):
+				fileHash.update(block)
+	except OSError:
+		return None
+	return fileHash.hexdigest()
+
+
+class LibraryManifest:
+	"""Records how a precompiled library was built: tool version, VHDL version and all sources.
+
+	Each build gets a new :attr:`Id`; libraries referencing this library record
+	it, so they become stale if this library is rebuilt.
+	"""
+	_FORMAT =   "PoC precompiled library"
+	_VERSION =  1
+
+	def __init__(self, filePath):
+		self._filePath =    filePath
+		self.Id =           None
+		self.Vendor =       None
+		self.Library =      None
+		self.Tool =         None
+		self.ToolVersion =  None
+		self.VHDLVersion =  None
+		self.Files =        OrderedDict()		# path -> (size, mtime in ns, sha256)
+		self.Dependencies = OrderedDict()		# library name -> Id of its manifest
+
+	@property
+	def Path(self):   return self._filePath
+
+	@classmethod
+	def Create(cls, filePath, vendorName, library, tool, toolVersion, vhdlVersion, dependencies):
+		manifest = cls(filePath)
+		manifest.Id =           uuid4().hex
+		manifest.Vendor =       vendorName
+		manifest.Library =      library.Name
+		manifest.Tool =         tool
+		manifest.ToolVersion =  toolVersion
+		manifest.VHDLVersion =  vhdlVersion
+		for path in library.Files:
+			try:
+				stat = path.stat()
+			except OSError as ex:
+				raise PreCompilerException("Error while reading '{0!s}'.".format(path)) from ex
+			manifest.Files[str(path)] = (stat.st_size, stat.st_mtime_ns, _HashFile(path))
+		for name, dependency in dependencies.items():
+			manifest.Dependencies[name] = None if (dependency is None) else dependency.Id
+		return manifest
+
+	def Read(self):
+		try:
+			with self._filePath.open('r') as fileHandle:
+				content = json.load(fileHandle)
+		except (OSError, ValueError) as ex:
+			raise PreCompilerException("Error while reading '{0!s}'.".format(self._filePath)) from ex
+		if ((content.get("Format") != self._FORMAT) or (content.get("Version") != self._VERSION)):
+			raise PreCompilerException("'{0!s}' is not a precompiled library manifest of this PoC version.".format(self._filePath))
+
+		try:
+			self.Id =           content["Id"]
+			self.Vendor =       content["Vendor"]
+			self.Library =      content["Library"]
+			self.Tool =         content["Tool"]
+			self.ToolVersion =  content["ToolVersion"]
+			self.VHDLVersion =  VHDLVersion.Parse(content["VHDLVersion"])
+			self.Files =        OrderedDict((file["Path"], (file["Size"], file["MTime"], file["SHA256"])) for file in content["Files"])
+			self.Dependencies = OrderedDict(content["Dependencies"])
+		except (KeyError, TypeError) as ex:
+			raise PreCompilerException("Error while reading '{0!s}'.".format(self._filePath)) from ex
+		return self
+
+	def Write(self):
+		content = OrderedDict([
+			("Format",        self._FORMAT),
+			("Version",       self._VERSION),
+			("Id",            self.Id),
+			("Vendor",        self.Vendor),
+			("Library",       self.Library),
+			("Tool",          self.Tool),
+			("ToolVersion",   self.ToolVersion),
+			("VHDLVersion",   self.VHDLVersion.value),
+			("Files",         [OrderedDict([("Path", path), ("Size", size), ("MTime", mtime), ("SHA256", sha256)]) for path, (size, mtime, sha256) in self.Files.items()]),
+			("Dependencies",  self.Dependencies)
+		])
+
+		# libraries are compiled in parallel, so write to a temporary file and rename it
+		temporaryPath = self._filePath.with_name("{0}.{1}.tmp".format(self._filePath.name, getpid()))
+		try:
+			self._filePath.parent.mkdir(parents=True, exist_ok=True)
+			with temporaryPath.open('w') as fileHandle:
+				json.dump(content, fileHandle, indent="\t")
+			os_replace(str(temporaryPath), str(self._filePath))
+		except OSError as ex:
+			raise PreCompilerException("Error while writing '{0!s}'.".format(self._filePath)) from ex
+
+	def GetStaleReason(self, toolVersion, vhdlVersion=None, filePaths=None, dependencies=None):
+		"""Return why the library must be rebuilt, or None if it is up to date.
+
+		Only sizes and modification times are compared; a source is hashed only if
+		its modification time changed, e.g. after a fresh checkout.
+		"""
+		if (self.ToolVersion != toolVersion):
+			return "compiled with {0} {1}, but {0} {2} is configured".format(self.Tool, self.ToolVersion, toolVersion)
+		if ((vhdlVersion is not None) and (self.VHDLVersion.value != vhdlVersion.value)):
+			return "compiled for {0!s}".format(self.VHDLVersion)
+		if ((filePaths is not None) and ([str(path) for path in filePaths] != list(self.Files))):
+			return "the list of sources changed"
+
+		for path, (size, mtime, sha256) in self.Files.items():
+			try:
+				stat = os_stat(path)
+			except OSError:
+				return "'{0}' is missing".format(path)
+			if ((stat.st_size != size) or ((stat.st_mtime_ns != mtime) and (_HashFile(Path(path)) != sha256))):
+				return "'{0}' changed".format(path)
+
+		if (dependencies is not None):
+			for name, id in self.Dependencies.items():
+				dependency = dependencies.get(name)
+				if ((dependency is None) or (dependency.Id != id)):
+					return "the referenced library '{0}' was rebuilt".format(name)
+		return None
+
+
+# the run of a parallel precompilation; set before the worker processes are forked
+_parallelRun = None
+
+def _RunParallelJob(libraryName):
+	precompiler, libraries = _parallelRun
+	return precompiler.TryCompileLibrary(libraries[libraryName])
+
+
+class PreCompiler(Shared):
+	_ENVIRONMENT =        Environment.Simulation
+	_LIBRARY_CLAUSE =     re.compile(rb"^\s*library\s+([\w\s,]+?)\s*;", re.IGNORECASE | re.MULTILINE)
+	_MANIFEST_DIRECTORY = "manifests"
+
+	class __Directories__(Shared.__Directories__):
+		PreCompiled = None
+		Destination = None
+
+	def __init__(self, host, dryRun, jobs=1, force=False):
+		super().__init__(host, dryRun)
+
+		self._jobs =        jobs
+		self._force =       force
+		self._vendor =      None
+		self._toolName =    None
+		self._toolVersion = None
+		self._results =     OrderedDict()			# library name -> [(file, message), ...]; None, if skipped
+		self._upToDate =    set()
+
+	@property
+	def Results(self):  return self._results
+
+	def Run(self, vendorName, board, vhdlVersion=None):
+		try:
+			self._vendor = VENDORS[vendorName]
+		except KeyError:
+			raise PreCompilerException("Unknown vendor '{0}'. Choose one of: {1}".format(vendorName, ", ".join(VENDORS))) from None
+		self._vhdlVersion = self._vendor.VHDLVersion if (vhdlVersion is None) else vhdlVersion
+		self._results =     OrderedDict()
+		self._upToDate =    set()
+
+		self.Directories.Destination = self.Directories.PreCompiled
+		if (self._vendor.DirectoryName is not None):
+			self.Directories.Destination /= self.Host.PoCConfig['CONFIG.DirectoryNames'][self._vendor.DirectoryName]
+
+		filesFilePath = self.Host.Directories.Root / "tools/precompile" / self._vendor.FilesFile
+		self._CreatePoCProject(self._vendor.Name, board)
+		try:
+			self._AddFileListFile(filesFilePath)
+		except SkipableCommonException as ex:
+			raise PreCompilerException("Cannot read the sources of '{0}': {1}".format(self._vendor.Name, self._GetFilesFileErrors(ex))) from ex
+		except ConfigParser_Error as ex:
+			raise PreCompilerException("Cannot read the sources of '{0}'. Is the vendor tool configured?".format(self._vendor.Name)) from ex
+
+		libraries = self._GetLibraries()
+		staleLibraries = self._GetStaleLibraries(libraries)
+		for name in libraries:
+			if (name not in staleLibraries):
+				self._results[name] = []
+				self._upToDate.add(name)
+
+		if (len(staleLibraries) == 0):
+			self._LogNormal("All {0} libraries of '{1}' for {2!s} are up to date.".format(len(libraries), self._vendor.Name, self._vhdlVersion))
+		else:
+			self._LogNormal("Precompiling {0} of {1} libraries of '{2}' for {3!s} into '{4!s}'...".format(len(staleLibraries), len(libraries), self._vendor.Name, self._vhdlVersion, self.Directories.Destination))
+			try:
+				self.Directories.Destination.mkdir(parents=True, exist_ok=True)
+			except OSError as ex:
+				raise PreCompilerException("Error while creating '{0!s}'.".format(self.Directories.Destination)) from ex
+			self._PrepareLibraries(libraries)
+
+			if ((self._jobs <= 1) or (len(staleLibraries) <= 1)):
+				self._RunSequential(staleLibraries)
+			else:
+				self._RunParallel(staleLibraries)
+
+		self.PrintOverallPreCompileReport(libraries)
+		return all((result is not None) and (len(result) == 0) for result in self._results.values())
+
+	def _GetFilesFileErrors(self, ex):
+		"""Return why the *.files file could not be read: its reported warnings, or else the causes of the exception."""
+		warnings = []
+		for fileListFile in self._pocProject.Files(fileType=FileTypes.FileListFile):
+			for warning in fileListFile.Warnings:
+				if (warning not in warnings):
+					warnings.append(warning)
+		if (len(warnings) > 0):
+			return " ".join(warning.replace("WARNING: ", "", 1) for warning in warnings)
+
+		messages = []
+		while (ex is not None):
+			messages.append(str(ex))
+			ex = ex.__cause__
+		return " ".join(messages)
+
+	def _GetLibraries(self):
+		"""Group all VHDL files by library, expand wildcards and find references to other libraries."""
+		libraryFiles = OrderedDict()
+		for file in self._pocProject.Files(fileType=FileTypes.VHDLSourceFile):
+			files = libraryFiles.setdefault(file.LibraryName, [])
+			for path in self._ExpandPath(file.Path):
+				if (path not in files): files.append(path)
+
+		libraries = OrderedDict()
+		for name, files in libraryFiles.items():
+			references = set()
+			for path in files:
+				references |= self._GetLibraryReferences(path)
+			# only earlier libraries count, so the order of the *.files file is always a valid order
+			libraries[name] = Library(name, files, [library for library in libraries if (library in references)])
+		return libraries
+
+	@staticmethod
+	def _ExpandPath(path):
+		"""Expand a file name with wildcards; Xilinx' 'vhdl_analyze_order' files define the order of the matches."""
+		if (("*" not in path.name) and ("?" not in path.name)):
+			return [path]
+
+		matches =         sorted(path.parent.glob(path.name))
+		orderFilePath =   path.parent / "vhdl_analyze_order"
+		if orderFilePath.exists():
+			try:
+				with orderFilePath.open('r') as fileHandle:
+					order = [path.parent / line.strip() for line in fileHandle if (line.strip() != "")]
+			except OSError as ex:
+				raise PreCompilerException("Error while reading '{0!s}'.".format(orderFilePath)) from ex
+			found =   set(matches)
+			ordered = set(order)
+			matches = [match for match in order if (match in found)] + [match for match in matches if (match not in ordered)]
+		return matches
+
+	@classmethod
+	def _GetLibraryReferences(cls, path):
+		try:
+			with path.open('rb') as fileHandle:
+				content = fileHandle.read()
+		except OSError:
+			return set()			# reported, when the file is compiled
+		references = set()
+		for match in cls._LIBRARY_CLAUSE.finditer(content):
+			references.update(name.strip().decode().lower() for name in match.group(1).split(b","))
+		return references
+
+	def _GetManifestPath(self, vendorName, libraryName, vhdlVersion):
+		return self.Directories.PreCompiled / self._MANIFEST_DIRECTORY / "{0}.{1}.json".format(vendorName, libraryName)
+
+	def _ReadManifest(self, libraryName):
+		manifestPath = self._GetManifestPath(self._vendor.Name, libraryName, self._vhdlVersion)
+		if (not manifestPath.exists()):
+			return None
+		try:
+			return LibraryManifest(manifestPath).Read()
+		except PreCompilerException as ex:
+			self._LogWarning("{0!s} Rebuilding library '{1}'.".format(ex, libraryName))
+			return None
+
+	def _GetStaleLibraries(self, libraries):
+		"""Select the libraries, which must be rebuilt, and log the reasons."""
+		manifests =       {}
+		staleLibraries =  OrderedDict()
+		for library in libraries.values():
+			manifest = self._ReadManifest(library.Name)
+			manifests[library.Name] = manifest
+			rebuilt = [dependency for dependency in library.Dependencies if (dependency in staleLibraries)]
+			if self._force:
+				reason = "rebuild forced"
+			elif (manifest is None):
+				reason = "not compiled yet"
+			elif (len(rebuilt) > 0):
+				reason = "the referenced library '{0}' is rebuilt".format(rebuilt[0])
+			else:
+				dependencies = {name: manifests.get(name) for name in manifest.Dependencies}
+				reason = manifest.GetStaleReason(self._toolVersion, self._vhdlVersion, library.Files, dependencies)
+
+			if (reason is None):
+				self._LogVerbose("Library '{0}' is up to date.".format(library.Name))
+			else:
+				self._LogVerbose("Library '{0}' is stale: {1}".format(library.Name, reason))
+				staleLibraries[library.Name] = library
+		return staleLibraries
+
+	def GetStaleLibraries(self):
+		"""Check the manifests of all precompiled libraries of this simulator.
+
+		This is cheap enough for every simulator start: neither the *.files files
+		nor unchanged sources are read. Returns a list of (vendor name, VHDL version,
+		[(library name, reason), ...]) tuples for all vendors with stale libraries.
+		"""
+		manifestDirectory = self.Directories.PreCompiled / self._MANIFEST_DIRECTORY
+		if (not manifestDirectory.exists()):
+			return []
+
+		manifests = OrderedDict()
+		for manifestPath in sorted(manifestDirectory.glob("*.json")):
+			try:
+				manifest = LibraryManifest(manifestPath).Read()
+			except PreCompilerException as ex:
+				self._LogWarning(str(ex))
+				continue
+			manifests[(manifest.Vendor, manifest.VHDLVersion.value, manifest.Library)] = manifest
+
+		staleVendors = OrderedDict()
+		for (vendorName, version, name), manifest in manifests.items():
+			dependencies = {dependency: manifests.get((vendorName, version, dependency)) for dependency in manifest.Dependencies}
+			reason = manifest.GetStaleReason(self._toolVersion, dependencies=dependencies)
+			if (reason is not None):
+				staleVendors.setdefault((vendorName, version), (manifest.VHDLVersion, []))[1].append((name, reason))
+		return [(vendorName, vhdlVersion, staleLibraries) for (vendorName, _), (vhdlVersion, staleLibraries) in staleVendors.items()]
+
+	def _PrepareLibraries(self, libraries):
+		pass
+
+	def _RunSequential(self, libraries):
+		progress = ProgressDisplay(libraries)
+		progress.Start()
+		try:
+			for library in libraries.values():
+				if any((self._results[dependency] is None) or (len(self._results[dependency]) > 0) for dependency in library.Dependencies):
+					self._SkipLibrary(library, progress)
+					continue
+				progress.StartItem(library.Name, library.Name)
+				self._FinishLibrary(library.Name, self.TryCompileLibrary(library), progress)
+		finally:
+			progress.Stop()
+
+	def _RunParallel(self, libraries):
+		global _parallelRun
+
+		try:
+			context = multiprocessing.get_context("fork")
+		except ValueError:
+			self._LogWarning("Parallel precompilation is not supported on this platform. Compiling {0} libraries sequentially.".format(len(libraries)))
+			return self._RunSequential(libraries)
+
+		jobs = min(self._jobs, len(libraries))
+		self._LogNormal("Compiling with {0} parallel jobs...".format(jobs))
+
+		# flush buffered output, otherwise every forked worker would repeat it
+		sys.stdout.flush()
+		sys.stderr.flush()
+
+		pending =       OrderedDict(libraries)
+		running =       set()
+		finished =      Queue()
+		progress =      ProgressDisplay(libraries)
+		_parallelRun =  (self, libraries)
+		try:
+			# fork all workers before the progress thread starts
+			with context.Pool(processes=jobs) as pool:
+				progress.Start()
+				try:
+					while ((len(pending) > 0) or (len(running) > 0)):
+						for library in list(pending.values()):
+							failed = [dependency for dependency in library.Dependencies if ((dependency in self._results) and ((self._results[dependency] is None) or (len(self._results[dependency]) > 0)))]
+							if (len(failed) > 0):
+								del pending[library.Name]
+								self._SkipLibrary(library, progress)
+							elif all((dependency in self._results) for dependency in library.Dependencies):
+								del pending[library.Name]
+								running.add(library.Name)
+								progress.StartItem(library.Name, library.Name)
+								pool.apply_async(_RunParallelJob, (library.Name,),
+									callback=lambda result, name=library.Name: finished.put((name, result)),
+									error_callback=lambda ex, name=library.Name: finished.put((name, [("", str(ex))])))
+
+						if (len(running) == 0):
+							continue
+						name, result = finished.get()
+						running.remove(name)
+						self._FinishLibrary(name, result, progress)
+				finally:
+					progress.Stop()
+				pool.close()
+				pool.join()
+		finally:
+			_parallelRun = None
+
+	def _SkipLibrary(self, library, progress):
+		self._results[library.Name] = None
+		progress.StartItem(library.Name, library.Name)
+		progress.FinishItem(library.Name, worker=library.Name)
+
+	def _FinishLibrary(self, name, failures, progress):
+		self._results[name] = failures
+		progress.Clear()
+		if (len(failures) == 0):
+			self._LogNormal("  {GREEN}Compiled library '{0}'.{NOCOLOR}".format(name, **Init.Foreground))
+		else:
+			self._LogNormal("  {RED}Compiled library '{0}' with {1} errors.{NOCOLOR}".format(name, len(failures), **Init.Foreground))
+		progress.FinishItem(name, passed=(len(failures) == 0), failed=(len(failures) > 0), worker=name)
+
+	def TryCompileLibrary(self, library):
+		"""Compile all files of a library. Returns the failed files as (file, message) tuples."""
+		manifestPath = self._GetManifestPath(self._vendor.Name, library.Name, self._vhdlVersion)
+		try:
+			# a library is stale, until it has been compiled without errors
+			if manifestPath.exists():
+				os_unlink(str(manifestPath))
+
+			failures = self._CompileLibrary(library)
+			if (len(failures) == 0):
+				dependencies = OrderedDict((name, self._ReadManifest(name)) for name in library.Dependencies)
+				LibraryManifest.Create(manifestPath, self._vendor.Name, library, self._toolName, self._toolVersion, self._vhdlVersion, dependencies).Write()
+			return failures
+		except OSError as ex:
+			return [("", "Error while removing '{0!s}'. {1!s}".format(manifestPath, ex))]
+		except ExceptionBase as ex:
+			return [("", str(ex) if (ex.__cause__ is None) else "{0!s} {1!s}".format(ex, ex.__cause__))]
+
+	def _CompileLibrary(self, library):
+		raise NotImplementedError("PreCompiler._CompileLibrary() is not implemented by '{0}'.".format(self.__class__.__name__))
+
+	def PrintOverallPreCompileReport(self, libraries):
+		self._LogQuiet("{HEADLINE}{line}{NOCOLOR}".format(line="=" * 80, **Init.Foreground))
+		self._LogQuiet("{HEADLINE}{headline: ^80s}{NOCOLOR}".format(headline="Overall Precompile Report", **Init.Foreground))
+		self._LogQuiet("{HEADLINE}{line}{NOCOLOR}".format(line="=" * 80, **Init.Foreground))
+		self._LogQuiet("{Name: <24} | {Files: >5} | {Failed: >6} | {Status: ^11}".format(Name="Library", Files="Files", Failed="Failed", Status="Status"))
+		self._LogQuiet("-" * 80)
+		for library in libraries.values():
+			failures = self._results.get(library.Name)
+			if (library.Name in self._upToDate):
+				color, status, failed = "GREEN", "UP-TO-DATE", "-"
+			elif (failures is None):
+				color, status, failed = "YELLOW", "SKIPPED", "-"
+			else:
+				color, status, failed = ("GREEN", "OK", 0) if (len(failures) == 0) else ("RED", "FAILED", len(failures))
+			self._LogQuiet("{COLOR}{Name: <24} | {Files: >5} | {Failed: >6} | {Status: ^11}{NOCOLOR}".format(
+				COLOR=Init.Foreground[color], Name=library.Name, Files=len(library.Files), Failed=failed, Status=status, NOCOLOR=Init.Foreground["NOCOLOR"]))
+		self._LogQuiet("{HEADLINE}{line}{NOCOLOR}".format(line="=" * 80, **Init.Foreground))
+
+		for name, failures in self._results.items():
+			if (failures is None):
+				dependencies = ", ".join(libraries[name].Dependencies)
+				self._LogQuiet("{YELLOW}{0}: skipped, because a referenced library failed ({1}).{NOCOLOR}".format(name, dependencies, **Init.Foreground))
+				continue
+			for filePath, message in failures:
+				self._LogQuiet("{RED}{0}: {1}{2}{NOCOLOR}".format(name, filePath, "" if (message == "") else " - " + message, **Init.Foreground))
@@ -0,0 +1,226 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      ProgressDisplay and RuntimeHistory
+#
+# Description:
+# ------------------------------------
+#		Live progress of long runs (e.g. simulation regressions):
+#		- ProgressDisplay shows completed/running/queued counts, result tallies,
+#		  the running item of each worker, the throughput and an ETA
+#		- on a terminal, the status line is redrawn in place; otherwise (e.g. in
+#		  CI logs) a plain-text line is printed periodically
+#		- RuntimeHistory records the run time of each item for the ETA of the
+#		  next run
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module Base.Progress")
+
+
+# load dependencies
+import sys
+from collections      import OrderedDict
+from shutil           import get_terminal_size
+from threading        import Event, RLock, Thread
+from time             import monotonic
+
+
+class RuntimeHistory:
+	"""Run times (in seconds) of previous runs, stored as '<tool>\\t<name>\\t<seconds>' lines."""
+	def __init__(self, filePath, tool):
+		self._filePath =  filePath
+		self._tool =      tool
+		self._runtimes =  OrderedDict()
+
+		if filePath.exists():
+			try:
+				with filePath.open('r') as fileHandle:
+					for line in fileHandle:
+						tool, name, seconds = line.rstrip("\n").split("\t")
+						self._runtimes[(tool, name)] = float(seconds)
+			except (OSError, ValueError):
+				self._runtimes.clear()			# a broken history is no reason to fail a run
+
+	def __getitem__(self, name):
+		return self._runtimes.get((self._tool, name))
+
+	def __setitem__(self, name, seconds):
+		self._runtimes[(self._tool, name)] = seconds
+
+	def Save(self):
+		try:
+			with self._filePath.open('w') as fileHandle:
+				for (tool, name), seconds in self._runtimes.items():
+					fileHandle.write("{0}\t{1}\t{2:.3f}\n".format(tool, name, seconds))
+		except OSError:
+			pass
+
+
+class ProgressDisplay:
+	_TTY_INTERVAL =   1.0
+	_TEXT_INTERVAL =  60.0
+
+	def __init__(self, names, history=None, stream=None, interval=None):
+		self._stream =    sys.stdout if (stream is None) else stream
+		self._isTTY =     self._stream.isatty()
+		self._interval =  interval if (interval is not None) else (self._TTY_INTERVAL if self._isTTY else self._TEXT_INTERVAL)
+		self._history =   history
+
+		self._queued =    OrderedDict((name, None) for name in names)
+		self._running =   OrderedDict()			# worker -> (name, start time)
+		self._total =     len(self._queued)
+		self._completed = 0
+		self._passed =    0
+		self._failed =    0
+		self._errors =    0
+		self._runtimes =  []
+
+		self._startTime = monotonic()
+		self._lock =      RLock()
+		self._stop =      Event()
+		self._thread =    None
+		self._visible =   False
+
+	def Start(self):
+		# refresh elapsed time and ETA also while a long item is running
+		self._thread = Thread(target=self._Tick, name="ProgressDisplay", daemon=True)
+		self._thread.start()
+
+	def Stop(self):
+		self._stop.set()
+		if (self._thread is not None):
+			self._thread.join()
+		with self._lock:
+			self.Clear()
+			if (not self._isTTY):
+				self._Write(self.GetStatusLine() + "\n")
+		if (self._history is not None):
+			self._history.Save()
+
+	def StartItem(self, name, worker=0):
+		with self._lock:
+			self._queued.pop(name, None)
+			self._running[worker] = (name, monotonic())
+			self.Draw()
+
+	def AbortItem(self, name, worker=0):
+		"""Put the running item of a worker back into the queue, e.g. if the worker was lost."""
+		with self._lock:
+			self._running.pop(worker, None)
+			self._queued[name] = None
+			self.Draw()
+
+	def FinishItem(self, name, passed=False, failed=False, worker=0):
+		"""Finish an item: passed and failed are exclusive, neither means an error."""
+		with self._lock:
+			_, startTime = self._running.pop(worker, (name, monotonic()))
+			runtime = monotonic() - startTime
+			self._runtimes.append(runtime)
+			if (self._history is not None):
+				self._history[name] = runtime
+
+			self._completed += 1
+			if passed:      self._passed += 1
+			elif failed:    self._failed += 1
+			else:           self._errors += 1
+			self.Draw()
+
+	def Clear(self):
+		"""Remove the status line from the terminal, e.g. before other output is printed."""
+		with self._lock:
+			if self._visible:
+				self._Write("\r\x1b[K")
+				self._visible = False
+
+	def Print(self, text):
+		"""Print a line of other output above the status line; the tick thread can't redraw in between."""
+		with self._lock:
+			self.Clear()
+			self._Write(text + "\n")
+			self.Draw()
+
+	def Draw(self):
+		"""Redraw the status line on a terminal."""
+		if (not self._isTTY): return
+		with self._lock:
+			line = self.GetStatusLine()[:get_terminal_size().columns - 1]
+			self._Write("\r\x1b[K" + line)
+			self._visible = True
+
+	def GetStatusLine(self):
+		with self._lock:
+			elapsed = monotonic() - self._startTime
+			parts = [
+				"{0}/{1} done, {2} running, {3} queued".format(self._completed, self._total, len(self._running), len(self._queued)),
+				"{0} passed, {1} failed, {2} errors".format(self._passed, self._failed, self._errors),
+				"{0:.1f}/min".format(self._completed * 60.0 / elapsed if (elapsed > 0) else 0.0),
+				"ETA {0}".format(self._FormatTime(self._GetRemainingTime()))
+			]
+			for worker, (name, _) in self._running.items():
+				parts.append("[{0}] {1}".format(worker, name))
+			return " | ".join(parts)
+
+	def _GetRemainingTime(self):
+		"""Estimate the remaining time from recorded run times, or the mean run time of this run."""
+		mean = (sum(self._runtimes) / len(self._runtimes)) if (len(self._runtimes) > 0) else None
+
+		def estimate(name):
+			runtime = None if (self._history is None) else self._history[name]
+			return mean if (runtime is None) else runtime
+
+		remaining = 0.0
+		now = monotonic()
+		for name, startTime in self._running.values():
+			runtime = estimate(name)
+			if (runtime is None): return None
+			remaining += max(runtime - (now - startTime), 0.0)
+		for name in self._queued:
+			runtime = estimate(name)
+			if (runtime is None): return None
+			remaining += runtime
+		return remaining / max(len(self._running), 1)
+
+	@staticmethod
+	def _FormatTime(seconds):
+		if (seconds is None): return "?"
+		seconds = int(seconds)
+		return "{0}:{1:02}:{2:02}".format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+	def _Tick(self):
+		while (not self._stop.wait(self._interval)):
+			with self._lock:
+				if self._isTTY:
+					self.Draw()
+				else:
+					self._Write(self.GetStatusLine() + "\n")
+
+	def _Write(self, text):
+		self._stream.write(text)
+		self._stream.flush()
@@ -31,7 +31,11 @@
 # ==============================================================================
 #
 # load dependencies
+from collections        import OrderedDict
 from enum               import Enum, unique
+from heapq              import merge as heapq_merge
+from operator           import itemgetter
+from os.path            import abspath, normcase
 from pathlib            import Path
 from flags              import Flags
 
@@ -115,6 +119,7 @@ class Tool(Enum):
 	Aldec_aSim =         10
 	Altera_Quartus_Map = 20
 	Cocotb_QuestaSim =   30
+	Cocotb_GHDL =        31
 	GHDL =               40
 	GTKwave =            41
 	Lattice_LSE =        50
@@ -324,14 +329,17 @@ class Project:
 		fileSet.AddSourceFile(file)
 		return file
 
-	def Files(self, fileType=FileTypes.Any, fileSet=None):
+	def Files(self, fileType=FileTypes.Any, fileSet=None, vhdlLibrary=None):
 		if (fileSet is None):
 			if (self._defaultFileSet is None):            raise CommonException("Neither the parameter 'fileSet' set nor a default file set is given.")
 			fileSet = self._defaultFileSet
 		# print("init Project.Files generator")
-		for file in fileSet.Files:
-			if (file.FileType in fileType):
-				yield file
+		if (vhdlLibrary is None):
+			yield from fileSet.GetFiles(fileType)
+		else:
+			for file in fileSet.GetVHDLLibraryFiles(vhdlLibrary):
+				if (file.FileType in fileType):
+					yield file
 
 	def ExtractVHDLLibrariesFromVHDLSourceFiles(self):
 		for file in self.Files(fileType=FileTypes.VHDLSourceFile):
@@ -386,11 +394,18 @@ class Project:
 		return self._name
 
 class FileSet:
+	"""An insertion-ordered set of files, keyed by their resolved path.
+
+	Each file type and each VHDL library has its own index, so querying the
+	files of a type or a library doesn't filter the whole file set.
+	"""
 	def __init__(self, name, project = None):
 		# print("FileSet.__init__: name={0}  project={0}".format(name, project))
-		self._name =    name
-		self._project =  project
-		self._files =    []
+		self._name =          name
+		self._project =        project
+		self._files =          OrderedDict()		# resolved path -> file
+		self._fileTypes =      OrderedDict()		# file type -> [(position, file), ...]
+		self._vhdlLibraries =  OrderedDict()		# VHDL library name -> [file, ...]
 
 	@property
 	def Name(self):
@@ -407,7 +422,33 @@ class FileSet:
 
 	@property
 	def Files(self):
-		return self._files
+		return self._files.values()
+
+	@property
+	def VHDLLibraryNames(self):
+		return self._vhdlLibraries.keys()
+
+	def GetFiles(self, fileType=FileTypes.Any):
+		"""Return all files of the given file types in insertion order."""
+		indices = [files for indexType, files in self._fileTypes.items() if (indexType in fileType)]
+		if (len(indices) == len(self._fileTypes)):
+			return self._files.values()
+		elif (len(indices) == 1):
+			return (file for _, file in indices[0])
+		# restore the insertion order of files of several types
+		return (file for _, file in heapq_merge(*indices, key=itemgetter(0)))
+
+	def GetVHDLLibraryFiles(self, libraryName):
+		return self._vhdlLibraries.get(libraryName.lower(), [])
+
+	def _AppendFile(self, file):
+		key = file.ResolvedPath
+		if (key in self._files):  return
+
+		self._fileTypes.setdefault(file.FileType, []).append((len(self._files), file))
+		if isinstance(file, VHDLSourceFile):
+			self._vhdlLibraries.setdefault(file.LibraryName, []).append(file)
+		self._files[key] = file
 
 	def AddFile(self, file):
 		# print("FileSet.AddFile: file={0}".format(file))
@@ -422,11 +463,7 @@ class FileSet:
 		elif (not isinstance(file, File)):              raise ValueError("Unsupported parameter type for 'file'.")
 		file.FileSet = self
 		file.Project = self._project
-
-		for f in self._files:
-			if (f.FileName == file.FileName):  break
-		else:
-			self._files.append(file)
+		self._AppendFile(file)
 
 	def AddSourceFile(self, file):
 		# print("FileSet.AddSourceFile: file={0}".format(file))
@@ -438,11 +475,7 @@ class FileSet:
 		elif (not isinstance(file, SourceFile)):        raise ValueError("Unsupported parameter type for 'file'.")
 		file.FileSet = self
 		file.Project = self._project
-
-		for f in self._files:
-			if (f.FileName == file.FileName):  break
-		else:
-			self._files.append(file)
+		self._AppendFile(file)
 
 	def __str__(self):
 		return self._name
@@ -451,7 +484,7 @@ class VHDLLibrary:
 	def __init__(self, name, project = None):
 		self._name =    name
 		self._project =  project
-		self._files =    []
+		self._files =    OrderedDict()		# resolved path -> file
 
 	@property
 	def Name(self):
@@ -468,16 +501,12 @@ class VHDLLibrary:
 
 	@property
 	def Files(self):
-		return self._files
+		return self._files.values()
 
 	def AddFile(self, file):
 		if (not isinstance(file, VHDLSourceFile)):      raise ValueError("Unsupported parameter type for 'file'.")
 		file.VHDLLibrary = self
-
-		for f in self._files:
-			if (f.FileName == file.FileName):  break
-		else:
-			self._files.append(file)
+		self._files.setdefault(file.ResolvedPath, file)
 
 	def __str__(self):
 		return self._name
@@ -485,6 +514,7 @@ class VHDLLibrary:
 
 class File:
 	_FileType = FileTypes.Unknown
+	__slots__ = ("_handle", "_content", "_file", "_resolvedPath", "_project", "_fileSet")
 
 	def __init__(self, file, project = None, fileSet = None):
 		self._handle =  None
@@ -493,6 +523,7 @@ class File:
 		if isinstance(file, str):
 			file = Path(file)
 		self._file =    file
+		self._resolvedPath = None
 		self._project =  project
 		self._fileSet =  fileSet
 
@@ -529,6 +560,13 @@ class File:
 	def Path(self):
 		return self._file
 
+	@property
+	def ResolvedPath(self):
+		"""The absolute, normalized path, which identifies a file in a file set; it's resolved without accessing the file system."""
+		if (self._resolvedPath is None):
+			self._resolvedPath = normcase(abspath(str(self._file)))
+		return self._resolvedPath
+
 	def Open(self):
 		if (not self._file.exists()):    raise CommonException("File '{0!s}' not found.".format(self._file)) from FileNotFoundError(str(self._file))
 		try:
@@ -554,6 +592,7 @@ class File:
 
 class ProjectFile(File):
 	_FileType = FileTypes.ProjectFile
+	__slots__ = ()
 
 	def __str__(self):
 		return "Project file: '{0!s}".format(self._file)
@@ -561,18 +600,21 @@ class ProjectFile(File):
 
 class SourceFile(File):
 	_FileType = FileTypes.SourceFile
+	__slots__ = ()
 
 	def __str__(self):
 		return "Source file: '{0!s}".format(self._file)
 
 class ConstraintFile(File):
 	_FileType = FileTypes.ConstraintFile
+	__slots__ = ()
 
 	def __str__(self):
 		return "Constraint file: '{0!s}".format(self._file)
 
 class SettingsFile(File):
 	_FileType = FileTypes.SettingsFile
+	__slots__ = ()
 
 	def __str__(self):
 		return "Settings file: '{0!s}".format(self._file)
@@ -580,6 +622,7 @@ class SettingsFile(File):
 
 class VHDLSourceFile(SourceFile, VHDLSourceFileMixIn):
 	_FileType = FileTypes.VHDLSourceFile
+	__slots__ = ("_library", "VHDLLibrary")
 
 	def __init__(self, file, vhdlLibraryName, project = None, fileSet = None):
 		super().__init__(file, project=project, fileSet=fileSet)
@@ -593,6 +636,7 @@ class VHDLSourceFile(SourceFile, VHDLSourceFileMixIn):
 
 class VerilogSourceFile(SourceFile, VerilogSourceFileMixIn):
 	_FileType = FileTypes.VerilogSourceFile
+	__slots__ = ()
 
 	def __init__(self, file, project = None, fileSet = None):
 		super().__init__(file, project=project, fileSet=fileSet)
@@ -604,6 +648,7 @@ class VerilogSourceFile(SourceFile, VerilogSourceFileMixIn):
 
 class PythonSourceFile(SourceFile):
 	_FileType = FileTypes.PythonSourceFile
+	__slots__ = ()
 
 	def __str__(self):
 		return "Python file: '{0!s}".format(self._file)
@@ -611,6 +656,7 @@ class PythonSourceFile(SourceFile):
 
 class CocotbSourceFile(PythonSourceFile, CocotbSourceFileMixIn):
 	_FileType = FileTypes.CocotbSourceFile
+	__slots__ = ()
 
 	def __init__(self, file, project=None, fileSet=None):
 		super().__init__(file, project=project, fileSet=fileSet)
@@ -0,0 +1,107 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      Shard
+#
+# Description:
+# ------------------------------------
+#		Splits a regression run into N shards, e.g. to distribute it onto several
+#		CI machines. Each shard selects its part of all entities:
+#		- with run times of a previous run, the entities are balanced by their run
+#		  time (longest first onto the least loaded shard)
+#		- otherwise, each entity is assigned by a hash of its name
+#		The assignment depends only on the entity names and the given run times,
+#		so all shards of a run agree on it without any communication.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module Base.Shard")
+
+
+# load dependencies
+import hashlib
+
+from Base.Exceptions  import CommonException
+
+
+class Shard:
+	"""Shard 'Index' (1..Count) of a run, which is split into 'Count' shards."""
+	def __init__(self, index, count, runtimes=None):
+		if ((count < 1) or (index < 1) or (index > count)):
+			raise CommonException("Shard {0}/{1} is out of range. Expected i/N with 1 <= i <= N.".format(index, count))
+
+		self._index =     index
+		self._count =     count
+		self._runtimes =  runtimes if (runtimes is not None) else {}
+
+	@classmethod
+	def Parse(cls, value, runtimes=None):
+		"""Parse a shard given as 'i/N'."""
+		try:
+			index, count = value.split("/")
+			return cls(int(index), int(count), runtimes)
+		except ValueError as ex:
+			raise CommonException("Shard '{0}' is not of the form 'i/N'.".format(value)) from ex
+
+	def __str__(self):
+		return "{0}/{1}".format(self._index, self._count)
+
+	@property
+	def Index(self):    return self._index
+	@property
+	def Count(self):    return self._count
+
+	@staticmethod
+	def _GetHash(name):
+		return int(hashlib.sha256(name.encode()).hexdigest(), 16)
+
+	def GetAssignment(self, names):
+		"""Return the shard (1..Count) of each name."""
+		runtimes = [self._runtimes.get(name) for name in names]
+		known =    [runtime for runtime in runtimes if (runtime is not None)]
+		if (len(known) == 0):
+			return [(self._GetHash(name) % self._count) + 1 for name in names]
+
+		# entities without a recorded run time are estimated by the mean run time
+		mean =      sum(known) / len(known)
+		estimates = [mean if (runtime is None) else runtime for runtime in runtimes]
+		order =     sorted(range(len(names)), key=lambda i: (-estimates[i], self._GetHash(names[i]), names[i]))
+
+		loads =       [0.0] * self._count
+		assignment =  [None] * len(names)
+		for i in order:
+			shard = min(range(self._count), key=lambda s: (loads[s], s))
+			loads[shard] +=  estimates[i]
+			assignment[i] =  shard + 1
+		return assignment
+
+	def Select(self, items, getName=str):
+		"""Return all items, which are assigned to this shard. The order of items is preserved."""
+		assignment = self.GetAssignment([getName(item) for item in items])
+		return [item for item, shard in zip(items, assignment) if (shard == self._index)]
@@ -45,6 +45,7 @@ import shutil
 from os                 import chdir
 
 from lib.Parser         import ParserException
+from Base.Distributed   import Job, GetSourceFingerprint
 from Base.Exceptions    import CommonException, SkipableCommonException
 from Base.Logging       import ILogable
 from Base.Project       import ToolChain, Tool, VHDLVersion, Environment
@@ -72,6 +73,8 @@ class Shared(ILogable):
 
 		self._pocProject =  None
 		self._directories = self.__Directories__()
+		self._shard =       None
+		self._coordinator = None
 
 
 	# class properties
@@ -83,6 +86,44 @@ class Shared(ILogable):
 	@property
 	def Directories(self):  return self._directories
 
+	@property
+	def Shard(self):              return self._shard
+	@Shard.setter
+	def Shard(self, value):       self._shard = value
+
+	@property
+	def Coordinator(self):        return self._coordinator
+	@Coordinator.setter
+	def Coordinator(self, value): self._coordinator = value
+
+	def _GetSourceFiles(self, item, board):
+		"""Return all source files of a testbench or netlist, which a worker needs in the same version."""
+		self._CreatePoCProject(item.ModuleName, board)
+		self._AddFileListFile(item.FilesFile)
+		return [item.FilesFile] + [file.Path for file in self._pocProject.Files()]
+
+	def _GetJobs(self, items, board):
+		"""Create a job with a source fingerprint for every item, which is run by a worker. Returns the jobs and all failed items."""
+		jobs =        []
+		failedItems = []
+		for item in items:
+			try:
+				filePaths = self._GetSourceFiles(item, board)
+			except SkipableCommonException as ex:
+				self._LogError("{0!s}: {1}".format(item.Parent, ex.message))
+				failedItems.append(item)
+				continue
+			jobs.append(Job(item, str(item.Parent), GetSourceFingerprint(self.Host.Directories.Root, filePaths)))
+		return jobs, failedItems
+
+	def _SelectShard(self, items):
+		"""Select the items (testbenches or netlists) of this shard, if the run is split into shards."""
+		if (self._shard is None): return items
+
+		selected = self._shard.Select(items, lambda item: str(item.Parent))
+		self._LogNormal("Shard {0!s}: running {1} of {2} entities.".format(self._shard, len(selected), len(items)))
+		return selected
+
 	def _PrepareEnvironment(self):
 		# create fresh temporary directory
 		self._LogVerbose("Creating fresh temporary directory.")
@@ -43,15 +43,19 @@ else:
 
 # load dependencies
 from datetime           import datetime
+from multiprocessing    import cpu_count
 from enum               import Enum, unique
 
 from lib.Functions      import Init
 from Base.Exceptions    import ExceptionBase, SkipableException
 from Base.Logging       import LogEntry
+from Base.PreCompiler   import PreCompilerException
+from Base.Progress      import ProgressDisplay, RuntimeHistory
 from Base.Project       import Environment, VHDLVersion
 from Base.Shared        import Shared
 from PoC.Entity         import WildCard
 from PoC.TestCase       import TestSuite, TestCase, Status
+from PoC.TestResult     import ResultFile
 
 
 VHDL_TESTBENCH_LIBRARY_NAME = "test"
@@ -90,7 +94,11 @@ def to_time(seconds):
 
 
 class Simulator(Shared):
-	_ENVIRONMENT = Environment.Simulation
+	_ENVIRONMENT =      Environment.Simulation
+	_RUNTIME_HISTORY =  "poc.runtimes"
+	_PRECOMPILER =      None				# PreCompiler class, which rebuilds stale precompiled libraries
+
+	__PASSED_STATUSES__ = (Status.SimulationSuccess, Status.SimulationNoAsserts, Status.SimulationSkipped)
 
 	class __Directories__(Shared.__Directories__):
 		PreCompiled = None
@@ -100,6 +108,7 @@ class Simulator(Shared):
 
 		self._vhdlVersion = VHDLVersion.VHDL2008
 		self._testSuite =   TestSuite()			# TODO: This includes not the read ini files phases ...
+		self._resultFile =  None
 
 		self._state =           SimulationState.Prepare
 		self._startAt =         datetime.now()
@@ -115,6 +124,10 @@ class Simulator(Shared):
 	# ============================================================================
 	@property
 	def TestSuite(self):      return self._testSuite
+	@property
+	def ResultFile(self):     return self._resultFile
+	@ResultFile.setter
+	def ResultFile(self, value):  self._resultFile = value
 
 	def _GetTimeDeltaSinceLastEvent(self):
 		now = datetime.now()
@@ -126,27 +139,125 @@ class Simulator(Shared):
 		self._LogNormal("Preparing simulation environment...")
 		self._PrepareEnvironment()
 
+	def _GetTestbenches(self, fqnList):
+		"""Expand wildcards to all selected testbenches."""
+		for fqn in fqnList:
+			entity = fqn.Entity
+			if (isinstance(entity, WildCard)):
+				for testbench in entity.GetVHDLTestbenches():
+					yield testbench
+			else:
+				yield entity.VHDLTestbench
+
 	def RunAll(self, fqnList, *args, **kwargs):
 		"""Run a list of testbenches. Expand wildcards to all selected testbenches."""
 		self._testSuite.StartTimer()
+		self._UpdatePreCompiledLibraries(kwargs["board"])
+		testbenches = self._SelectShard(list(self._GetTestbenches(fqnList)))
+
+		# show a live status line, the ETA is based on the run times of previous runs
+		history =   RuntimeHistory(self.Host.Directories.Temp / self._RUNTIME_HISTORY, self._TOOL.name)
+		progress =  ProgressDisplay([str(testbench.Parent) for testbench in testbenches], history)
+		if (self.Logger is not None): self.Logger.StatusLine = progress
+		progress.Start()
 		try:
-			for fqn in fqnList:
-				entity = fqn.Entity
-				if (isinstance(entity, WildCard)):
-					for testbench in entity.GetVHDLTestbenches():
-						self.TryRun(testbench, *args, **kwargs)
-				else:
-					testbench = entity.VHDLTestbench
-					self.TryRun(testbench, *args, **kwargs)
+			if (self._coordinator is not None):
+				self._RunOnWorkers(testbenches, progress, kwargs["board"], kwargs["vhdlVersion"])
+			else:
+				for testbench in testbenches:
+					name = str(testbench.Parent)
+					progress.StartItem(name)
+					testCase = self.TryRun(testbench, *args, **kwargs)
+					progress.FinishItem(name, passed=(testCase.Status in self.__PASSED_STATUSES__), failed=(testCase.Status is Status.SimulationFailed))
 		except KeyboardInterrupt:
 			self._LogError("Received a keyboard interrupt.")
 		finally:
+			if (self.Logger is not None): self.Logger.StatusLine = None
+			progress.Stop()
 			self._testSuite.StopTimer()
 
 		self.PrintOverallSimulationReport()
+		if (self._resultFile is not None):
+			self._LogNormal("Writing results to '{0!s}'.".format(self._resultFile))
+			ResultFile(self._resultFile).Write(self._testSuite, self._shard)
+
+		return self._testSuite.IsAllPassed
+
+	def _UpdatePreCompiledLibraries(self, board):
+		if (self._PRECOMPILER is not None):
+			self._RebuildStaleLibraries(self._PRECOMPILER, board)
+
+	def _RebuildStaleLibraries(self, preCompilerClass, board):
+		"""Check the manifests of the precompiled vendor libraries and rebuild only the stale libraries."""
+		precompiler = preCompilerClass(self.Host, self._dryRun, jobs=cpu_count())
+		for vendorName, vhdlVersion, staleLibraries in precompiler.GetStaleLibraries():
+			for name, reason in staleLibraries:
+				self._LogWarning("Precompiled library '{0}' of '{1}' for {2!s} is stale: {3}".format(name, vendorName, vhdlVersion, reason))
+			try:
+				if (not precompiler.Run(vendorName, board, vhdlVersion)):
+					self._LogWarning("Not all stale libraries of '{0}' could be rebuilt.".format(vendorName))
+			except PreCompilerException as ex:
+				self._LogWarning("Cannot rebuild the libraries of '{0}': {1!s}".format(vendorName, ex))
+
+	def MergeResultFiles(self, filePaths):
+		"""Merge the result files of several shards into one TestSuite and print the overall report."""
+		runTimes = []
+		for filePath in filePaths:
+			resultFile = ResultFile(filePath)
+			resultFile.Read()
+			self._LogVerbose("Read {0} test cases of shard {1} from '{2!s}'.".format(len(resultFile.Results), resultFile.Shard or "-", filePath))
+			for result in resultFile.AddToTestSuite(self._testSuite):
+				self._LogWarning("Test case '{0}' is in more than one result file. Using the result from '{1!s}'.".format(".".join(result.Path + [result.Name]), filePath))
+			if (resultFile.RunTime is not None): runTimes.append(resultFile.RunTime)
+
+		# shards run side by side, so the overall time is the time of the slowest shard
+		self._testSuite.SetRunTime(max(runTimes) if (len(runTimes) > 0) else 0)
+		self.PrintOverallSimulationReport()
+		if (self._resultFile is not None):
+			ResultFile(self._resultFile).Write(self._testSuite)
 
 		return self._testSuite.IsAllPassed
 
+	def _RunOnWorkers(self, testbenches, progress, board, vhdlVersion):
+		"""Run all testbenches on the workers of the coordinator and add their results to the TestSuite."""
+		self._vhdlVersion = vhdlVersion
+		jobs, failedTestbenches = self._GetJobs(testbenches, board)
+		for testbench in failedTestbenches:
+			self._AddErrorTestCase(testbench)
+			progress.StartItem(str(testbench.Parent), worker=None)
+			progress.FinishItem(str(testbench.Parent), worker=None)
+
+		def _OnFinish(job, worker, result):
+			if (result is None):
+				statuses = [self._AddErrorTestCase(job.Item).Status]
+			elif ("error" in result):
+				self._LogError("Worker {0}: {1}".format(worker, result["error"]))
+				statuses = [self._AddErrorTestCase(job.Item).Status]
+			elif (result["results"] is None):
+				self._LogError("Worker {0}: no results for '{1}' (exit code {2}).".format(worker, job.Name, result["exitCode"]))
+				self._LogVerbose(result["output"])
+				statuses = [self._AddErrorTestCase(job.Item).Status]
+			else:
+				self._LogVerbose(result["output"])
+				resultFile = ResultFile.FromJSON(result["results"])
+				resultFile.AddToTestSuite(self._testSuite)
+				statuses = [testResult.Status for testResult in resultFile.Results]
+
+			passed = ((len(statuses) > 0) and all(status in self.__PASSED_STATUSES__ for status in statuses))
+			failed = ((not passed) and all((status in self.__PASSED_STATUSES__) or (status is Status.SimulationFailed) for status in statuses))
+			self._LogQuiet("{CYAN}Testbench:{NOCOLOR} {0} (worker {1})".format(job.Name, worker, **Init.Foreground))
+			progress.FinishItem(job.Name, passed=passed, failed=failed, worker=worker)
+
+		self._coordinator.Run(jobs, lambda job, worker: progress.StartItem(job.Name, worker), _OnFinish,
+													lambda job, worker: progress.AbortItem(job.Name, worker))
+
+	def _AddErrorTestCase(self, testbench):
+		testCase = TestCase(testbench)
+		self._testSuite.AddTestCase(testCase)
+		testCase.Status = Status.SystemError
+		testCase.SetRunTime(0.0)
+		return testCase
+
 	def TryRun(self, testbench, *args, **kwargs):
 		"""Try to run a testbench. Skip skipable exceptions by printing the error and its cause."""
 		__SIMULATION_STATE_TO_TESTCASE_STATUS__ = {
@@ -183,6 +294,8 @@ class Simulator(Shared):
 		finally:
 			testCase.StopTimer()
 
+		return testCase
+
 	def Run(self, testbench, board, vhdlVersion, vhdlGenerics=None, guiMode=False):
 		"""Write the Testbench message line, create a PoCProject and add the first *.files file to it."""
 		self._LogQuiet("{CYAN}Testbench:{NOCOLOR} {0!s}".format(testbench.Parent, **Init.Foreground))
@@ -259,6 +372,7 @@ class Simulator(Shared):
 		Status.SimulationError:     "RED",
 		Status.SimulationFailed:    "RED",
 		Status.SimulationNoAsserts: "YELLOW",
+		Status.SimulationSkipped:   "YELLOW",
 		Status.SimulationSuccess:   "GREEN"
 	}
 
@@ -271,6 +385,7 @@ class Simulator(Shared):
 		Status.SimulationError:     "SIM. ERROR",
 		Status.SimulationFailed:    "FAILED",
 		Status.SimulationNoAsserts: "NO ASSERTS",
+		Status.SimulationSkipped:   "SKIPPED",
 		Status.SimulationSuccess:   "PASSED"
 	}
 
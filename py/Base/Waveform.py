@@ -0,0 +1,393 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      VCDReader, SignalStatistics and WaveformComparison
+#
+# Description:
+# ------------------------------------
+#		Streaming access to waveform dumps, which works in constant memory:
+#		- *.vcd files are memory-mapped and parsed line by line
+#		- *.vcd.gz files are decompressed on the fly
+#		- *.fst files are converted on the fly by GTKWave's fst2vcd
+#		Per-signal statistics (changes, bit toggles, first/last change, glitches)
+#		are collected while a dump is read. A WaveformComparison reads a golden
+#		dump and a new dump side by side and reports all differing values.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module Base.Waveform")
+
+
+# load dependencies
+import gzip
+import mmap
+import subprocess
+from collections      import OrderedDict
+from fnmatch          import fnmatchcase
+
+from Base.Exceptions  import ExceptionBase
+
+
+class WaveformException(ExceptionBase):
+	pass
+
+
+_TIME_UNITS = OrderedDict([("s", 10**15), ("ms", 10**12), ("us", 10**9), ("ns", 10**6), ("ps", 10**3), ("fs", 1)])
+
+
+def ParseTime(text):
+	"""Parse a time like '2ns' or '500 ps' into femtoseconds. A plain number is taken as femtoseconds."""
+	value =   text.replace(" ", "").lower()
+	number =  value.rstrip("munpfs")
+	unit =    value[len(number):] or "fs"
+	try:
+		return int(number) * _TIME_UNITS[unit]
+	except (ValueError, KeyError):
+		raise WaveformException("Time '{0}' is not of the form '<integer>[s|ms|us|ns|ps|fs]'.".format(text)) from None
+
+
+def FormatTime(femtoseconds):
+	"""Format femtoseconds with the largest unit, which represents the time exactly."""
+	if (femtoseconds is None):  return "-"
+	for unit, factor in _TIME_UNITS.items():
+		if (femtoseconds % factor == 0):
+			return "{0} {1}".format(femtoseconds // factor, unit)
+
+
+class Signal:
+	__slots__ = ("Identifier", "Name", "Width", "IsReal")
+
+	_REAL_TYPES = frozenset([b"real", b"realtime", b"shortreal"])
+
+	def __init__(self, identifier, name, width, varType=b"wire"):
+		self.Identifier = identifier
+		self.Name =       name
+		self.Width =      width
+		self.IsReal =     (varType in self._REAL_TYPES)
+
+	def Normalize(self, value):
+		"""Left-extend a vector value to the signal width, as defined by IEEE 1364. Real values are returned as is."""
+		if (self.IsReal or (self.Width <= 1) or (len(value) >= self.Width)):
+			return value
+		fill = b"0" if (value[:1] == b"1") else value[:1]
+		return (fill * (self.Width - len(value))) + value
+
+
+class SignalStatistics:
+	"""Statistics of one signal. A glitch is a change, which follows the previous change within the glitch width."""
+	__slots__ = ("Name", "Changes", "Toggles", "FirstChange", "LastChange", "Glitches", "FirstGlitch", "_value")
+
+	def __init__(self, name):
+		self.Name =         name
+		self.Changes =      0
+		self.Toggles =      0			# number of flipped bits between binary values
+		self.FirstChange =  None
+		self.LastChange =   None
+		self.Glitches =     0
+		self.FirstGlitch =  None
+		self._value =       None
+
+	def Update(self, time, value, glitchWidth):
+		previous =    self._value
+		self._value = value
+		if (previous is None):
+			return										# initial value
+		if (value == previous):
+			return
+
+		if ((self.LastChange is not None) and (time - self.LastChange <= glitchWidth)):
+			self.Glitches += 1
+			if (self.FirstGlitch is None):  self.FirstGlitch = time
+		self.Changes += 1
+		if (self.FirstChange is None):    self.FirstChange = time
+		self.LastChange = time
+
+		try:
+			self.Toggles += bin(int(previous, 2) ^ int(value, 2)).count("1")
+		except ValueError:
+			pass											# 'X', 'Z', ... are no toggles
+
+
+class VCDReader:
+	"""Reads a VCD dump as a stream of value changes. All times are converted to femtoseconds."""
+	_SCALAR_VALUES = frozenset(b"01xXzZuUwWlLhH-")
+	_VECTOR_VALUES = frozenset(b"bBrR")
+
+	def __init__(self, filePath, fst2vcd="fst2vcd"):
+		self._filePath =    filePath
+		self._fst2vcd =     fst2vcd
+		self._fileHandle =  None
+		self._source =      None
+		self._process =     None
+		self._timescale =   1
+		self._signals =     OrderedDict()		# name -> Signal
+		self._identifiers = {}							# identifier -> [Signal, ...]
+
+	def __enter__(self):
+		self.Open()
+		return self
+
+	def __exit__(self, *_):
+		self.Close()
+
+	@property
+	def FilePath(self):   return self._filePath
+	@property
+	def Signals(self):    return self._signals
+	@property
+	def Timescale(self):  return self._timescale
+
+	def Open(self):
+		fileName = self._filePath.name.lower()
+		try:
+			if fileName.endswith(".fst"):
+				self._process = subprocess.Popen([str(self._fst2vcd), str(self._filePath)], stdout=subprocess.PIPE)
+				self._source =  self._process.stdout
+			elif fileName.endswith(".gz"):
+				self._source =  gzip.open(str(self._filePath), 'rb')
+			else:
+				self._fileHandle = self._filePath.open('rb')
+				self._source =     mmap.mmap(self._fileHandle.fileno(), 0, access=mmap.ACCESS_READ)
+		except (OSError, ValueError) as ex:
+			self.Close()
+			raise WaveformException("Error while opening waveform '{0!s}'.".format(self._filePath)) from ex
+
+		self._ReadHeader()
+
+	def Close(self):
+		for item in (self._source, self._fileHandle):
+			if (item is not None):  item.close()
+		if (self._process is not None):
+			self._process.kill()
+			self._process.wait()
+		self._source =      None
+		self._fileHandle =  None
+		self._process =     None
+
+	def _ReadTokens(self):
+		"""Yield all tokens of the header up to '$enddefinitions $end'."""
+		for line in iter(self._source.readline, b""):
+			for token in line.split():
+				yield token
+				if (token == b"$enddefinitions"):
+					return
+		raise WaveformException("Waveform '{0!s}' has no '$enddefinitions'.".format(self._filePath))
+
+	def _ReadHeader(self):
+		tokens = self._ReadTokens()
+		scopes = []
+		for token in tokens:
+			if (token == b"$scope"):
+				_, name = next(tokens), next(tokens)
+				scopes.append(name.decode())
+			elif (token == b"$upscope"):
+				scopes.pop()
+			elif (token == b"$timescale"):
+				self._timescale = self._ParseTimescale(self._ReadUntilEnd(tokens))
+				continue
+			elif (token == b"$var"):
+				values = self._ReadUntilEnd(tokens)
+				if (len(values) < 4):
+					raise WaveformException("Malformed $var in waveform '{0!s}'.".format(self._filePath))
+				width, identifier, reference = int(values[1]), values[2], values[3].decode()
+				# keep the index of single bits, which are dumped as own signals
+				if ((len(values) > 4) and (width == 1) and (b":" not in values[4])):
+					reference += values[4].decode()
+				signal = Signal(identifier, ".".join(scopes + [reference]), width, values[0])
+				self._signals[signal.Name] = signal
+				self._identifiers.setdefault(identifier, []).append(signal)
+				continue
+			elif (token == b"$enddefinitions"):
+				break
+			else:
+				continue
+			self._ReadUntilEnd(tokens)
+
+	@staticmethod
+	def _ReadUntilEnd(tokens):
+		values = []
+		for token in tokens:
+			if (token == b"$end"):  break
+			values.append(token)
+		return values
+
+	def _ParseTimescale(self, values):
+		text = b"".join(values).decode()
+		try:
+			return ParseTime(text)
+		except WaveformException as ex:
+			raise WaveformException("Unknown timescale '{0}' in waveform '{1!s}'.".format(text, self._filePath)) from ex
+
+	def GetSignalNames(self, patterns=None):
+		"""Return all signal names, which match one of the glob patterns (default: all)."""
+		if (patterns is None):
+			return list(self._signals)
+		return [name for name in self._signals if any(fnmatchcase(name, pattern) for pattern in patterns)]
+
+	def GetChanges(self, names=None):
+		"""Yield (time, signal, value) for all value changes of the given signals (default: all)."""
+		if (names is None):
+			selected = self._identifiers
+		else:
+			selected = {}
+			for name in names:
+				signal = self._signals[name]
+				selected.setdefault(signal.Identifier, []).append(signal)
+
+		scalarValues =  self._SCALAR_VALUES
+		vectorValues =  self._VECTOR_VALUES
+		timescale =     self._timescale
+		time =          0
+		inComment =     False
+		for line in iter(self._source.readline, b""):
+			tokens = line.split()
+			count =  len(tokens)
+			i =      0
+			while (i < count):
+				token = tokens[i]
+				i +=    1
+				if inComment:
+					inComment = (token != b"$end")
+					continue
+
+				first = token[0]
+				if (first == 35):							# '#'
+					time = int(token[1:]) * timescale
+					continue
+				elif (first in scalarValues):
+					value, identifier = token[:1], token[1:]
+				elif (first in vectorValues):
+					value, identifier = token[1:], tokens[i]
+					i += 1
+				else:
+					# keywords like $dumpvars, $end, ... carry no values; comments are skipped
+					inComment = token in (b"$comment", b"$date", b"$version")
+					continue
+
+				signals = selected.get(identifier)
+				if (signals is not None):
+					for signal in signals:
+						yield time, signal, value
+
+	def GetTimeSteps(self, names=None, statistics=None, glitchWidth=0):
+		"""
+		Yield (time, {name: value}) with the final values of all signals, which
+		changed at a time. All single changes update the statistics, if given.
+		"""
+		currentTime =  None
+		changes =      {}
+		for time, signal, value in self.GetChanges(names):
+			if (time != currentTime):
+				if (len(changes) > 0):
+					yield currentTime, changes
+				currentTime = time
+				changes =     {}
+			value = signal.Normalize(value)
+			changes[signal.Name] = value
+			if (statistics is not None):
+				statistics[signal.Name].Update(time, value, glitchWidth)
+		if (len(changes) > 0):
+			yield currentTime, changes
+
+	def GetStatistics(self, names=None, glitchWidth=0):
+		"""Read the whole dump and return the statistics of the given signals (default: all)."""
+		names =       self.GetSignalNames() if (names is None) else names
+		statistics =  OrderedDict((name, SignalStatistics(name)) for name in names)
+		for _ in self.GetTimeSteps(names, statistics, glitchWidth):
+			pass
+		return statistics
+
+
+class Mismatch:
+	__slots__ = ("Time", "Name", "Expected", "Actual")
+
+	def __init__(self, time, name, expected, actual):
+		self.Time =     time
+		self.Name =     name
+		self.Expected = expected
+		self.Actual =   actual
+
+
+class WaveformComparison:
+	"""Compare a waveform with a golden waveform over the given signals. Both dumps are read side by side."""
+	def __init__(self, golden, actual, names=None, glitchWidth=0, maxMismatches=10):
+		self._golden =        golden
+		self._actual =        actual
+		self._names =         golden.GetSignalNames() if (names is None) else names
+		self._glitchWidth =   glitchWidth
+		self._maxMismatches = maxMismatches
+
+		self._missing =       [name for name in self._names if (name not in actual.Signals)]
+		self._statistics =    OrderedDict((name, SignalStatistics(name)) for name in self._names if (name in actual.Signals))
+		self._counts =        OrderedDict((name, 0) for name in self._statistics)
+		self._mismatches =    []
+
+	@property
+	def Names(self):          return self._names
+	@property
+	def MissingSignals(self): return self._missing
+	@property
+	def Statistics(self):     return self._statistics
+	@property
+	def MismatchCounts(self): return self._counts
+	@property
+	def Mismatches(self):     return self._mismatches
+	@property
+	def IsEqual(self):        return ((len(self._missing) == 0) and (sum(self._counts.values()) == 0))
+
+	def Run(self):
+		names =         list(self._statistics)
+		goldenSteps =   self._golden.GetTimeSteps(names)
+		actualSteps =   self._actual.GetTimeSteps(names, self._statistics, self._glitchWidth)
+		goldenValues =  {}
+		actualValues =  {}
+
+		goldenStep = next(goldenSteps, None)
+		actualStep = next(actualSteps, None)
+		while ((goldenStep is not None) or (actualStep is not None)):
+			time = min(step[0] for step in (goldenStep, actualStep) if (step is not None))
+			changed = set()
+			if ((goldenStep is not None) and (goldenStep[0] == time)):
+				goldenValues.update(goldenStep[1])
+				changed.update(goldenStep[1])
+				goldenStep = next(goldenSteps, None)
+			if ((actualStep is not None) and (actualStep[0] == time)):
+				actualValues.update(actualStep[1])
+				changed.update(actualStep[1])
+				actualStep = next(actualSteps, None)
+
+			for name in changed:
+				expected, actual = goldenValues.get(name), actualValues.get(name)
+				if (expected != actual):
+					self._counts[name] += 1
+					if (len(self._mismatches) < self._maxMismatches):
+						self._mismatches.append(Mismatch(time, name, expected, actual))
+
+		self._mismatches.sort(key=lambda mismatch: (mismatch.Time, mismatch.Name))
+		return self.IsEqual
@@ -58,8 +58,8 @@ class Compiler(BaseCompiler):
 	_TOOL_CHAIN =  ToolChain.Lattice_Diamond
 	_TOOL =        Tool.Lattice_LSE
 
-	def __init__(self, host, dryRun, noCleanUp):
-		super().__init__(host, dryRun, noCleanUp)
+	def __init__(self, host, dryRun, noCleanUp, jobs=1, force=False):
+		super().__init__(host, dryRun, noCleanUp, jobs, force)
 
 		self._toolChain =      None
 
@@ -82,15 +82,11 @@ class Compiler(BaseCompiler):
 		version = diamondSection['Version']
 		self._toolChain =    Diamond(self.Host.Platform, binaryPath, version, logger=self.Logger)
 
-	def RunAll(self, fqnList, *args, **kwargs):
-		for fqn in fqnList:
-			entity = fqn.Entity
-			if (isinstance(entity, WildCard)):
-				for netlist in entity.GetLatticeNetlists():
-					self.TryRun(netlist, *args, **kwargs)
-			else:
-				netlist = entity.LatticeNetlist
-				self.TryRun(netlist, *args, **kwargs)
+	def _GetNetlists(self, entity):
+		if (isinstance(entity, WildCard)):
+			return entity.GetLatticeNetlists()
+		else:
+			return [entity.LatticeNetlist]
 
 	def Run(self, netlist, board):
 		super().Run(netlist, board)
@@ -103,13 +99,18 @@ class Compiler(BaseCompiler):
 		self._RunPreCopy(netlist)
 		self._RunPreReplace(netlist)
 
+		if self._RestoreNetlistFromCache(netlist, board.Device):
+			self._LogNormal("Executing post-processing tasks...")
+			self._RunPostProcessing(netlist)
+			return
+
 		self._LogNormal("Running Lattice Diamond LSE...")
 		self._RunCompile(netlist, lseArgumentFile)			# attach to netlist
 
 		self._LogNormal("Executing post-processing tasks...")
 		self._RunPostCopy(netlist)
-		self._RunPostReplace(netlist)
-		self._RunPostDelete(netlist)
+		self._StoreNetlistInCache(netlist)
+		self._RunPostProcessing(netlist)
 
 	def _WriteLSEProjectFile(self, netlist, board):
 		device = board.Device
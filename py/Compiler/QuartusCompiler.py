@@ -54,10 +54,15 @@ class Compiler(BaseCompiler):
 	_TOOL_CHAIN =  ToolChain.Altera_Quartus
 	_TOOL =        Tool.Altera_Quartus_Map
 
-	def __init__(self, host, dryRun, noCleanUp):
-		super().__init__(host, dryRun, noCleanUp)
+	def __init__(self, host, dryRun, noCleanUp, jobs=1, force=False, session=False):
+		super().__init__(host, dryRun, noCleanUp, jobs, force)
 
 		self._toolChain =      None
+		self._session =        session
+		self._tclShellPool =  None
+
+		# keep parallel workers alive, so every worker reuses its quartus_sh sessions
+		self._persistentWorkers = session
 
 		configSection = host.PoCConfig['CONFIG.DirectoryNames']
 		self.Directories.Working = host.Directories.Temp / configSection['QuartusSynthesisFiles']
@@ -72,15 +77,23 @@ class Compiler(BaseCompiler):
 		version =  quartusSection['Version']
 		self._toolChain =    Quartus(self.Host.Platform, binaryPath, version, logger=self.Logger)
 
+	def _GetNetlists(self, entity):
+		if (isinstance(entity, WildCard)):
+			return entity.GetQuartusNetlists()
+		else:
+			return [entity.QuartusNetlist]
+
 	def RunAll(self, fqnList, *args, **kwargs):
-		for fqn in fqnList:
-			entity = fqn.Entity
-			if (isinstance(entity, WildCard)):
-				for netlist in entity.GetQuartusNetlists():
-					self.TryRun(netlist, *args, **kwargs)
-			else:
-				netlist = entity.QuartusNetlist
-				self.TryRun(netlist, *args, **kwargs)
+		try:
+			return super().RunAll(fqnList, *args, **kwargs)
+		finally:
+			self._CloseToolSessions()
+
+	def _CloseToolSessions(self):
+		if (self._tclShellPool is not None):
+			self._LogVerbose("Closing quartus_sh Tcl sessions.")
+			self._tclShellPool.Close()
+			self._tclShellPool = None
 
 	def Run(self, netlist, board):
 		super().Run(netlist, board)
@@ -94,13 +107,18 @@ class Compiler(BaseCompiler):
 		self._RunPreCopy(netlist)
 		self._RunPreReplace(netlist)
 
+		if self._RestoreNetlistFromCache(netlist, board.Device):
+			self._LogNormal("Executing post-processing tasks...")
+			self._RunPostProcessing(netlist)
+			return
+
 		self._LogNormal("Running Altera Quartus Map...")
 		self._RunCompile(netlist)
 
 		self._LogNormal("Executing post-processing tasks...")
 		self._RunPostCopy(netlist)
-		self._RunPostReplace(netlist)
-		self._RunPostDelete(netlist)
+		self._StoreNetlistInCache(netlist)
+		self._RunPostProcessing(netlist)
 
 	def _WriteSpecialSectionIntoConfig(self, device):
 		# add the key Device to section SPECIAL at runtime to change interpolation results
@@ -124,6 +142,10 @@ class Compiler(BaseCompiler):
 		quartusProject.Write()
 
 	def _RunCompile(self, netlist):
+		if self._session:
+			self._RunCompileInSession(netlist)
+			return
+
 		q2map = self._toolChain.GetMap()
 		q2map.Parameters[q2map.ArgProjectName] =  str(netlist.QsfFile)
 
@@ -133,3 +155,22 @@ class Compiler(BaseCompiler):
 			raise CompilerException("Error while compiling '{0!s}'.".format(netlist)) from ex
 		if q2map.HasErrors:
 			raise SkipableCompilerException("Error while compiling '{0!s}'.".format(netlist))
+
+	def _RunCompileInSession(self, netlist):
+		if (self._tclShellPool is None):
+			self._tclShellPool = self._toolChain.GetTclShellPool()
+
+		try:
+			tclShell = self._tclShellPool.Acquire()
+		except QuartusException as ex:
+			raise CompilerException("Error while starting a quartus_sh Tcl session.") from ex
+
+		try:
+			tclShell.Map(netlist.QsfFile)
+		except QuartusException as ex:
+			raise SkipableCompilerException("Error while compiling '{0!s}'.".format(netlist)) from ex
+		finally:
+			# crashed sessions are dropped by the pool and restarted on demand
+			self._tclShellPool.Release(tclShell)
+		if tclShell.HasErrors:
+			raise SkipableCompilerException("Error while compiling '{0!s}'.".format(netlist))
@@ -53,11 +53,16 @@ class Compiler(BaseCompiler):
 	_TOOL_CHAIN =  ToolChain.Xilinx_Vivado
 	_TOOL =        Tool.Xilinx_Synth
 
-	def __init__(self, host, dryRun, noCleanUp):
-		super().__init__(host, dryRun, noCleanUp)
+	def __init__(self, host, dryRun, noCleanUp, jobs=1, force=False, session=False):
+		super().__init__(host, dryRun, noCleanUp, jobs, force)
 
 		self._device =      None
 		self._toolChain =    None
+		self._session =      session
+		self._tclShell =    None
+
+		# keep parallel workers alive, so every worker reuses its Vivado session
+		self._persistentWorkers = session
 
 		configSection = host.PoCConfig['CONFIG.DirectoryNames']
 		self.Directories.Working = host.Directories.Temp / configSection['VivadoSynthesisFiles']
@@ -73,15 +78,17 @@ class Compiler(BaseCompiler):
 		version = iseSection['Version']
 		self._toolChain =    Vivado(self.Host.Platform, binaryPath, version, logger=self.Logger)
 
+	def _GetNetlists(self, entity):
+		if (isinstance(entity, WildCard)):
+			return entity.GetVivadoNetlists()
+		else:
+			return [entity.VivadoNetlist]
+
 	def RunAll(self, fqnList, *args, **kwargs):
-		for fqn in fqnList:
-			entity = fqn.Entity
-			if (isinstance(entity, WildCard)):
-				for netlist in entity.GetVivadoNetlists():
-					self.TryRun(netlist, *args, **kwargs)
-			else:
-				netlist = entity.VivadoNetlist
-				self.TryRun(netlist, *args, **kwargs)
+		try:
+			return super().RunAll(fqnList, *args, **kwargs)
+		finally:
+			self._CloseToolSessions()
 
 	def Run(self, netlist, board):
 		super().Run(netlist, board)
@@ -93,13 +100,18 @@ class Compiler(BaseCompiler):
 		self._RunPreCopy(netlist)
 		self._RunPreReplace(netlist)
 
+		if self._RestoreNetlistFromCache(netlist, board.Device):
+			self._LogNormal("Executing post-processing tasks...")
+			self._RunPostProcessing(netlist)
+			return
+
 		self._LogNormal("Running Xilinx Vivado Synthesis...")
 		self._RunCompile(netlist)
 
 		self._LogNormal("Executing post-processing tasks...")
 		self._RunPostCopy(netlist)
-		self._RunPostReplace(netlist)
-		self._RunPostDelete(netlist)
+		self._StoreNetlistInCache(netlist)
+		self._RunPostProcessing(netlist)
 
 	def _WriteSpecialSectionIntoConfig(self, device):
 		# add the key Device to section SPECIAL at runtime to change interpolation results
@@ -111,6 +123,10 @@ class Compiler(BaseCompiler):
 	def _RunCompile(self, netlist):
 		reportFilePath = self.Directories.Working / (netlist.ModuleName + ".log")
 
+		if self._session:
+			self._RunCompileInSession(netlist, reportFilePath)
+			return
+
 		synth = self._toolChain.GetSynthesizer()
 		synth.Parameters[synth.SwitchSourceFile] =  netlist.ModuleName + ".tcl"
 		synth.Parameters[synth.SwitchLogFile] =  str(reportFilePath)
@@ -121,6 +137,34 @@ class Compiler(BaseCompiler):
 		if synth.HasErrors:
 			raise SkipableCompilerException("Error while compiling '{0!s}'.".format(netlist))
 
+	def _RunCompileInSession(self, netlist, reportFilePath):
+		if ((self._tclShell is None) or (not self._tclShell.IsRunning)):
+			self._LogVerbose("Starting a Vivado Tcl session...")
+			self._tclShell = self._toolChain.GetTclShell()
+			try:
+				self._tclShell.Start()
+			except VivadoException as ex:
+				self._tclShell = None
+				raise CompilerException("Error while starting a Vivado Tcl session.") from ex
+
+		try:
+			self._tclShell.Source(netlist.TclFile, self.Directories.Working, reportFilePath)
+		except VivadoException as ex:
+			# the session crashed, the next netlist will start a new one
+			self._tclShell = None
+			raise SkipableCompilerException("Error while compiling '{0!s}'.".format(netlist)) from ex
+		if self._tclShell.HasErrors:
+			raise SkipableCompilerException("Error while compiling '{0!s}'.".format(netlist))
+
+	def _CloseToolSessions(self):
+		self._CloseTclShell()
+
+	def _CloseTclShell(self):
+		if (self._tclShell is not None):
+			self._LogVerbose("Closing Vivado Tcl session.")
+			self._tclShell.Close()
+			self._tclShell = None
+
 	def _WriteTclFile(self, netlist, device):
 		buffer =""
 		for file in self.PoCProject.Files(fileType=FileTypes.VHDLSourceFile):
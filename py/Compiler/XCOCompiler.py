@@ -57,8 +57,8 @@ class Compiler(BaseCompiler):
 	_TOOL_CHAIN =  ToolChain.Xilinx_ISE
 	_TOOL =        Tool.Xilinx_CoreGen
 
-	def __init__(self, host, dryRun, noCleanUp):
-		super().__init__(host, dryRun, noCleanUp)
+	def __init__(self, host, dryRun, noCleanUp, jobs=1, force=False):
+		super().__init__(host, dryRun, noCleanUp, jobs, force)
 
 		self._toolChain =    None
 
@@ -75,15 +75,14 @@ class Compiler(BaseCompiler):
 		version = iseSection['Version']
 		self._toolChain = ISE(self.Host.Platform, binaryPath, version, logger=self.Logger)
 
-	def RunAll(self, fqnList, *args, **kwargs):
-		for fqn in fqnList:
-			entity = fqn.Entity
-			if (isinstance(entity, WildCard)):
-				for netlist in entity.GetCoreGenNetlists():
-					self.TryRun(netlist, *args, **kwargs)
-			else:
-				netlist = entity.CGNetlist
-				self.TryRun(netlist, *args, **kwargs)
+	def _GetNetlists(self, entity):
+		if (isinstance(entity, WildCard)):
+			return entity.GetCoreGenNetlists()
+		else:
+			return [entity.CGNetlist]
+
+	def _GetFingerprintFiles(self, netlist):
+		return [netlist.XcoFile]
 
 	def Run(self, netlist, board):
 		super().Run(netlist, board)
@@ -92,13 +91,18 @@ class Compiler(BaseCompiler):
 		self._RunPreCopy(netlist)
 		self._RunPreReplace(netlist)
 
+		if self._RestoreNetlistFromCache(netlist, board.Device):
+			self._LogNormal("Executing post-processing tasks...")
+			self._RunPostProcessing(netlist)
+			return
+
 		self._LogNormal("Running Xilinx Core Generator...")
 		self._RunCompile(netlist, board.Device)
 
 		self._LogNormal("Executing post-processing tasks...")
 		self._RunPostCopy(netlist)
-		self._RunPostReplace(netlist)
-		self._RunPostDelete(netlist)
+		self._StoreNetlistInCache(netlist)
+		self._RunPostProcessing(netlist)
 
 	def _WriteSpecialSectionIntoConfig(self, device):
 		# add the key Device to section SPECIAL at runtime to change interpolation results
@@ -58,8 +58,8 @@ class Compiler(BaseCompiler, XilinxProjectExportMixIn):
 	class __Directories__(BaseCompiler.__Directories__):
 		XSTFiles =    None
 
-	def __init__(self, host, dryRun, noCleanUp):
-		super().__init__(host, dryRun, noCleanUp)
+	def __init__(self, host, dryRun, noCleanUp, jobs=1, force=False):
+		super().__init__(host, dryRun, noCleanUp, jobs, force)
 		XilinxProjectExportMixIn.__init__(self)
 
 		self._toolChain =    None
@@ -78,15 +78,14 @@ class Compiler(BaseCompiler, XilinxProjectExportMixIn):
 		version = iseSection['Version']
 		self._toolChain =    ISE(self.Host.Platform, binaryPath, version, logger=self.Logger)
 
-	def RunAll(self, fqnList, *args, **kwargs):
-		for fqn in fqnList:
-			entity = fqn.Entity
-			if (isinstance(entity, WildCard)):
-				for netlist in entity.GetXSTNetlists():
-					self.TryRun(netlist, *args, **kwargs)
-			else:
-				netlist = entity.XSTNetlist
-				self.TryRun(netlist, *args, **kwargs)
+	def _GetNetlists(self, entity):
+		if (isinstance(entity, WildCard)):
+			return entity.GetXSTNetlists()
+		else:
+			return [entity.XSTNetlist]
+
+	def _GetFingerprintFiles(self, netlist):
+		return [netlist.XcfFile]
 
 	def Run(self, netlist, board):
 		super().Run(netlist, board)
@@ -101,13 +100,18 @@ class Compiler(BaseCompiler, XilinxProjectExportMixIn):
 		self._RunPreCopy(netlist)
 		self._RunPreReplace(netlist)
 
+		if self._RestoreNetlistFromCache(netlist, board.Device):
+			self._LogNormal("Executing post-processing tasks...")
+			self._RunPostProcessing(netlist)
+			return
+
 		self._LogNormal("Running Xilinx Synthesis Tool...")
 		self._RunCompile(netlist)
 
 		self._LogNormal("Executing post-processing tasks...")
 		self._RunPostCopy(netlist)
-		self._RunPostReplace(netlist)
-		self._RunPostDelete(netlist)
+		self._StoreNetlistInCache(netlist)
+		self._RunPostProcessing(netlist)
 
 	def _WriteSpecialSectionIntoConfig(self, device):
 		# add the key Device to section SPECIAL at runtime to change interpolation results
@@ -46,6 +46,10 @@ from Parser.FilesCodeDOM  import VHDLStatement, VerilogStatement, CocotbStatemen
 DEBUG = not True
 
 class FileReference:
+	# the slots are provided by the file classes in Base.Project, which use these
+	# classes as mix-ins; classes without own __slots__ get a __dict__ as usual
+	__slots__ = ()
+
 	def __init__(self, file):
 		self._file =    file
 
@@ -63,6 +67,8 @@ class IncludeFileMixIn(FileReference):
 
 
 class VHDLSourceFileMixIn(FileReference):
+	__slots__ = ()
+
 	def __init__(self, file, library):
 		super().__init__(file)
 		self._library =  library
@@ -76,11 +82,15 @@ class VHDLSourceFileMixIn(FileReference):
 
 
 class VerilogSourceFileMixIn(FileReference):
+	__slots__ = ()
+
 	def __str__(self):
 		return "Verilog file: '{0!s}'".format(self._file)
 
 
 class CocotbSourceFileMixIn(FileReference):
+	__slots__ = ()
+
 	def __str__(self):
 		return "Cocotb file: '{0!s}'".format(self._file)
 
@@ -142,6 +152,7 @@ class FilesParserMixIn:
 		self._includes =      []
 		self._libraries =     []
 		self._warnings =      []
+		self._existsChecks =  []
 
 	def _Parse(self):
 		self._ReadContent() #only available via late binding
@@ -208,6 +219,8 @@ class FilesParserMixIn:
 					self._libraries.append(lib)
 				for warn in includeFile.Warnings:
 					self._warnings.append(warn)
+				for check in includeFile.ExistsChecks:
+					self._existsChecks.append(check)
 			elif isinstance(stmt, LibraryStatement):
 				path =        self._EvaluatePath(host, stmt.PathExpression)
 				lib =         self._rootDirectory / path
@@ -244,8 +257,10 @@ class FilesParserMixIn:
 		elif isinstance(expr, IntegerLiteral):
 			return expr.Value
 		elif isinstance(expr, ExistsFunction):
-			path = self._EvaluatePath(host, expr.Expression)
-			return (self._rootDirectory / path).exists()
+			path =    self._rootDirectory / self._EvaluatePath(host, expr.Expression)
+			result =  path.exists()
+			self._existsChecks.append((path, result))
+			return result
 		elif isinstance(expr, ListConstructorExpression):
 			return [self._Evaluate(host, item) for item in expr.List]
 		elif isinstance(expr, NotExpression):
@@ -309,6 +324,8 @@ class FilesParserMixIn:
 	def Libraries(self):  return self._libraries
 	@property
 	def Warnings(self):   return self._warnings
+	@property
+	def ExistsChecks(self): return self._existsChecks
 
 	def __str__(self):    return "FILES file: '{0!s}'".format(self._file) #self._file only available via late binding
 	__repr__ = __str__
@@ -44,20 +44,29 @@ from textwrap                       import dedent
 
 from Base.Compiler                  import CompilerException
 from Base.Configuration             import ConfigurationException, SkipConfigurationException
+from Base.DesignUnits               import DesignUnitIndex, UnitKind
+from Base.Distributed               import Coordinator, Worker, ParseAddress, DEFAULT_PORT
 from Base.Exceptions                import ExceptionBase, CommonException, PlatformNotSupportedException, EnvironmentException, NotConfiguredException
+from Base.FileList                  import FileListExporter, TestbenchFileListExporter, FileListFormat
 from Base.Logging                   import ILogable, Logger, Severity
+from Base.PreCompiler               import VENDORS as PreCompilerVendors
 from Base.Project                   import VHDLVersion
-from Base.Simulator                 import SimulatorException
+from Base.Shard                     import Shard
+from Base.Simulator                 import Simulator, SimulatorException
 from Base.ToolChain                 import ToolChainException
+from Base.Waveform                  import VCDReader, WaveformComparison, ParseTime, FormatTime
 from Compiler.LSECompiler           import Compiler as LSECompiler
 from Compiler.QuartusCompiler       import Compiler as MapCompiler
 from Compiler.XCOCompiler           import Compiler as XCOCompiler
 from Compiler.XSTCompiler           import Compiler as XSTCompiler
 from Compiler.VivadoCompiler        import Compiler as VivadoCompiler
 from PoC.Config                     import Board
-from PoC.Entity                     import NamespaceRoot, FQN, EntityTypes, WildCard, TestbenchKind, NetlistKind
+from PoC.Entity                     import NamespaceRoot, FQN, EntityTypes, WildCard, IPCore, TestbenchKind, NetlistKind
 from PoC.Solution                   import Repository
 from PoC.Query                      import Query
+from PoC.TestResult                 import ResultFile
+from PreCompiler.GHDLPreCompiler    import PreCompiler as GHDLPreCompiler
+from PreCompiler.QuestaPreCompiler  import PreCompiler as QuestaPreCompiler
 from Simulator.ActiveHDLSimulator   import Simulator as ActiveHDLSimulator
 from Simulator.CocotbSimulator      import Simulator as CocotbSimulator
 from Simulator.GHDLSimulator        import Simulator as GHDLSimulator
@@ -101,6 +110,37 @@ class NoCleanUpAttribute(Attribute):
 		self._AppendAttribute(func, SwitchArgumentAttribute("--no-cleanup", dest="NoCleanUp", help="Don't delete intermediate files. Skip post-delete rules."))
 		return func
 
+class ForceAttribute(Attribute):
+	def __call__(self, func):
+		self._AppendAttribute(func, SwitchArgumentAttribute("--force", dest="Force", help="Ignore the netlist cache and always run synthesis."))
+		return func
+
+class JobsAttribute(Attribute):
+	def __call__(self, func):
+		self._AppendAttribute(func, ArgumentAttribute("-j", "--jobs", metavar="<Jobs>", dest="Jobs", type=int, default=1, help="Number of netlists to synthesize in parallel."))
+		return func
+
+class SessionAttribute(Attribute):
+	def __call__(self, func):
+		self._AppendAttribute(func, SwitchArgumentAttribute("--session", dest="Session", help="Synthesize all netlists in long-lived tool sessions."))
+		return func
+
+class ShardAttribute(Attribute):
+	def __call__(self, func):
+		self._AppendAttribute(func, ArgumentAttribute("--shard", metavar="<i/N>", dest="Shard", help="Run only shard i (1..N) of all selected entities, e.g. on one of N CI machines."))
+		return func
+
+class ResultFileAttributeGroup(Attribute):
+	def __call__(self, func):
+		self._AppendAttribute(func, ArgumentAttribute("--result-file", metavar="<File>", dest="ResultFile", help="Write all results to a JSON file (*.json) or JUnit file (*.xml)."))
+		self._AppendAttribute(func, ArgumentAttribute("--shard-history", metavar="<File>", dest="ShardHistory", help="Balance shards by the run times in a result file of a previous run."))
+		return func
+
+class WorkersAttribute(Attribute):
+	def __call__(self, func):
+		self._AppendAttribute(func, ArgumentAttribute("--workers", metavar="<host:port,...>", dest="Workers", help="Hand out all entities on demand to the given PoC workers (see 'serve-worker')."))
+		return func
+
 class PoC(ILogable, ArgParseMixin):
 	HeadLine =                "The PoC-Library - Service Tool"
 
@@ -623,6 +663,52 @@ class PoC(ILogable, ArgParseMixin):
 			print(str(ex), end="")
 			Exit.exit(1)
 
+	# ----------------------------------------------------------------------------
+	# create the sub-parser for the "list-units" command
+	# ----------------------------------------------------------------------------
+	@CommandGroupAttribute("Configuration commands")
+	@CommandAttribute("list-units", help="List the VHDL design units in PoC's source tree")
+	@ArgumentAttribute(metavar="<Pattern>", dest="Patterns", type=str, nargs="*", help="Unit names with wildcards, e.g. 'arith_*' (default: all units).")
+	@ArgumentAttribute("--kind", metavar="<Kind,...>", dest="UnitKind", help="Unit kinds: entity | architecture | package | body | configuration | context")
+	def HandleListUnits(self, args):
+		self.PrintHeadline()
+		self.__PrepareForConfiguration()
+
+		kinds = None
+		if (args.UnitKind is not None):
+			kinds = []
+			for kind in args.UnitKind.lower().split(","):
+				if   (kind == "body"):  kinds.append(UnitKind.PackageBody)
+				elif (kind in [unitKind.value for unitKind in UnitKind]):  kinds.append(UnitKind(kind))
+				else:                    raise CommonException("Argument --kind has an unknown value '{0}'.".format(kind))
+
+		index = self._GetDesignUnitIndex()
+		units = index.Find(args.Patterns if (len(args.Patterns) > 0) else None, kinds)
+		for unit in units:
+			print("{0!s: <48} {1}:{2}-{3}".format(unit, unit.File, unit.StartLine, unit.EndLine))
+			if (len(unit.Libraries) > 0):
+				self._LogVerbose("  libraries: {0}".format(", ".join(unit.Libraries)))
+			for generic in unit.Generics:
+				self._LogVerbose("  generic {0} : {1}{2}".format(generic.Name, generic.Type, "" if (generic.Default is None) else " := " + generic.Default))
+			for port in unit.Ports:
+				self._LogVerbose("  port    {0} : {1} {2}{3}".format(port.Name, port.Mode, port.Type, "" if (port.Default is None) else " := " + port.Default))
+		if (len(units) == 0):
+			self._LogNormal("No design unit matches '{0}'.".format(" ".join(args.Patterns)))
+
+		Exit.exit()
+
+	def _GetDesignUnitIndex(self):
+		"""Return the index of all design units in PoC's source, testbench and library directories, updated by modification time."""
+		configSection = self.PoCConfig['CONFIG.DirectoryNames']
+		directories =   [configSection['HDLSourceFiles'], configSection['TestbenchFiles'], configSection['LibraryFiles']]
+		index =         DesignUnitIndex(self.Directories.Root / configSection['DesignUnitIndexFile'], self.Directories.Root, directories)
+
+		scanned, removed = index.Update()
+		self._LogVerbose("Updated the design unit index: {0} files scanned, {1} files removed.".format(scanned, removed))
+		for file, message in index.Errors.items():
+			self._LogWarning("Cannot scan '{0}': {1}".format(file, message))
+		return index
+
 	# ============================================================================
 	# Simulation	commands
 	# ============================================================================
@@ -647,6 +733,32 @@ class PoC(ILogable, ArgParseMixin):
 		if (len(fqns) == 0):             raise CommonException("No FQN given.")
 		return [FQN(self, fqn, defaultLibrary=defaultLibrary, defaultType=defaultType) for fqn in fqns]
 
+	def _ExtractShard(self, shard, historyFile=None):
+		if (shard is None):             return None
+		if (historyFile is None):        return Shard.Parse(shard)
+
+		resultFile = ResultFile(Path(historyFile))
+		resultFile.Read()
+		return Shard.Parse(shard, resultFile.GetRuntimes())
+
+	# commands, which a worker runs for a coordinator
+	__WORKER_COMMANDS__ =  ("asim", "ghdl", "isim", "vsim", "xsim", "cocotb", "coregen", "xst", "vivado", "quartus", "lse")
+	__WORKER_ARGUMENTS__ = [("--board", "BoardName"), ("--device", "DeviceName"), ("--std", "VHDLVersion"), ("--simulator", "CocotbSimulator"), ("--shards", "Shards")]
+	__WORKER_SWITCHES__ =  [("--no-cleanup", "NoCleanUp"), ("--force", "Force"), ("--session", "Session"), ("--waveforms", "Waveforms")]
+
+	def _ExtractCoordinator(self, args, command, resultFile=False):
+		if (args.Workers is None):      return None
+
+		# forward all options of this command, which are not specific to the coordinator
+		arguments = []
+		for option, dest in self.__WORKER_ARGUMENTS__:
+			if (getattr(args, dest, None) is not None):  arguments += [option, str(getattr(args, dest))]
+		for switch, dest in self.__WORKER_SWITCHES__:
+			if getattr(args, dest, False):                arguments.append(switch)
+
+		addresses = [ParseAddress(address) for address in args.Workers.split(",")]
+		return Coordinator(self.Logger, addresses, command, arguments, resultFile, token=environ.get('PoCWorkerToken'))
+
 	def _ExtractVHDLVersion(self, vhdlVersion, defaultVersion=None):
 		if (defaultVersion is None):    defaultVersion = self.__SimulationDefaultVHDLVersion
 		if (vhdlVersion is None):        return defaultVersion
@@ -746,6 +858,50 @@ class PoC(ILogable, ArgParseMixin):
 		Exit.exit()
 
 
+	# ----------------------------------------------------------------------------
+	# create the sub-parser for the "export-filelist" command
+	# ----------------------------------------------------------------------------
+	@CommandGroupAttribute("Simulation commands")
+	@CommandAttribute("export-filelist", help="Export the resolved compile order of an IP core or its testbench (use '-q' to print only the file list)")
+	@ArgumentAttribute(metavar="<PoC Entity>", dest="FQN", type=str, help="A PoC entity.")
+	@BoardDeviceAttributeGroup()
+	@VHDLVersionAttribute()
+	@ArgumentAttribute("--format", metavar="<Format>", dest="Format", default="json", choices=[str(fileListFormat) for fileListFormat in FileListFormat], help="Output format: json | csv | tcl (default: json)")
+	@ArgumentAttribute("--output", metavar="<File>", dest="Output", help="Write the file list to this file instead of stdout.")
+	@SwitchArgumentAttribute("--testbench", dest="Testbench", help="Export the compile order of the entity's VHDL testbench for simulation, instead of the IP core for synthesis.")
+	@SwitchArgumentAttribute("--force", dest="Force", help="Ignore the file list cache and always parse the *.files files.")
+	def HandleExportFileList(self, args):
+		self.PrintHeadline()
+		self.__PrepareForSimulation()
+
+		fqn =          self._ExtractFQNs([args.FQN], defaultType=(EntityTypes.Testbench if args.Testbench else EntityTypes.Source))[0]
+		board =        self._ExtractBoard(args.BoardName, args.DeviceName)
+		vhdlVersion =  self._ExtractVHDLVersion(args.VHDLVersion)
+		if isinstance(fqn.Entity, WildCard):      raise CommonException("Command export-filelist requires a single PoC entity, but '{0}' is a wildcard.".format(args.FQN))
+		if (not isinstance(fqn.Entity, IPCore)):  raise CommonException("Command export-filelist requires an IP core, but '{0}' is not an IP core.".format(args.FQN))
+
+		if args.Testbench:
+			exporter = TestbenchFileListExporter(self, self.DryRun, args.Force)
+			fileList = exporter.Export(fqn.Entity.VHDLTestbench, board, vhdlVersion)
+		else:
+			exporter = FileListExporter(self, self.DryRun, args.Force)
+			fileList = exporter.Export(fqn.Entity, board, vhdlVersion)
+		content =  fileList.Format(FileListFormat(args.Format))
+
+		if (args.Output is None):
+			print(content, end="")
+		else:
+			outputFilePath = Path(args.Output)
+			try:
+				with outputFilePath.open('w') as fileHandle:
+					fileHandle.write(content)
+			except OSError as ex:
+				raise CommonException("Error while writing '{0!s}'.".format(outputFilePath)) from ex
+			self._LogNormal("Exported {0} files and {1} external libraries to '{2!s}'.".format(len(fileList.Files), len(fileList.ExternalLibraries), outputFilePath))
+
+		Exit.exit()
+
+
 	# ----------------------------------------------------------------------------
 	# create the sub-parser for the "asim" command
 	# ----------------------------------------------------------------------------
@@ -755,6 +911,9 @@ class PoC(ILogable, ArgParseMixin):
 	@BoardDeviceAttributeGroup()
 	@VHDLVersionAttribute()
 	@GUIModeAttribute()
+	@ShardAttribute()
+	@ResultFileAttributeGroup()
+	@WorkersAttribute()
 	def HandleActiveHDLSimulation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSimulation()
@@ -765,6 +924,9 @@ class PoC(ILogable, ArgParseMixin):
 
 		# create a GHDLSimulator instance and prepare it
 		simulator = ActiveHDLSimulator(self, self.DryRun, args.GUIMode)
+		simulator.Shard =      self._ExtractShard(args.Shard, args.ShardHistory)
+		simulator.ResultFile = Path(args.ResultFile) if (args.ResultFile is not None) else None
+		simulator.Coordinator = self._ExtractCoordinator(args, "asim", resultFile=True)
 		allPassed = simulator.RunAll(fqnList, board=board, vhdlVersion=vhdlVersion)  # , vhdlGenerics=None)
 
 		Exit.exit(0 if allPassed else 1)
@@ -779,6 +941,10 @@ class PoC(ILogable, ArgParseMixin):
 	@BoardDeviceAttributeGroup()
 	@VHDLVersionAttribute()
 	@GUIModeAttribute()
+	@SwitchArgumentAttribute("--waveforms", dest="Waveforms", help="Dump the selected signals of each testbench in batch mode and keep them only for failing testbenches.")
+	@ShardAttribute()
+	@ResultFileAttributeGroup()
+	@WorkersAttribute()
 	def HandleGHDLSimulation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSimulation()
@@ -791,7 +957,10 @@ class PoC(ILogable, ArgParseMixin):
 		board =        self._ExtractBoard(args.BoardName, args.DeviceName)
 		vhdlVersion =  self._ExtractVHDLVersion(args.VHDLVersion)
 
-		simulator = GHDLSimulator(self, self.DryRun, args.GUIMode)
+		simulator = GHDLSimulator(self, self.DryRun, args.GUIMode, args.Waveforms)
+		simulator.Shard =      self._ExtractShard(args.Shard, args.ShardHistory)
+		simulator.ResultFile = Path(args.ResultFile) if (args.ResultFile is not None) else None
+		simulator.Coordinator = self._ExtractCoordinator(args, "ghdl", resultFile=True)
 		allPassed = simulator.RunAll(fqnList, board=board, vhdlVersion=vhdlVersion, guiMode=args.GUIMode)		#, vhdlGenerics=None)
 
 		Exit.exit(0 if allPassed else 1)
@@ -805,6 +974,9 @@ class PoC(ILogable, ArgParseMixin):
 	@PoCEntityAttribute()
 	@BoardDeviceAttributeGroup()
 	@GUIModeAttribute()
+	@ShardAttribute()
+	@ResultFileAttributeGroup()
+	@WorkersAttribute()
 	def HandleISESimulation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSimulation()
@@ -814,6 +986,9 @@ class PoC(ILogable, ArgParseMixin):
 		board =        self._ExtractBoard(args.BoardName, args.DeviceName)
 
 		simulator = ISESimulator(self, self.DryRun, args.GUIMode)
+		simulator.Shard =      self._ExtractShard(args.Shard, args.ShardHistory)
+		simulator.ResultFile = Path(args.ResultFile) if (args.ResultFile is not None) else None
+		simulator.Coordinator = self._ExtractCoordinator(args, "isim", resultFile=True)
 		allPassed = simulator.RunAll(fqnList, board=board, vhdlVersion=VHDLVersion.VHDL93)		#, vhdlGenerics=None)
 
 		Exit.exit(0 if allPassed else 1)
@@ -828,6 +1003,9 @@ class PoC(ILogable, ArgParseMixin):
 	@BoardDeviceAttributeGroup()
 	@VHDLVersionAttribute()
 	@GUIModeAttribute()
+	@ShardAttribute()
+	@ResultFileAttributeGroup()
+	@WorkersAttribute()
 	def HandleQuestaSimulation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSimulation()
@@ -837,6 +1015,9 @@ class PoC(ILogable, ArgParseMixin):
 		vhdlVersion =  self._ExtractVHDLVersion(args.VHDLVersion)
 
 		simulator = QuestaSimulator(self, self.DryRun, args.GUIMode)
+		simulator.Shard =      self._ExtractShard(args.Shard, args.ShardHistory)
+		simulator.ResultFile = Path(args.ResultFile) if (args.ResultFile is not None) else None
+		simulator.Coordinator = self._ExtractCoordinator(args, "vsim", resultFile=True)
 		allPassed = simulator.RunAll(fqnList, board=board, vhdlVersion=vhdlVersion)  # , vhdlGenerics=None)
 
 		Exit.exit(0 if allPassed else 1)
@@ -851,6 +1032,9 @@ class PoC(ILogable, ArgParseMixin):
 	@BoardDeviceAttributeGroup()
 	@VHDLVersionAttribute()
 	@GUIModeAttribute()
+	@ShardAttribute()
+	@ResultFileAttributeGroup()
+	@WorkersAttribute()
 	def HandleVivadoSimulation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSimulation()
@@ -863,6 +1047,9 @@ class PoC(ILogable, ArgParseMixin):
 		vhdlVersion = self._ExtractVHDLVersion(args.VHDLVersion, defaultVersion=VHDLVersion.VHDL93)
 
 		simulator = VivadoSimulator(self, self.DryRun, args.GUIMode)
+		simulator.Shard =      self._ExtractShard(args.Shard, args.ShardHistory)
+		simulator.ResultFile = Path(args.ResultFile) if (args.ResultFile is not None) else None
+		simulator.Coordinator = self._ExtractCoordinator(args, "xsim", resultFile=True)
 		allPassed = simulator.RunAll(fqnList, board=board, vhdlVersion=vhdlVersion)  # , vhdlGenerics=None)
 
 		Exit.exit(0 if allPassed else 1)
@@ -872,28 +1059,160 @@ class PoC(ILogable, ArgParseMixin):
 	# create the sub-parser for the "cocotb" command
 	# ----------------------------------------------------------------------------
 	@CommandGroupAttribute("Simulation commands")
-	@CommandAttribute("cocotb", help="Simulate a PoC Entity with Cocotb and Questa Simulator")
+	@CommandAttribute("cocotb", help="Simulate a PoC Entity with Cocotb and Questa Simulator or GHDL")
 	@PoCEntityAttribute()
 	@BoardDeviceAttributeGroup()
 	@GUIModeAttribute()
+	@ArgumentAttribute("--simulator", metavar="<Simulator>", dest="CocotbSimulator", help="Cocotb simulator: QuestaSim | GHDL (default: testbench option 'CocotbSimulator')")
+	@ArgumentAttribute("--shards", metavar="<Shards>", dest="Shards", type=int, help="Split the tests of a Cocotb module into parallel simulator runs (default: testbench option 'CocotbShards')")
+	@ShardAttribute()
+	@ResultFileAttributeGroup()
+	@WorkersAttribute()
 	def HandleCocotbSimulation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSimulation()
 
-		# check if QuestaSim is configured
-		if (len(self.PoCConfig.options("INSTALL.Mentor.QuestaSim")) == 0):
+		# check if the selected simulator is configured, otherwise it is checked for every testbench
+		if ((args.CocotbSimulator == "QuestaSim") and (len(self.PoCConfig.options("INSTALL.Mentor.QuestaSim")) == 0)):
 			raise NotConfiguredException("Mentor QuestaSim is not configured on this system.")
+		elif ((args.CocotbSimulator == "GHDL") and (len(self.PoCConfig.options("INSTALL.GHDL")) == 0)):
+			raise NotConfiguredException("GHDL is not configured on this system.")
 
 		fqnList =  self._ExtractFQNs(args.FQN)
 		board =    self._ExtractBoard(args.BoardName, args.DeviceName)
 
 		# create a CocotbSimulator instance and prepare it
-		simulator = CocotbSimulator(self, self.DryRun, args.GUIMode)
+		simulator = CocotbSimulator(self, self.DryRun, args.GUIMode, args.CocotbSimulator, args.Shards)
+		simulator.Shard =      self._ExtractShard(args.Shard, args.ShardHistory)
+		simulator.ResultFile = Path(args.ResultFile) if (args.ResultFile is not None) else None
+		simulator.Coordinator = self._ExtractCoordinator(args, "cocotb", resultFile=True)
 		allPassed = simulator.RunAll(fqnList, board=board, vhdlVersion=VHDLVersion.VHDL2008)
 
 		Exit.exit(0 if allPassed else 1)
 
 
+	# ----------------------------------------------------------------------------
+	# create the sub-parser for the "serve-worker" command
+	# ----------------------------------------------------------------------------
+	@CommandGroupAttribute("Simulation commands")
+	@CommandAttribute("serve-worker", help="Run simulation and synthesis jobs for a coordinator (see '--workers')")
+	@ArgumentAttribute("--listen", metavar="<[host:]port>", dest="Listen", default="localhost:{0}".format(DEFAULT_PORT), help="Address to listen on (default: localhost:{0}). Other than loopback addresses require a shared token in the environment variable 'PoCWorkerToken' of the worker and the coordinator.".format(DEFAULT_PORT))
+	def HandleServeWorker(self, args):
+		self.PrintHeadline()
+
+		worker = Worker(self.Logger, self.Directories.Root, ParseAddress(args.Listen), self.__WORKER_COMMANDS__, token=environ.get('PoCWorkerToken'))
+		try:
+			worker.Serve()
+		except KeyboardInterrupt:
+			pass
+
+		Exit.exit()
+
+
+	# ----------------------------------------------------------------------------
+	# create the sub-parser for the "merge-results" command
+	# ----------------------------------------------------------------------------
+	@CommandGroupAttribute("Simulation commands")
+	@CommandAttribute("merge-results", help="Merge the result files of several shards into one report")
+	@ArgumentAttribute(metavar="<Result File>", dest="ResultFiles", type=str, nargs='+', help="A space seperated list of result files (*.json or *.xml).")
+	@ArgumentAttribute("--result-file", metavar="<File>", dest="ResultFile", help="Write the merged results to a JSON file (*.json) or JUnit file (*.xml).")
+	def HandleMergeResults(self, args):
+		self.PrintHeadline()
+
+		simulator = Simulator(self, self.DryRun)
+		simulator.ResultFile = Path(args.ResultFile) if (args.ResultFile is not None) else None
+		allPassed = simulator.MergeResultFiles([Path(resultFile) for resultFile in args.ResultFiles])
+
+		Exit.exit(0 if allPassed else 1)
+
+
+	# ----------------------------------------------------------------------------
+	# create the sub-parser for the "compare-waveform" command
+	# ----------------------------------------------------------------------------
+	@CommandGroupAttribute("Simulation commands")
+	@CommandAttribute("compare-waveform", help="Compare a waveform dump with a golden waveform dump (*.vcd, *.vcd.gz or *.fst)")
+	@ArgumentAttribute(metavar="<Waveform>", dest="Waveform", type=str, help="The waveform dump of a simulation run.")
+	@ArgumentAttribute(metavar="<Golden>", dest="Golden", type=str, help="The golden waveform dump.")
+	@ArgumentAttribute("--signals", metavar="<Pattern,...>", dest="Signals", help="Compare only signals matching a comma separated list of patterns, e.g. 'tb.uut.*' (default: all signals of the golden dump).")
+	@ArgumentAttribute("--glitch-width", metavar="<Time>", dest="GlitchWidth", default="0fs", help="Report changes as glitches, which follow the previous change within this time, e.g. '2ns' (default: 0fs).")
+	def HandleCompareWaveform(self, args):
+		self.PrintHeadline()
+		self.__PrepareForSimulation()
+
+		# FST dumps are converted by GTKWave's fst2vcd
+		fst2vcd = "fst2vcd"
+		if self.PoCConfig.has_option('INSTALL.GTKWave', 'BinaryDirectory'):
+			fst2vcd = Path(self.PoCConfig['INSTALL.GTKWave']['BinaryDirectory']) / ("fst2vcd.exe" if (self.Platform == "Windows") else "fst2vcd")
+
+		patterns =    None if (args.Signals is None) else [pattern.strip() for pattern in args.Signals.split(",")]
+		glitchWidth = ParseTime(args.GlitchWidth)
+
+		with VCDReader(Path(args.Golden), fst2vcd) as golden, VCDReader(Path(args.Waveform), fst2vcd) as waveform:
+			names = golden.GetSignalNames(patterns)
+			if (len(names) == 0):
+				raise CommonException("No signal in '{0}' matches '{1}'.".format(args.Golden, args.Signals))
+			self._LogNormal("Comparing {0} signals...".format(len(names)))
+			comparison = WaveformComparison(golden, waveform, names, glitchWidth)
+			comparison.Run()
+
+		self._LogQuiet("{HEADLINE}{line}{NOCOLOR}".format(line="=" * 80, **Init.Foreground))
+		self._LogQuiet("{Name: <32} | {Changes: >7} | {Toggles: >7} | {First: >10} | {Last: >10} | {Glitches: >4} | {Diffs: >5}".format(
+			Name="Signal", Changes="Changes", Toggles="Toggles", First="First", Last="Last", Glitches="Glt.", Diffs="Diffs"))
+		self._LogQuiet("-" * 80)
+		for name, statistics in comparison.Statistics.items():
+			mismatches = comparison.MismatchCounts[name]
+			color =      "RED" if (mismatches > 0) else ("YELLOW" if (statistics.Glitches > 0) else "GREEN")
+			self._LogQuiet("{COLOR}{Name: <32} | {Changes: >7} | {Toggles: >7} | {First: >10} | {Last: >10} | {Glitches: >4} | {Diffs: >5}{NOCOLOR}".format(
+				COLOR=Init.Foreground[color], Name=name, Changes=statistics.Changes, Toggles=statistics.Toggles, First=FormatTime(statistics.FirstChange),
+				Last=FormatTime(statistics.LastChange), Glitches=statistics.Glitches, Diffs=mismatches, NOCOLOR=Init.Foreground["NOCOLOR"]
+			))
+		for name in comparison.MissingSignals:
+			self._LogQuiet("{RED}{Name: <32} | missing in '{Waveform}'{NOCOLOR}".format(Name=name, Waveform=args.Waveform, **Init.Foreground))
+		self._LogQuiet("{HEADLINE}{line}{NOCOLOR}".format(line="=" * 80, **Init.Foreground))
+
+		for mismatch in comparison.Mismatches:
+			self._LogNormal("  {0}: {1} expected '{2}', got '{3}'".format(
+				FormatTime(mismatch.Time), mismatch.Name,
+				"-" if (mismatch.Expected is None) else mismatch.Expected.decode(),
+				"-" if (mismatch.Actual is None) else mismatch.Actual.decode()
+			))
+
+		if comparison.IsEqual:
+			self._LogQuiet("{GREEN}Waveforms are equal.{NOCOLOR}".format(**Init.Foreground))
+		else:
+			self._LogQuiet("{RED}Waveforms differ in {0} value changes.{NOCOLOR}".format(sum(comparison.MismatchCounts.values()), **Init.Foreground))
+		Exit.exit(0 if comparison.IsEqual else 1)
+
+
+	# ----------------------------------------------------------------------------
+	# create the sub-parser for the "precompile" command
+	# ----------------------------------------------------------------------------
+	@CommandGroupAttribute("Simulation commands")
+	@CommandAttribute("precompile", help="Precompile vendor libraries for a simulator")
+	@ArgumentAttribute(metavar="<Vendor>", dest="Vendor", type=str, choices=list(PreCompilerVendors), help="Vendor libraries to compile: {0}".format(" | ".join(PreCompilerVendors)))
+	@ArgumentAttribute("--simulator", metavar="<Simulator>", dest="Simulator", default="ghdl", choices=["ghdl", "questa"], help="Simulator: ghdl | questa (default: ghdl)")
+	@VHDLVersionAttribute()
+	@ArgumentAttribute("-j", "--jobs", metavar="<Jobs>", dest="Jobs", type=int, default=1, help="Number of libraries to compile in parallel.")
+	@SwitchArgumentAttribute("--force", dest="Force", help="Rebuild all libraries, even if their manifests are up to date.")
+	def HandlePreCompile(self, args):
+		self.PrintHeadline()
+		self.__PrepareForSimulation()
+
+		board =       self._ExtractBoard(None, None)
+		vhdlVersion = self._ExtractVHDLVersion(args.VHDLVersion) if (args.VHDLVersion is not None) else None
+
+		if (args.Simulator == "ghdl"):
+			config = GHDLConfiguration(self)
+			if (not config.IsSupportedPlatform()):    raise PlatformNotSupportedException()
+			if (not config.IsConfigured()):            raise NotConfiguredException("GHDL is not configured on this system.")
+			precompiler = GHDLPreCompiler(self, self.DryRun, args.Jobs, args.Force)
+		else:
+			precompiler = QuestaPreCompiler(self, self.DryRun, args.Jobs, args.Force)
+		allPassed = precompiler.Run(args.Vendor, board, vhdlVersion)
+
+		Exit.exit(0 if allPassed else 1)
+
+
 	# ============================================================================
 	# Synthesis	commands
 	# ============================================================================
@@ -939,6 +1258,10 @@ class PoC(ILogable, ArgParseMixin):
 	@PoCEntityAttribute()
 	@BoardDeviceAttributeGroup()
 	@NoCleanUpAttribute()
+	@JobsAttribute()
+	@ForceAttribute()
+	@ShardAttribute()
+	@WorkersAttribute()
 	def HandleCoreGeneratorCompilation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSynthesis()
@@ -947,10 +1270,12 @@ class PoC(ILogable, ArgParseMixin):
 		fqnList =  self._ExtractFQNs(args.FQN, defaultType=EntityTypes.NetList)
 		board =    self._ExtractBoard(args.BoardName, args.DeviceName, force=True)
 
-		compiler = XCOCompiler(self, self.DryRun, args.NoCleanUp)
-		compiler.RunAll(fqnList, board)
+		compiler = XCOCompiler(self, self.DryRun, args.NoCleanUp, args.Jobs, args.Force)
+		compiler.Shard = self._ExtractShard(args.Shard)
+		compiler.Coordinator = self._ExtractCoordinator(args, "coregen")
+		allPassed = compiler.RunAll(fqnList, board)
 
-		Exit.exit()
+		Exit.exit(0 if allPassed else 1)
 
 	# ----------------------------------------------------------------------------
 	# create the sub-parser for the "xst" command
@@ -960,6 +1285,10 @@ class PoC(ILogable, ArgParseMixin):
 	@PoCEntityAttribute()
 	@BoardDeviceAttributeGroup()
 	@NoCleanUpAttribute()
+	@JobsAttribute()
+	@ForceAttribute()
+	@ShardAttribute()
+	@WorkersAttribute()
 	def HandleXstCompilation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSynthesis()
@@ -968,10 +1297,12 @@ class PoC(ILogable, ArgParseMixin):
 		fqnList =  self._ExtractFQNs(args.FQN, defaultType=EntityTypes.NetList)
 		board =    self._ExtractBoard(args.BoardName, args.DeviceName, force=True)
 
-		compiler = XSTCompiler(self, self.DryRun, args.NoCleanUp)
-		compiler.RunAll(fqnList, board)
+		compiler = XSTCompiler(self, self.DryRun, args.NoCleanUp, args.Jobs, args.Force)
+		compiler.Shard = self._ExtractShard(args.Shard)
+		compiler.Coordinator = self._ExtractCoordinator(args, "xst")
+		allPassed = compiler.RunAll(fqnList, board)
 
-		Exit.exit()
+		Exit.exit(0 if allPassed else 1)
 
 	# ----------------------------------------------------------------------------
 	# create the sub-parser for the "vivado" command
@@ -981,6 +1312,11 @@ class PoC(ILogable, ArgParseMixin):
 	@PoCEntityAttribute()
 	@BoardDeviceAttributeGroup()
 	@NoCleanUpAttribute()
+	@JobsAttribute()
+	@ForceAttribute()
+	@SessionAttribute()
+	@ShardAttribute()
+	@WorkersAttribute()
 	def HandleVivadoCompilation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSynthesis()
@@ -989,10 +1325,12 @@ class PoC(ILogable, ArgParseMixin):
 		fqnList =  self._ExtractFQNs(args.FQN, defaultType=EntityTypes.NetList)
 		board =    self._ExtractBoard(args.BoardName, args.DeviceName, force=True)
 
-		compiler = VivadoCompiler(self, self.DryRun, args.NoCleanUp)
-		compiler.RunAll(fqnList, board)
+		compiler = VivadoCompiler(self, self.DryRun, args.NoCleanUp, args.Jobs, args.Force, args.Session)
+		compiler.Shard = self._ExtractShard(args.Shard)
+		compiler.Coordinator = self._ExtractCoordinator(args, "vivado")
+		allPassed = compiler.RunAll(fqnList, board)
 
-		Exit.exit()
+		Exit.exit(0 if allPassed else 1)
 
 
 	# ----------------------------------------------------------------------------
@@ -1003,6 +1341,11 @@ class PoC(ILogable, ArgParseMixin):
 	@PoCEntityAttribute()
 	@BoardDeviceAttributeGroup()
 	@NoCleanUpAttribute()
+	@JobsAttribute()
+	@ForceAttribute()
+	@SessionAttribute()
+	@ShardAttribute()
+	@WorkersAttribute()
 	def HandleQuartusCompilation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSynthesis()
@@ -1013,10 +1356,12 @@ class PoC(ILogable, ArgParseMixin):
 		fqnList =  self._ExtractFQNs(args.FQN, defaultType=EntityTypes.NetList)
 		board =    self._ExtractBoard(args.BoardName, args.DeviceName, force=True)
 
-		compiler = MapCompiler(self, self.DryRun, args.NoCleanUp)
-		compiler.RunAll(fqnList, board)
+		compiler = MapCompiler(self, self.DryRun, args.NoCleanUp, args.Jobs, args.Force, args.Session)
+		compiler.Shard = self._ExtractShard(args.Shard)
+		compiler.Coordinator = self._ExtractCoordinator(args, "quartus")
+		allPassed = compiler.RunAll(fqnList, board)
 
-		Exit.exit()
+		Exit.exit(0 if allPassed else 1)
 
 
 	# ----------------------------------------------------------------------------
@@ -1027,6 +1372,10 @@ class PoC(ILogable, ArgParseMixin):
 	@PoCEntityAttribute()
 	@BoardDeviceAttributeGroup()
 	@NoCleanUpAttribute()
+	@JobsAttribute()
+	@ForceAttribute()
+	@ShardAttribute()
+	@WorkersAttribute()
 	def HandleLSECompilation(self, args):
 		self.PrintHeadline()
 		self.__PrepareForSynthesis()
@@ -1037,10 +1386,12 @@ class PoC(ILogable, ArgParseMixin):
 		fqnList =  self._ExtractFQNs(args.FQN, defaultType=EntityTypes.NetList)
 		board =    self._ExtractBoard(args.BoardName, args.DeviceName, force=True)
 
-		compiler = LSECompiler(self, self.DryRun, args.NoCleanUp)
-		compiler.RunAll(fqnList, board)
+		compiler = LSECompiler(self, self.DryRun, args.NoCleanUp, args.Jobs, args.Force)
+		compiler.Shard = self._ExtractShard(args.Shard)
+		compiler.Coordinator = self._ExtractCoordinator(args, "lse")
+		allPassed = compiler.RunAll(fqnList, board)
 
-		Exit.exit()
+		Exit.exit(0 if allPassed else 1)
 
 
 # main program
@@ -356,6 +356,9 @@ class IPCore(PathElement):
 
 		super().__init__(host, name, configSectionName, parent)
 
+	@property
+	def FilesFile(self):      return Path(self.ConfigSection["FilesFile"])
+
 	@property
 	def VHDLTestbench(self):
 		if (len(self._vhdltb) == 0):
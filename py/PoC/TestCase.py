@@ -38,8 +38,8 @@ else:
 	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module PoC.Query")
 
 
-from collections  import OrderedDict
-from datetime     import datetime
+from collections  import Counter, OrderedDict
+from datetime     import datetime, timedelta
 from enum         import Enum, unique
 
 
@@ -53,6 +53,7 @@ class Status(Enum):
 	SimulationError =      5
 	SimulationFailed =    10
 	SimulationNoAsserts = 15
+	SimulationSkipped =   16
 	SimulationSuccess =   20
 
 
@@ -70,12 +71,20 @@ class TestElement:
 		return "{0!s}.{1}".format(self._parent, self._name)
 
 class TestGroup(TestElement):
+	"""
+	A group of TestGroups and TestCases. The number of test cases per status is
+	maintained incrementally: TestCases report status changes to their TestGroup,
+	which propagates them to all parent groups. So all counters are O(1).
+	"""
+	__ERROR_STATUSES__ = (Status.SystemError, Status.AnalyzeError, Status.ElaborationError, Status.SimulationError)
+
 	def __init__(self, name, parent):
 		super().__init__(name, parent)
 
-		self._parent =     None
-		self._testGroups = OrderedDict()
-		self._testCases =  OrderedDict()
+		self._testGroups =   OrderedDict()
+		self._testCases =    OrderedDict()
+		self._count =        0
+		self._statusCounts = Counter()
 
 	def __getitem__(self, item):
 		try:
@@ -85,14 +94,52 @@ class TestGroup(TestElement):
 
 	def __setitem__(self, key, value):
 		if isinstance(value, TestGroup):
+			if (key in self._testGroups): self._RemoveTestGroup(key)
+			value._parent = self
 			self._testGroups[key] = value
+			self._UpdateCounts(value._count, value._statusCounts)
 		elif isinstance(value, TestCase):
+			if (key in self._testCases): self._RemoveTestCase(key)
+			value.TestGroup = self
 			self._testCases[key] = value
+			self._UpdateCounts(1, {value.Status: 1})
 		else:
 			raise ValueError("Parameter 'value' is not of type TestGroup or TestCase")
 
+	def __delitem__(self, key):
+		if (key in self._testCases):
+			self._RemoveTestCase(key)
+		else:
+			self._RemoveTestGroup(key)
+
+	def _RemoveTestCase(self, key):
+		testCase = self._testCases.pop(key)
+		testCase.TestGroup = None
+		self._UpdateCounts(-1, {testCase.Status: -1})
+
+	def _RemoveTestGroup(self, key):
+		testGroup = self._testGroups.pop(key)
+		testGroup._parent = None
+		self._UpdateCounts(-testGroup._count, {status: -count for status, count in testGroup._statusCounts.items()})
+
 	def __len__(self):
-		return sum([len(group) for group in self._testGroups.values()]) + len(self._testCases)
+		return self._count
+
+	def _UpdateCounts(self, countDelta, statusDeltas):
+		testGroup = self
+		while (testGroup is not None):
+			testGroup._count += countDelta
+			for status, delta in statusDeltas.items():
+				testGroup._statusCounts[status] += delta
+			testGroup = testGroup._parent
+
+	def _ChangeStatus(self, oldStatus, newStatus):
+		"""Called by a TestCase of this group, if its status changes."""
+		testGroup = self
+		while (testGroup is not None):
+			testGroup._statusCounts[oldStatus] -= 1
+			testGroup._statusCounts[newStatus] += 1
+			testGroup = testGroup._parent
 
 	@property
 	def TestGroups(self): return self._testGroups
@@ -101,28 +148,21 @@ class TestGroup(TestElement):
 
 	@property
 	def Count(self):
-		return len(self)
+		return self._count
 
 	@property
-	def PassedCount(self):
-		return sum([tg.PassedCount for tg in self._testGroups.values()]) \
-						+ sum([1 for tc in self._testCases.values() if tc.Status is Status.SimulationSuccess])
-
+	def PassedCount(self):    return self._statusCounts[Status.SimulationSuccess]
 	@property
-	def NoAssertsCount(self):
-		return sum([tg.NoAssertsCount for tg in self._testGroups.values()]) \
-						+ sum([1 for tc in self._testCases.values() if tc.Status is Status.SimulationNoAsserts])
-
+	def NoAssertsCount(self): return self._statusCounts[Status.SimulationNoAsserts]
 	@property
-	def FailedCount(self):
-		return sum([tg.FailedCount for tg in self._testGroups.values()]) \
-						+ sum([1 for tc in self._testCases.values() if tc.Status is Status.SimulationFailed])
-
+	def SkippedCount(self):   return self._statusCounts[Status.SimulationSkipped]
+	@property
+	def FailedCount(self):    return self._statusCounts[Status.SimulationFailed]
 	@property
 	def ErrorCount(self):
-		return sum([tg.ErrorCount for tg in self._testGroups.values()]) \
-						+ sum([1 for tc in self._testCases.values() if tc.Status
-										in (Status.SystemError, Status.AnalyzeError, Status.ElaborationError, Status.SimulationError)])
+		return sum([self._statusCounts[status] for status in self.__ERROR_STATUSES__])
+	@property
+	def UnknownCount(self):   return self._statusCounts[Status.Unknown]
 
 
 class TestSuite(TestGroup):
@@ -139,21 +179,38 @@ class TestSuite(TestGroup):
 
 	@property
 	def IsAllPassed(self):
-		return (self.Count == self.PassedCount + self.NoAssertsCount)
+		return (self.Count == self.PassedCount + self.NoAssertsCount + self.SkippedCount)
 
-	def AddTestCase(self, testCase):
+	def _GetTestGroup(self, testbench):
+		return self.GetTestGroup([item.Name for item in testbench.Path[:-2]])
+
+	def GetTestGroup(self, path):
+		"""Return the TestGroup for a list of group names. Missing groups are created."""
 		cur = self
-		testbenchPath = testCase.Testbench.Path
-		for item in testbenchPath[:-2]:
+		for name in path:
 			try:
-				testGroup = cur[item.Name]
+				testGroup = cur[name]
 			except KeyError:
-				testGroup = TestGroup(item.Name, cur)
-				cur[item.Name] = testGroup
+				testGroup = TestGroup(name, None)
+				cur[name] = testGroup
 			cur = testGroup
+		return cur
+
+	def AddTestCase(self, testCase):
+		testCaseName = testCase.Testbench.Path[-2].Name
+		self._GetTestGroup(testCase.Testbench)[testCaseName] = testCase
+
+	def ExpandTestCase(self, testbench, testCases):
+		"""Replace the TestCase of a testbench by a TestGroup with one TestCase per test, e.g. for all tests of a Cocotb module."""
+		parent =    self._GetTestGroup(testbench)
+		name =      testbench.Path[-2].Name
+		testGroup = TestGroup(name, None)				# the parent is set, when the group is added
+		for testCase in testCases:
+			testGroup[testCase.Name] = testCase
 
-		testCaseName = testbenchPath[-2].Name
-		cur[testCaseName] = testCase
+		del parent[name]
+		parent[name] = testGroup
+		return testGroup
 
 	def StartTimer(self):
 		now = datetime.now()
@@ -164,6 +221,10 @@ class TestSuite(TestGroup):
 		self._endedAt = datetime.now()
 		self._overallRuntime = self._endedAt - self._startedAt
 
+	def SetRunTime(self, wallTime):
+		"""Set the run time of a test suite, which was not measured by this run (wall time in s), e.g. of merged results."""
+		self._overallRuntime = timedelta(seconds=wallTime)
+
 	@property
 	def StartTime(self):          return self._startedAt
 	@property
@@ -175,8 +236,8 @@ class TestSuite(TestGroup):
 
 
 class TestCase(TestElement):
-	def __init__(self, testbench):
-		super().__init__(testbench.Parent.Name, None)
+	def __init__(self, testbench, name=None):
+		super().__init__(testbench.Parent.Name if (name is None) else name, None)
 		self._testbench =        testbench
 		self._testGroup =        None
 		self._status =          Status.Unknown
@@ -186,6 +247,7 @@ class TestCase(TestElement):
 		self._startedAt =        None
 		self._endedAt =          None
 		self._overallRuntime =  None
+		self._simulationTime =  None
 
 	@property
 	def Parent(self):           return self._parent
@@ -203,19 +265,22 @@ class TestCase(TestElement):
 	@property
 	def Status(self):           return self._status
 	@Status.setter
-	def Status(self, value):    self._status = value
+	def Status(self, value):
+		if ((self._testGroup is not None) and (value is not self._status)):
+			self._testGroup._ChangeStatus(self._status, value)
+		self._status = value
 
 	def UpdateStatus(self, testbenchResult):
 		if (testbenchResult is testbenchResult.NotRun):
-			self._status = Status.Unknown
+			self.Status = Status.Unknown
 		elif (testbenchResult is testbenchResult.Error):
-			self._status = Status.SimulationError
+			self.Status = Status.SimulationError
 		elif (testbenchResult is testbenchResult.Failed):
-			self._status = Status.SimulationFailed
+			self.Status = Status.SimulationFailed
 		elif (testbenchResult is testbenchResult.NoAsserts):
-			self._status = Status.SimulationNoAsserts
+			self.Status = Status.SimulationNoAsserts
 		elif (testbenchResult is testbenchResult.Passed):
-			self._status = Status.SimulationSuccess
+			self.Status = Status.SimulationSuccess
 		else:
 			raise IndentationError("Wuhu")
 
@@ -226,5 +291,14 @@ class TestCase(TestElement):
 		self._endedAt =          datetime.now()
 		self._overallRuntime =  self._endedAt - self._startedAt
 
+	def SetRunTime(self, wallTime, simulationTime=None):
+		"""Set the run time of a test, which was measured by the simulator (wall time in s, simulated time in ns)."""
+		self._overallRuntime =  timedelta(seconds=wallTime)
+		self._simulationTime =  simulationTime
+
 	@property
 	def OverallRunTime(self): return self._overallRuntime.seconds
+	@property
+	def WallTime(self):       return None if (self._overallRuntime is None) else self._overallRuntime.total_seconds()
+	@property
+	def SimulationTime(self): return self._simulationTime
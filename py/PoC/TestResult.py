@@ -0,0 +1,228 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      ResultFile
+#
+# Description:
+# ------------------------------------
+#		Reads and writes the test cases of a TestSuite as a result file:
+#		- *.json: PoC's own format, which keeps all states of a test case
+#		- *.xml:  JUnit format, as read by most CI servers
+#		Result files of several shards are merged into one TestSuite.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module PoC.TestResult")
+
+
+# load dependencies
+import json
+from collections          import namedtuple
+from xml.etree            import ElementTree
+
+from Base.Exceptions      import CommonException
+from PoC.TestCase         import Status, TestCase
+
+
+TestResult = namedtuple("TestResult", ["Path", "Name", "Testbench", "Status", "WallTime", "SimulationTime"])
+
+
+class ResultFile:
+	_FORMAT =   "PoC test results"
+	_VERSION =  1
+
+	__ERROR_STATUSES__ = (Status.Unknown, Status.SystemError, Status.InternalError, Status.AnalyzeError, Status.ElaborationError, Status.SimulationError)
+
+	def __init__(self, filePath):
+		self._filePath =  filePath
+		self._results =   []
+		self._runTime =   None
+		self._shard =     None
+
+	@property
+	def FilePath(self):   return self._filePath
+	@property
+	def Results(self):    return self._results
+	@property
+	def RunTime(self):    return self._runTime
+	@property
+	def Shard(self):      return self._shard
+
+	def _IsJUnit(self):
+		return (self._filePath.suffix.lower() == ".xml")
+
+	@classmethod
+	def _GetResults(cls, testGroup, path):
+		for group in testGroup.TestGroups.values():
+			yield from cls._GetResults(group, path + [group.Name])
+		for testCase in testGroup.TestCases.values():
+			testbench = None if (testCase.Testbench is None) else str(testCase.Testbench.Parent)
+			yield TestResult(path, testCase.Name, testbench, testCase.Status, testCase.WallTime, testCase.SimulationTime)
+
+	def Write(self, testSuite, shard=None):
+		self._results = list(self._GetResults(testSuite, []))
+		self._runTime = testSuite.OverallRunTime
+		self._shard =   None if (shard is None) else str(shard)
+
+		try:
+			if self._IsJUnit():
+				ElementTree.ElementTree(self._ToJUnit(testSuite)).write(str(self._filePath), encoding="utf-8", xml_declaration=True)
+			else:
+				with self._filePath.open('w') as fileHandle:
+					json.dump(self._ToJSON(), fileHandle, indent=2)
+		except OSError as ex:
+			raise CommonException("Error while writing result file '{0!s}'.".format(self._filePath)) from ex
+
+	def _ToJSON(self):
+		return {
+			"format":   self._FORMAT,
+			"version":  self._VERSION,
+			"shard":    self._shard,
+			"runTime":  self._runTime,
+			"testCases": [{
+					"path":           result.Path,
+					"name":           result.Name,
+					"testbench":      result.Testbench,
+					"status":         result.Status.name,
+					"wallTime":       result.WallTime,
+					"simulationTime": result.SimulationTime
+				} for result in self._results]
+		}
+
+	def _ToJUnit(self, testSuite):
+		suiteElement = ElementTree.Element("testsuite", {
+			"name":     testSuite.Name,
+			"tests":    str(testSuite.Count),
+			"failures": str(testSuite.FailedCount),
+			"errors":   str(sum(1 for result in self._results if (result.Status in self.__ERROR_STATUSES__))),
+			"skipped":  str(testSuite.SkippedCount),
+			"time":     str(self._runTime)
+		})
+		if (self._shard is not None):
+			propertiesElement = ElementTree.SubElement(suiteElement, "properties")
+			ElementTree.SubElement(propertiesElement, "property", {"name": "shard", "value": self._shard})
+
+		for result in self._results:
+			# 'status' and 'testbench' are no JUnit attributes, but keep all PoC states for merging
+			attributes = {"classname": ".".join(result.Path), "name": result.Name, "status": result.Status.name}
+			if (result.WallTime is not None):   attributes["time"] =      "{0:.3f}".format(result.WallTime)
+			if (result.Testbench is not None):  attributes["testbench"] = result.Testbench
+			caseElement = ElementTree.SubElement(suiteElement, "testcase", attributes)
+
+			if (result.Status is Status.SimulationFailed):
+				ElementTree.SubElement(caseElement, "failure", {"message": result.Status.name})
+			elif (result.Status is Status.SimulationSkipped):
+				ElementTree.SubElement(caseElement, "skipped")
+			elif (result.Status in self.__ERROR_STATUSES__):
+				ElementTree.SubElement(caseElement, "error", {"message": result.Status.name})
+		return suiteElement
+
+	def Read(self):
+		try:
+			if self._IsJUnit():
+				self._FromJUnit(ElementTree.parse(str(self._filePath)).getroot())
+			else:
+				with self._filePath.open('r') as fileHandle:
+					self._FromJSON(json.load(fileHandle))
+		except (OSError, ValueError, KeyError, TypeError, ElementTree.ParseError) as ex:
+			raise CommonException("Error while reading result file '{0!s}'.".format(self._filePath)) from ex
+		return self._results
+
+	@classmethod
+	def FromJSON(cls, document, filePath=None):
+		"""Create a ResultFile from an already loaded JSON document, e.g. received from a worker."""
+		resultFile = cls(filePath)
+		resultFile._FromJSON(document)
+		return resultFile
+
+	def _FromJSON(self, document):
+		if (document.get("format") != self._FORMAT):
+			raise ValueError("Unknown result file format '{0!s}'.".format(document.get("format")))
+
+		self._shard =   document.get("shard")
+		self._runTime = document.get("runTime")
+		self._results = [TestResult(
+				testCase["path"], testCase["name"], testCase.get("testbench"), Status[testCase["status"]],
+				testCase.get("wallTime"), testCase.get("simulationTime")
+			) for testCase in document["testCases"]]
+
+	def _FromJUnit(self, rootElement):
+		suiteElements = [rootElement] if (rootElement.tag == "testsuite") else rootElement.findall("testsuite")
+
+		self._results = []
+		runTimes =      []
+		for suiteElement in suiteElements:
+			for propertyElement in suiteElement.iterfind("properties/property"):
+				if (propertyElement.get("name") == "shard"): self._shard = propertyElement.get("value")
+			if (suiteElement.get("time") is not None): runTimes.append(float(suiteElement.get("time")))
+
+			for caseElement in suiteElement.iter("testcase"):
+				className = caseElement.get("classname", "")
+				time =      caseElement.get("time")
+				self._results.append(TestResult(
+					className.split(".") if (className != "") else [],
+					caseElement.get("name"),
+					caseElement.get("testbench"),
+					self._GetJUnitStatus(caseElement),
+					float(time) if (time is not None) else None,
+					None
+				))
+		self._runTime = sum(runTimes) if (len(runTimes) > 0) else None
+
+	@staticmethod
+	def _GetJUnitStatus(caseElement):
+		status = caseElement.get("status")
+		if (status is not None):                        return Status[status]
+		elif (caseElement.find("failure") is not None): return Status.SimulationFailed
+		elif (caseElement.find("error") is not None):   return Status.SimulationError
+		elif (caseElement.find("skipped") is not None): return Status.SimulationSkipped
+		else:                                           return Status.SimulationSuccess
+
+	def GetRuntimes(self):
+		"""Return the run time of each testbench (sum of its test cases), e.g. to balance shards."""
+		runtimes = {}
+		for result in self._results:
+			if (result.WallTime is None): continue
+			# plain JUnit files have no testbench, so use the FQN of the test case
+			testbench = result.Testbench if (result.Testbench is not None) else ".".join(result.Path + [result.Name])
+			runtimes[testbench] = runtimes.get(testbench, 0.0) + result.WallTime
+		return runtimes
+
+	def AddToTestSuite(self, testSuite):
+		"""Add all test cases to testSuite. Returns the test cases, which were already in testSuite."""
+		duplicates = []
+		for result in self._results:
+			testGroup = testSuite.GetTestGroup(result.Path)
+			if (result.Name in testGroup.TestCases): duplicates.append(result)
+
+			testCase = TestCase(None, result.Name)
+			testCase.Status = result.Status
+			testCase.SetRunTime(result.WallTime if (result.WallTime is not None) else 0.0, result.SimulationTime)
+			testGroup[result.Name] = testCase
+		return duplicates
@@ -0,0 +1,120 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      This GHDLPreCompiler precompiles vendor libraries with GHDL
+#
+# Description:
+# ------------------------------------
+#		Precompiles vendor libraries with GHDL. Each library is analyzed into
+#		'<library>/v<version>', so it can be referenced by '-P<directory>'.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module PreCompiler.GHDLPreCompiler")
+
+
+# load dependencies
+from pathlib                import Path
+
+from Base.Logging           import Severity
+from Base.PreCompiler       import PreCompiler as BasePreCompiler, PreCompilerException
+from Base.Project           import VHDLVersion, ToolChain, Tool
+from ToolChains.GHDL        import GHDL, GHDLException
+
+
+class PreCompiler(BasePreCompiler):
+	_TOOL_CHAIN =            ToolChain.GHDL_GTKWave
+	_TOOL =                  Tool.GHDL
+
+	def __init__(self, host, dryRun, jobs=1, force=False):
+		super().__init__(host, dryRun, jobs, force)
+
+		self._toolChain =     None
+
+		ghdlFilesDirectoryName =        host.PoCConfig['CONFIG.DirectoryNames']['GHDLFiles']
+		self.Directories.PreCompiled =  host.Directories.PreCompiled / ghdlFilesDirectoryName
+
+		self._PreparePreCompiler()
+
+	def _PreparePreCompiler(self):
+		# create the GHDL executable factory
+		self._LogVerbose("Preparing GHDL precompiler.")
+		ghdlSection = self.Host.PoCConfig['INSTALL.GHDL']
+		binaryPath = Path(ghdlSection['BinaryDirectory'])
+		version = ghdlSection['Version']
+		backend = ghdlSection['Backend']
+		self._toolChain =      GHDL(self.Host.Platform, binaryPath, version, backend, logger=self.Logger)
+		self._toolName =       "GHDL"
+		self._toolVersion =    "{0} ({1})".format(version, backend)
+
+	def _GetManifestPath(self, vendorName, libraryName, vhdlVersion):
+		# GHDL keeps one library per VHDL version side by side
+		return self.Directories.PreCompiled / self._MANIFEST_DIRECTORY / "{0}.{1}.v{2}.json".format(vendorName, libraryName, repr(vhdlVersion)[-2:])
+
+	def _CompileLibrary(self, library):
+		workingDirectory = self.Directories.Destination / library.Name / ("v" + repr(self._vhdlVersion)[-2:])
+		try:
+			workingDirectory.mkdir(parents=True, exist_ok=True)
+		except OSError as ex:
+			raise PreCompilerException("Error while creating '{0!s}'.".format(workingDirectory)) from ex
+
+		# create a GHDLAnalyzer instance
+		ghdl = self._toolChain.GetGHDLAnalyze()
+		ghdl.Parameters[ghdl.FlagVerbose] =             (self.Logger.LogLevel is Severity.Debug)
+		ghdl.Parameters[ghdl.FlagExplicit] =            True
+		ghdl.Parameters[ghdl.FlagRelaxedRules] =        True
+		ghdl.Parameters[ghdl.FlagWarnBinding] =         True
+		ghdl.Parameters[ghdl.FlagNoVitalChecks] =       True
+		ghdl.Parameters[ghdl.FlagMultiByteComments] =   True
+		ghdl.Parameters[ghdl.SwitchVHDLLibrary] =       library.Name
+		ghdl.Parameters[ghdl.SwitchWorkingDirectory] =  workingDirectory.as_posix()
+		ghdl.Parameters[ghdl.ArgListLibraryReferences] = [self.Directories.Destination.as_posix()]
+
+		if (self._vendor.Synopsys or (self._vhdlVersion <= VHDLVersion.VHDL93)):
+			ghdl.Parameters[ghdl.SwitchIEEEFlavor] =      "synopsys"
+		if (self._vhdlVersion is VHDLVersion.VHDL93):
+			ghdl.Parameters[ghdl.SwitchVHDLVersion] =     "93c"
+		else:
+			ghdl.Parameters[ghdl.SwitchVHDLVersion] =     repr(self._vhdlVersion)[-2:]
+
+		# analyze all files in order; continue after errors to report all failed files
+		failures = []
+		for filePath in library.Files:
+			if (not filePath.exists()):
+				failures.append((str(filePath), "File not found."))
+				continue
+
+			ghdl.Parameters[ghdl.ArgSourceFile] = filePath
+			try:
+				ghdl.Analyze()
+			except GHDLException as ex:
+				raise PreCompilerException("Error while analysing '{0!s}'.".format(filePath)) from ex
+			if ghdl.HasErrors:
+				failures.append((str(filePath), "Analysis failed."))
+		return failures
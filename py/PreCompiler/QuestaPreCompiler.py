@@ -0,0 +1,145 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Class:      This QuestaPreCompiler precompiles vendor libraries with QuestaSim
+#
+# Description:
+# ------------------------------------
+#		Precompiles vendor libraries with Mentor QuestaSim or ModelSim. All
+#		libraries are mapped in the 'modelsim.ini' of the destination directory.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# entry point
+if __name__ != "__main__":
+	# place library initialization code here
+	pass
+else:
+	from lib.Functions import Exit
+	Exit.printThisIsNoExecutableFile("The PoC-Library - Python Module PreCompiler.QuestaPreCompiler")
+
+
+# load dependencies
+from pathlib                      import Path
+
+from Base.Exceptions              import NotConfiguredException
+from Base.PreCompiler             import PreCompiler as BasePreCompiler, PreCompilerException
+from Base.Project                 import ToolChain, Tool
+from ToolChains.Mentor.QuestaSim  import QuestaSim, QuestaException
+
+
+class PreCompiler(BasePreCompiler):
+	_TOOL_CHAIN =            ToolChain.Mentor_QuestaSim
+	_TOOL =                  Tool.Mentor_vSim
+
+	def __init__(self, host, dryRun, jobs=1, force=False):
+		super().__init__(host, dryRun, jobs, force)
+
+		self._toolChain =     None
+		self._modelsimIniPath = None
+
+		vSimSimulatorFiles =            host.PoCConfig['CONFIG.DirectoryNames']['QuestaSimFiles']
+		self.Directories.PreCompiled =  host.Directories.PreCompiled / vSimSimulatorFiles
+
+		self._PreparePreCompiler()
+
+	def _PreparePreCompiler(self):
+		# create the QuestaSim executable factory
+		self._LogVerbose("Preparing Mentor precompiler.")
+		for sectionName in ['INSTALL.Mentor.QuestaSim', 'INSTALL.Altera.ModelSim']:
+			if (len(self.Host.PoCConfig.options(sectionName)) != 0):
+				break
+		else:
+			raise NotConfiguredException(
+				"Neither Mentor Graphics QuestaSim nor ModelSim Altera-Edition are configured on this system.")
+
+		questaSection = self.Host.PoCConfig[sectionName]
+		binaryPath = Path(questaSection['BinaryDirectory'])
+		version = questaSection['Version']
+		self._toolChain = QuestaSim(self.Host.Platform, binaryPath, version, logger=self.Logger)
+		self._toolName =    "QuestaSim" if (sectionName == 'INSTALL.Mentor.QuestaSim') else "ModelSim"
+		self._toolVersion = version
+
+	def _PrepareLibraries(self, libraries):
+		"""Map all libraries in the modelsim.ini of the destination directory, before any library is compiled in parallel."""
+		self._modelsimIniPath = self.Directories.Destination / "modelsim.ini"
+		try:
+			if self._modelsimIniPath.exists():
+				with self._modelsimIniPath.open('r') as fileHandle:
+					lines = fileHandle.read().splitlines()
+			else:
+				lines = ["[Library]"]
+				# inherit the mappings of the parent directory, e.g. OSVVM or the simulator's own libraries
+				if (self._modelsimIniPath.parent.parent / "modelsim.ini").exists():
+					lines.append("others = ../modelsim.ini")
+
+			mappings = {line.split("=", 1)[0].strip().lower(): i for i, line in enumerate(lines) if ("=" in line)}
+			newLines = []
+			for name in libraries:
+				line = "{0} = {1}".format(name, (self.Directories.Destination / name).as_posix())
+				if (name in mappings):
+					lines[mappings[name]] = line
+				else:
+					newLines.append(line)
+			position = lines.index("[Library]") + 1
+			lines[position:position] = newLines
+
+			with self._modelsimIniPath.open('w') as fileHandle:
+				fileHandle.write("\n".join(lines) + "\n")
+		except (OSError, ValueError) as ex:
+			raise PreCompilerException("Error while writing '{0!s}'.".format(self._modelsimIniPath)) from ex
+
+	def _CompileLibrary(self, library):
+		vlib = self._toolChain.GetVHDLLibraryTool()
+		vlib.Parameters[vlib.SwitchLibraryName] = (self.Directories.Destination / library.Name).as_posix()
+		try:
+			vlib.CreateLibrary()
+		except QuestaException as ex:
+			raise PreCompilerException("Error while creating library '{0}'.".format(library.Name)) from ex
+		if vlib.HasErrors:
+			raise PreCompilerException("Error while creating library '{0}'.".format(library.Name))
+
+		# create a QuestaVHDLCompiler instance
+		vcom = self._toolChain.GetVHDLCompiler()
+		vcom.Parameters[vcom.FlagQuietMode] =         True
+		vcom.Parameters[vcom.FlagExplicit] =          True
+		vcom.Parameters[vcom.SwitchModelSimIniFile] = self._modelsimIniPath.as_posix()
+		vcom.Parameters[vcom.SwitchVHDLVersion] =     repr(self._vhdlVersion)
+		vcom.Parameters[vcom.SwitchVHDLLibrary] =     library.Name
+		vcom.Parameters[vcom.ArgLogFile] =            None
+
+		# compile all files in order; continue after errors to report all failed files
+		failures = []
+		for filePath in library.Files:
+			if (not filePath.exists()):
+				failures.append((str(filePath), "File not found."))
+				continue
+
+			vcom.Parameters[vcom.ArgSourceFile] = filePath
+			try:
+				vcom.Compile()
+			except QuestaException as ex:
+				raise PreCompilerException("Error while compiling '{0!s}'.".format(filePath)) from ex
+			if vcom.HasErrors:
+				failures.append((str(filePath), "Compilation failed."))
+		return failures
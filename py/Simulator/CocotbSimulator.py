@@ -44,58 +44,193 @@ else:
 
 
 # load dependencies
+import hashlib
 import shutil
-from textwrap                import dedent
+from collections                  import OrderedDict
+from concurrent.futures           import ThreadPoolExecutor
+from os                           import chdir
+from pathlib                      import Path
+from textwrap                     import dedent
+from xml.etree                    import ElementTree
 
-from Base.Project            import FileTypes, ToolChain, Tool
-from Base.Simulator          import SimulatorException, Simulator as BaseSimulator
-from PoC.Config              import Vendors
-from PoC.Entity              import WildCard
-from ToolChains.GNU          import Make
+from Base.Exceptions              import NotConfiguredException
+from Base.Logging                 import Severity
+from Base.Project                 import FileTypes, VHDLVersion, ToolChain, Tool
+from Base.Simulator               import SimulatorException, SkipableSimulatorException, Simulator as BaseSimulator, SimulationResult
+from PoC.Config                   import Vendors
+from PoC.Entity                   import WildCard
+from PoC.TestCase                 import TestCase, Status
+from PreCompiler.GHDLPreCompiler  import PreCompiler as GHDLPreCompiler
+from PreCompiler.QuestaPreCompiler import PreCompiler as QuestaPreCompiler
+from ToolChains.GHDL              import GHDL, GHDLException, GHDLReanalyzeException
+from ToolChains.GNU               import Make, GNUException
+from ToolChains.Mentor.QuestaSim  import QuestaSim, QuestaException
 
 
 class Simulator(BaseSimulator):
 	_TOOL_CHAIN =            ToolChain.Cocotb
 	_TOOL =                  Tool.Cocotb_QuestaSim
 	_COCOTB_SIMBUILD_DIRECTORY = "sim_build"
+	_ANALYSIS_MANIFEST =         "poc.analysis"
+	_TEST_LIST =                 "poc.tests"
+	_SHARD_DIRECTORY =           "shards"
 
-	def __init__(self, host, dryRun, guiMode):
+	# supported simulators: tool, directory name of precompiled libraries, option with the Makefile template
+	_SIMULATORS = {
+		"QuestaSim":  (Tool.Cocotb_QuestaSim,  "QuestaSimFiles",  "CocotbMakefile"),
+		"GHDL":       (Tool.Cocotb_GHDL,       "GHDLFiles",       "CocotbGHDLMakefile")
+	}
+	# precompiler of the libraries and the configuration section of each simulator
+	_PRECOMPILERS = {
+		"QuestaSim":  (QuestaPreCompiler,  "INSTALL.Mentor.QuestaSim"),
+		"GHDL":       (GHDLPreCompiler,    "INSTALL.GHDL")
+	}
+
+	class __Directories__(BaseSimulator.__Directories__):
+		Testbench = None
+		SimBuild =  None
+
+	def __init__(self, host, dryRun, guiMode, simulator=None, shards=None):
 		super().__init__(host, dryRun)
 
-		self._guiMode =       guiMode
+		self._guiMode =         guiMode
+		self._shardCount =      shards						# if None, each testbench selects its shard count
+		self._simulatorName =   simulator				# if None, each testbench selects its simulator
+		self._simulator =       None
+		self._toolChains =      {}
+		self._toolChain =       None
+		self._makefileOption =  None
+		self._topLevelFile =    None
+		self._modelsimIniPath = None
+		self._cocotbTestCases = []
 
 		configSection =                 host.PoCConfig['CONFIG.DirectoryNames']
 		self.Directories.Working =      host.Directories.Temp / configSection['CocotbFiles']
-		self.Directories.PreCompiled =  host.Directories.PreCompiled / configSection['QuestaSimFiles']
 
 		self._PrepareSimulationEnvironment()
-		self._PrepareSimulator()
 
-	def _PrepareSimulator(self):
-		# create the Cocotb executable factory
-		self._LogVerbose("Preparing Cocotb simulator.")
+	def _PrepareSimulationEnvironment(self):
+		# keep the build directories of previous runs, every testbench has its own sub-directory
+		self._LogNormal("Preparing simulation environment...")
+		if (not self.Directories.Working.exists()):
+			self._LogDebug("Creating temporary directory: {0!s}".format(self.Directories.Working))
+			try:
+				self.Directories.Working.mkdir(parents=True)
+			except OSError as ex:
+				raise SimulatorException("Error while creating '{0!s}'.".format(self.Directories.Working)) from ex
 
-	def RunAll(self, fqnList, *args, **kwargs):
-		self._testSuite.StartTimer()
-		try:
-			for fqn in fqnList:
-				entity = fqn.Entity
-				if (isinstance(entity, WildCard)):
-					for testbench in entity.GetCocoTestbenches():
-						self.TryRun(testbench, *args, **kwargs)
-				else:
-					testbench = entity.CocoTestbench
-					self.TryRun(testbench, *args, **kwargs)
-		except KeyboardInterrupt:
-			self._LogError("Received a keyboard interrupt.")
-		finally:
-			self._testSuite.StopTimer()
+	def _PrepareSimulator(self, simulatorName):
+		# create the executable factory of the simulator used by Cocotb
+		self._LogVerbose("Preparing Cocotb simulator: {0}".format(simulatorName))
+		if (simulatorName == "GHDL"):
+			ghdlSection = self.Host.PoCConfig['INSTALL.GHDL']
+			if (len(ghdlSection) == 0):
+				raise NotConfiguredException("GHDL is not configured on this system.")
 
-		self.PrintOverallSimulationReport()
+			binaryPath = Path(ghdlSection['BinaryDirectory'])
+			version =    ghdlSection['Version']
+			backend =    ghdlSection['Backend']
+			return GHDL(self.Host.Platform, binaryPath, version, backend, logger=self.Logger)
+		else:
+			questaSection = self.Host.PoCConfig['INSTALL.Mentor.QuestaSim']
+			if (len(questaSection) == 0):
+				raise NotConfiguredException("Mentor QuestaSim is not configured on this system.")
 
-		return self._testSuite.IsAllPassed
+			binaryPath = Path(questaSection['BinaryDirectory'])
+			version =    questaSection['Version']
+			return QuestaSim(self.Host.Platform, binaryPath, version, logger=self.Logger)
 
-	def _RunSimulation(self, testbench):
+	def _UpdatePreCompiledLibraries(self, board):
+		# each testbench may select its own simulator, so check the libraries of all configured simulators
+		simulatorNames = sorted(self._PRECOMPILERS) if (self._simulatorName is None) else [self._simulatorName]
+		for simulatorName in simulatorNames:
+			if (simulatorName not in self._PRECOMPILERS):
+				continue			# reported, when a testbench selects it
+			precompilerClass, sectionName = self._PRECOMPILERS[simulatorName]
+			if (len(self.Host.PoCConfig[sectionName]) != 0):
+				self._RebuildStaleLibraries(precompilerClass, board)
+
+	def _SelectSimulator(self, testbench):
+		simulatorName = self._simulatorName
+		if (simulatorName is None):
+			simulatorName = self.Host.PoCConfig[testbench.ConfigSectionName]['CocotbSimulator']
+		if (simulatorName not in self._SIMULATORS):
+			raise SimulatorException("Unsupported Cocotb simulator '{0}' for testbench '{1!s}'.".format(simulatorName, testbench))
+
+		# the tool is used to evaluate the *.files files, so select it before the project is created
+		self._TOOL, precompiledDirectoryName, self._makefileOption = self._SIMULATORS[simulatorName]
+		self.Directories.PreCompiled = self.Host.Directories.PreCompiled / self.Host.PoCConfig['CONFIG.DirectoryNames'][precompiledDirectoryName]
+
+		if (simulatorName not in self._toolChains):
+			self._toolChains[simulatorName] = self._PrepareSimulator(simulatorName)
+		self._toolChain = self._toolChains[simulatorName]
+		self._simulator = simulatorName
+
+	def _GetTestbenches(self, fqnList):
+		for fqn in fqnList:
+			entity = fqn.Entity
+			if (isinstance(entity, WildCard)):
+				for testbench in entity.GetCocoTestbenches():
+					yield testbench
+			else:
+				yield entity.CocoTestbench
+
+	def TryRun(self, testbench, *args, **kwargs):
+		self._cocotbTestCases = []
+		testCase = super().TryRun(testbench, *args, **kwargs)
+
+		# report each Cocotb test on its own
+		if (len(self._cocotbTestCases) > 0):
+			self._testSuite.ExpandTestCase(testbench, self._cocotbTestCases)
+		return testCase
+
+	def Run(self, testbench, *args, **kwargs):
+		self._SelectSimulator(testbench)
+		super().Run(testbench, *args, **kwargs)
+
+	def _RunAnalysis(self, testbench):
+		self._PrepareTestbenchDirectory(testbench)
+
+		vhdlFiles = []
+		for file in self._pocProject.Files(fileType=FileTypes.VHDLSourceFile):
+			if (not file.Path.exists()):
+				raise SimulatorException("Cannot add '{0!s}' to Cocotb Makefile.".format(file.Path)) \
+					from FileNotFoundError(str(file.Path))
+			vhdlFiles.append(file)
+		if (len(vhdlFiles) == 0):
+			raise SkipableSimulatorException("No VHDL files for testbench '{0!s}'.".format(testbench))
+
+		# the top-level file is compiled by Cocotb's Makefile into library 'work',
+		# all other files are compiled incrementally into sim_build
+		self._topLevelFile =  vhdlFiles[-1]
+		if (self._simulator == "GHDL"):
+			self._RunGHDLAnalysis(vhdlFiles[:-1])
+		else:
+			libraries =         sorted(set(file.LibraryName for file in vhdlFiles[:-1]))
+			self._WriteModelsimIni(libraries)
+			self._RunQuestaSimAnalysis(vhdlFiles[:-1], libraries)
+
+	def _PrepareTestbenchDirectory(self, testbench):
+		# each simulator has its own build directory
+		self.Directories.Testbench =  self.Directories.Working / self._simulator / testbench.ModuleName
+		self.Directories.SimBuild =   self.Directories.Testbench / self._COCOTB_SIMBUILD_DIRECTORY
+
+		# create the build directory for Cocotb if not existent, it is reused by later runs
+		if (not self.Directories.SimBuild.exists()):
+			self._LogVerbose("Creating build directory for simulator files.")
+			self._LogDebug("Build directory: {0!s}".format(self.Directories.SimBuild))
+			try:
+				self.Directories.SimBuild.mkdir(parents=True)
+			except OSError as ex:
+				raise SimulatorException("Error while creating '{0!s}'.".format(self.Directories.SimBuild)) from ex
+
+		self._LogDebug("cd \"{0!s}\"".format(self.Directories.Testbench))
+		try:
+			chdir(str(self.Directories.Testbench))
+		except OSError as ex:
+			raise SimulatorException("Error while changing to '{0!s}'.".format(self.Directories.Testbench)) from ex
+
+	def _GetPrecompiledModelsimIniPath(self):
 		# select modelsim.ini from precompiled
 		precompiledModelsimIniPath = self.Directories.PreCompiled
 		device_vendor = self._pocProject.Board.Device.Vendor
@@ -108,59 +243,173 @@ class Simulator(BaseSimulator):
 		if not precompiledModelsimIniPath.exists():
 			raise SimulatorException("Modelsim ini file '{0!s}' not found.".format(precompiledModelsimIniPath)) \
 				from FileNotFoundError(str(precompiledModelsimIniPath))
+		return precompiledModelsimIniPath
 
-		simBuildPath = self.Directories.Working / self._COCOTB_SIMBUILD_DIRECTORY
-		# create temporary directory for Cocotb if not existent
-		if (not (simBuildPath).exists()):
-			self._LogVerbose("Creating build directory for simulator files.")
-			self._LogDebug("Build directory: {0!s}".format(simBuildPath))
-			try:
-				simBuildPath.mkdir(parents=True)
-			except OSError as ex:
-				raise SimulatorException("Error while creating '{0!s}'.".format(simBuildPath)) from ex
+	def _WriteModelsimIni(self, libraries):
+		# write local modelsim.ini: precompiled libraries and the libraries in sim_build
+		self._modelsimIniPath = self.Directories.SimBuild / "modelsim.ini"
+		fileContent = dedent("""\
+			[Library]
+			others = {0!s}
+			""").format(self._GetPrecompiledModelsimIniPath())
+		for library in libraries:
+			fileContent += "{0} = {1}\n".format(library, (self.Directories.SimBuild / library).as_posix())
 
-		# write local modelsim.ini
-		modelsimIniPath = simBuildPath / "modelsim.ini"
-		if modelsimIniPath.exists():
-			try:
-				modelsimIniPath.unlink()
-			except OSError as ex:
-				raise SimulatorException("Error while deleting '{0!s}'.".format(modelsimIniPath)) from ex
+		self._UpdateFile(self._modelsimIniPath, fileContent)
+
+	def _CreateAnalysisManifest(self, vhdlFiles, header):
+		manifest = ["# " + header]
+		for file in vhdlFiles:
+			manifest.append("{0}\t{1}\t{2}".format(file.LibraryName, file.Path.as_posix(), self._HashFile(file.Path)))
+		return manifest
+
+	def _GetFirstOutdatedFile(self, manifest):
+		"""Return the index of the first VHDL file, which changed since the last run, or None if all files are up-to-date."""
+		manifestPath =  self.Directories.SimBuild / self._ANALYSIS_MANIFEST
+		oldManifest =   []
+		if manifestPath.exists():
+			with manifestPath.open('r') as fileHandle:
+				oldManifest = fileHandle.read().splitlines()
+
+		# VHDL units depend on all units compiled before them, so start at the first difference
+		firstChange = 0
+		for line, oldLine in zip(manifest, oldManifest):
+			if (line != oldLine): break
+			firstChange += 1
+		if ((firstChange == len(manifest)) and (len(oldManifest) == len(manifest))):
+			self._LogVerbose("All {0} VHDL files are up-to-date.".format(len(manifest) - 1))
+			return None
+		firstFile = max(firstChange - 1, 0)
+		self._LogVerbose("Compiling {0} of {1} VHDL files.".format(len(manifest) - 1 - firstFile, len(manifest) - 1))
+		return firstFile
+
+	def _WriteAnalysisManifest(self, manifest, fileCount):
+		# record all files, which are compiled successfully, so the next run can continue
+		manifestPath = self.Directories.SimBuild / self._ANALYSIS_MANIFEST
+		with manifestPath.open('w') as fileHandle:
+			fileHandle.write("\n".join(manifest[:fileCount + 1]) + "\n")
+
+	def _RunQuestaSimAnalysis(self, vhdlFiles, libraries):
+		"""Compile only the VHDL files, which changed since the last run, and all files following them."""
+		header =    "{0!r} {1!s}".format(self._vhdlVersion, self._GetPrecompiledModelsimIniPath())
+		manifest =  self._CreateAnalysisManifest(vhdlFiles, header)
+		firstFile = self._GetFirstOutdatedFile(manifest)
+		if (firstFile is None):
+			return
+
+		vlib = self._toolChain.GetVHDLLibraryTool()
+		for library in libraries:
+			libraryPath = self.Directories.SimBuild / library
+			if (not libraryPath.exists()):
+				vlib.Parameters[vlib.SwitchLibraryName] = libraryPath.as_posix()
+				try:
+					vlib.CreateLibrary()
+				except QuestaException as ex:
+					raise SimulatorException("Error while creating library '{0}'.".format(library)) from ex
+
+		vcom = self._toolChain.GetVHDLCompiler()
+		vcom.Parameters[vcom.FlagQuietMode] =         True
+		vcom.Parameters[vcom.FlagExplicit] =          True
+		vcom.Parameters[vcom.FlagRangeCheck] =        True
+		vcom.Parameters[vcom.SwitchModelSimIniFile] = self._modelsimIniPath.as_posix()
+		vcom.Parameters[vcom.SwitchVHDLVersion] =     repr(self._vhdlVersion)
+
+		try:
+			for index in range(firstFile, len(vhdlFiles)):
+				file =        vhdlFiles[index]
+				vcomLogFile = self.Directories.SimBuild / (file.Path.stem + ".vcom.log")
+				vcom.Parameters[vcom.SwitchVHDLLibrary] = file.LibraryName
+				vcom.Parameters[vcom.ArgLogFile] =        vcomLogFile
+				vcom.Parameters[vcom.ArgSourceFile] =     file.Path
+
+				try:
+					vcom.Compile()
+				except QuestaException as ex:
+					raise SimulatorException("Error while compiling '{0!s}'.".format(file.Path)) from ex
+				if vcom.HasErrors:
+					raise SkipableSimulatorException("Error while compiling '{0!s}'.".format(file.Path))
+				firstFile = index + 1
+		finally:
+			self._WriteAnalysisManifest(manifest, firstFile)
+
+	def _RunGHDLAnalysis(self, vhdlFiles):
+		"""Analyse only the VHDL files, which changed since the last run, and all files following them into sim_build."""
+		ghdl = self._toolChain.GetGHDLAnalyze()
+		ghdl.Parameters[ghdl.FlagWarnBinding] =       True
+		ghdl.Parameters[ghdl.FlagNoVitalChecks] =     True
+		ghdl.Parameters[ghdl.FlagMultiByteComments] = True
+		ghdl.Parameters[ghdl.FlagSynBinding] =        True
+		ghdl.Parameters[ghdl.FlagPSL] =               True
+		ghdl.Parameters[ghdl.SwitchWorkingDirectory] = self.Directories.SimBuild.as_posix()
+		self._SetGHDLOptions(ghdl)
+
+		# all options (including the library references) are part of the manifest
+		header =    " ".join(ghdl.Parameters.ToArgumentList())
+		manifest =  self._CreateAnalysisManifest(vhdlFiles, header)
+		firstFile = self._GetFirstOutdatedFile(manifest)
+		if (firstFile is None):
+			return
 
-		with modelsimIniPath.open('w') as fileHandle:
-			fileContent = dedent("""\
-				[Library]
-				others = {0!s}
-				""").format(precompiledModelsimIniPath)
-			fileHandle.write(fileContent)
+		ghdl.Parameters[ghdl.FlagVerbose] =           (self.Logger.LogLevel is Severity.Debug)
+		try:
+			for index in range(firstFile, len(vhdlFiles)):
+				file = vhdlFiles[index]
+				ghdl.Parameters[ghdl.SwitchVHDLLibrary] = file.LibraryName
+				ghdl.Parameters[ghdl.ArgSourceFile] =     file.Path
+
+				try:
+					ghdl.Analyze()
+				except GHDLReanalyzeException as ex:
+					raise SkipableSimulatorException("Error while analysing '{0!s}'.".format(file.Path)) from ex
+				except GHDLException as ex:
+					raise SimulatorException("Error while analysing '{0!s}'.".format(file.Path)) from ex
+				if ghdl.HasErrors:
+					raise SkipableSimulatorException("Error while analysing '{0!s}'.".format(file.Path))
+				firstFile = index + 1
+		finally:
+			self._WriteAnalysisManifest(manifest, firstFile)
+
+	def _SetGHDLOptions(self, ghdl):
+		# options shared by PoC's analysis and the analysis/elaboration in Cocotb's Makefile
+		ghdl.Parameters[ghdl.FlagExplicit] =          True
+		ghdl.Parameters[ghdl.FlagRelaxedRules] =      True
+		if (self._vhdlVersion <= VHDLVersion.VHDL93):
+			ghdl.Parameters[ghdl.SwitchIEEEFlavor] =    "synopsys"
+
+		if (self._vhdlVersion is VHDLVersion.VHDL93):
+			ghdl.Parameters[ghdl.SwitchVHDLVersion] =   "93c"
+		else:
+			ghdl.Parameters[ghdl.SwitchVHDLVersion] =   repr(self._vhdlVersion)[-2:]
+
+		# the libraries in sim_build and all precompiled libraries, e.g. from the GHDL library cache
+		libraryReferences = [self.Directories.SimBuild.as_posix()]
+		for extLibrary in self._pocProject.ExternalVHDLLibraries:
+			path = str(extLibrary.Path)
+			if (path not in libraryReferences):
+				libraryReferences.append(path)
+		ghdl.Parameters[ghdl.ArgListLibraryReferences] = libraryReferences
 
-		#
-		self._LogNormal("Running simulation...")
+	def _GetGHDLArguments(self):
+		ghdl = self._toolChain.GetGHDLElaborate()
+		ghdl.Parameters[ghdl.CmdElaborate] = None
+		self._SetGHDLOptions(ghdl)
+		return " ".join(ghdl.Parameters.ToArgumentList())
+
+	def _RunSimulation(self, testbench):
 		cocotbTemplateFilePath = self.Host.Directories.Root / \
-															self.Host.PoCConfig[testbench.ConfigSectionName]['CocotbMakefile'] # depends on testbench
+															self.Host.PoCConfig[testbench.ConfigSectionName][self._makefileOption] # depends on testbench
 		topLevel =      testbench.TopLevel
 		cocotbModule =  testbench.ModuleName
 
-		# create one VHDL line for each VHDL file
-		vhdlSources = ""
-		for file in self._pocProject.Files(fileType=FileTypes.VHDLSourceFile):
-			if (not file.Path.exists()):
-				raise SimulatorException("Cannot add '{0!s}' to Cocotb Makefile.".format(file.Path)) \
-					from FileNotFoundError(str(file.Path))
-			vhdlSources += str(file.Path) + " "
-
-		# copy Cocotb (Python) files to temp directory
-		self._LogVerbose("Copying Cocotb (Python) files into temporary directory.")
-		cocotbTempDir = str(self.Directories.Working)
+		# refresh Cocotb (Python) files in the testbench directory
+		self._LogVerbose("Updating Cocotb (Python) files in temporary directory.")
+		cocotbFiles = []
 		for file in self._pocProject.Files(fileType=FileTypes.CocotbSourceFile):
 			if (not file.Path.exists()):
 				raise SimulatorException("Cannot copy '{0!s}' to Cocotb temp directory.".format(file.Path)) \
 					from FileNotFoundError(str(file.Path))
-			self._LogDebug("copy {0!s} {1}".format(file.Path, cocotbTempDir))
-			try:
-				shutil.copy(str(file.Path), cocotbTempDir)
-			except OSError as ex:
-				raise SimulatorException("Error while copying '{0!s}'.".format(file.Path)) from ex
+			self._CopyFile(file.Path, self.Directories.Testbench / file.Path.name)
+			cocotbFiles.append(file.Path.name)
 
 		# read/write Makefile template
 		self._LogVerbose("Generating Makefile...")
@@ -168,16 +417,192 @@ class Simulator(BaseSimulator):
 		with cocotbTemplateFilePath.open('r') as fileHandle:
 			cocotbMakefileContent = fileHandle.read()
 
+		ghdlArguments = self._GetGHDLArguments() if (self._simulator == "GHDL") else ""
 		cocotbMakefileContent = cocotbMakefileContent.format(PoCRootDirectory=str(self.Host.Directories.Root),
-																													VHDLSources=vhdlSources,
-																													TopLevel=topLevel, CocotbModule=cocotbModule)
+																													VHDLSources=str(self._topLevelFile.Path),
+																													TopLevel=topLevel, CocotbModule=cocotbModule,
+																													GHDLArguments=ghdlArguments)
 
-		cocotbMakefilePath = self.Directories.Working / "Makefile"
+		cocotbMakefilePath = self.Directories.Testbench / "Makefile"
 		self._LogDebug("Writing Cocotb Makefile to '{0!s}'".format(cocotbMakefilePath))
-		with cocotbMakefilePath.open('w') as fileHandle:
-			fileHandle.write(cocotbMakefileContent)
+		self._UpdateFile(cocotbMakefilePath, cocotbMakefileContent)
+
+		# execute make, the tests are split into shards if their names are known from a previous run
+		testListHash = self._HashTestList(cocotbFiles)
+		shards =       self._GetShards(testbench, testListHash)
+		if (len(shards) > 1):
+			testCases = self._RunShards(testbench, shards, ["Makefile"] + cocotbFiles)
+		else:
+			resultsFilePath = self.Directories.Testbench / "results.xml"
+			self._DeleteFile(resultsFilePath)
+
+			make = Make(self.Host.Platform, logger=self.Host.Logger)
+			if self._guiMode: make.Parameters[Make.SwitchGui] = 1
+			testbench.Result = make.RunCocotb()
+			testCases = self._ReadCocotbResults(testbench, resultsFilePath)
+
+		if any((testCase.Status in (Status.SimulationFailed, Status.SimulationError)) for testCase in testCases):
+			testbench.Result = SimulationResult.Failed
+		self._WriteTestList(testCases, testListHash)
+		self._cocotbTestCases = testCases
+
+	def _GetShards(self, testbench, testListHash):
+		"""Distribute the tests of the last run on shards, so all shards have about the same run time."""
+		shardCount = self._shardCount
+		if (shardCount is None):
+			shardCount = int(self.Host.PoCConfig[testbench.ConfigSectionName]['CocotbShards'])
+		if ((shardCount <= 1) or self._guiMode):
+			return []
+
+		testTimes = self._ReadTestList(testListHash)
+		if (len(testTimes) < 2):
+			self._LogVerbose("Tests of '{0}' are not known yet. Running all tests in one simulator.".format(testbench.ModuleName))
+			return []
+
+		# longest processing time first: assign each test to the shard with the least load
+		shards =  [[] for _ in range(min(shardCount, len(testTimes)))]
+		loads =   [0.0] * len(shards)
+		for testName, testTime in sorted(testTimes.items(), key=lambda item: item[1], reverse=True):
+			index = loads.index(min(loads))
+			shards[index].append(testName)
+			loads[index] += testTime
+		return shards
+
+	def _RunShards(self, testbench, shards, fileNames):
+		"""Run each shard in its own copy of the testbench directory, all simulators run in parallel."""
+		self._LogNormal("  Running {0} tests in {1} parallel simulators.".format(sum(len(shard) for shard in shards), len(shards)))
+
+		makes = []
+		try:
+			for index, testNames in enumerate(shards):
+				shardDirectory =  self._PrepareShardDirectory(index, fileNames)
+				resultsFilePath = shardDirectory / "results.xml"
+				self._DeleteFile(resultsFilePath)
+
+				# parameters are read when make is started, so the next shard can change them
+				make = Make(self.Host.Platform, logger=self.Host.Logger)
+				make.Parameters[Make.SwitchTestCase] = ",".join(testNames)
+				make.StartCocotb(shardDirectory)
+				makes.append((make, resultsFilePath))
+		except (SimulatorException, GNUException):
+			for make, _ in makes:
+				make.Terminate()
+			raise
+		finally:
+			del Make.Parameters[Make.SwitchTestCase]
+
+		with ThreadPoolExecutor(max_workers=len(makes)) as executor:
+			results = list(executor.map(lambda item: item[0].WaitCocotb(), makes))
+
+		# the overall result is the worst result of all shards
+		testbench.Result = min(results, key=lambda result: result.value)
+		testCases = []
+		for make, resultsFilePath in makes:
+			testCases += self._ReadCocotbResults(testbench, resultsFilePath)
+		return testCases
+
+	def _PrepareShardDirectory(self, index, fileNames):
+		shardDirectory =  self.Directories.Testbench / self._SHARD_DIRECTORY / str(index)
+		shardSimBuild =   shardDirectory / self._COCOTB_SIMBUILD_DIRECTORY
+		if (not shardSimBuild.exists()):
+			self._LogDebug("Creating shard directory: {0!s}".format(shardDirectory))
+			try:
+				shardSimBuild.mkdir(parents=True)
+			except OSError as ex:
+				raise SimulatorException("Error while creating '{0!s}'.".format(shardSimBuild)) from ex
+
+		# the shard uses the libraries in the testbench's sim_build, only the top-level file is compiled by the shard
+		for fileName in fileNames:
+			self._CopyFile(self.Directories.Testbench / fileName, shardDirectory / fileName)
+		for filePath in self.Directories.SimBuild.iterdir():
+			if filePath.is_file():
+				self._CopyFile(filePath, shardSimBuild / filePath.name)
+		return shardDirectory
+
+	def _HashTestList(self, cocotbFiles):
+		# test names can change with every change of a Cocotb file
+		hashes = [self._HashFile(self.Directories.Testbench / fileName) for fileName in cocotbFiles]
+		return hashlib.sha256(" ".join(hashes).encode()).hexdigest()
+
+	def _ReadTestList(self, testListHash):
+		testListPath =  self.Directories.Testbench / self._TEST_LIST
+		testTimes =     OrderedDict()
+		if testListPath.exists():
+			with testListPath.open('r') as fileHandle:
+				lines = fileHandle.read().splitlines()
+			if ((len(lines) > 0) and (lines[0] == "# " + testListHash)):
+				for line in lines[1:]:
+					testName, testTime = line.split("\t")
+					testTimes[testName] = float(testTime)
+		return testTimes
+
+	def _WriteTestList(self, testCases, testListHash):
+		# record test names and wall times for sharding in later runs
+		if (len(testCases) == 0):
+			return
+		lines = ["# " + testListHash]
+		for testCase in testCases:
+			lines.append("{0}\t{1:.3f}".format(testCase.Name, testCase.WallTime))
+		with (self.Directories.Testbench / self._TEST_LIST).open('w') as fileHandle:
+			fileHandle.write("\n".join(lines) + "\n")
+
+	def _ReadCocotbResults(self, testbench, resultsFilePath):
+		"""Create a TestCase for each test in Cocotb's results.xml (JUnit format)."""
+		if (not resultsFilePath.exists()):
+			self._LogWarning("Cocotb results file '{0!s}' not found.".format(resultsFilePath))
+			return []
+
+		self._LogVerbose("Reading Cocotb results from '{0!s}'.".format(resultsFilePath))
+		testCases = []
+		try:
+			for element in ElementTree.parse(str(resultsFilePath)).getroot().iter("testcase"):
+				testCase = TestCase(testbench, element.get("name"))
+				if   (element.find("failure") is not None):  testCase.Status = Status.SimulationFailed
+				elif (element.find("error") is not None):    testCase.Status = Status.SimulationError
+				elif (element.find("skipped") is not None):  testCase.Status = Status.SimulationSkipped
+				else:                                         testCase.Status = Status.SimulationSuccess
+
+				# simulated time is written by newer Cocotb versions only
+				simulationTime = element.get("sim_time_ns")
+				testCase.SetRunTime(float(element.get("time", 0)), None if (simulationTime is None) else float(simulationTime))
+				testCases.append(testCase)
+		except (ElementTree.ParseError, ValueError) as ex:
+			raise SkipableSimulatorException("Error while reading '{0!s}'.".format(resultsFilePath)) from ex
+
+		for testCase in testCases:
+			simulationTime = "" if (testCase.SimulationTime is None) else ", {0:.0f} ns".format(testCase.SimulationTime)
+			self._LogVerbose("  {0}: {1} ({2:.3f} s{3})".format(testCase.Name, testCase.Status.name, testCase.WallTime, simulationTime))
+
+		return testCases
+
+	def _CopyFile(self, sourcePath, destinationPath):
+		# keep unchanged files (and their timestamps), so make does not rebuild anything
+		if (destinationPath.exists() and (self._HashFile(destinationPath) == self._HashFile(sourcePath))):
+			return
+		self._LogDebug("copy {0!s} {1!s}".format(sourcePath, destinationPath))
+		try:
+			shutil.copy(str(sourcePath), str(destinationPath))
+		except OSError as ex:
+			raise SimulatorException("Error while copying '{0!s}'.".format(sourcePath)) from ex
+
+	def _DeleteFile(self, filePath):
+		# results of a previous run would let make skip the simulation
+		if filePath.exists():
+			try:
+				filePath.unlink()
+			except OSError as ex:
+				raise SimulatorException("Error while deleting '{0!s}'.".format(filePath)) from ex
+
+	def _UpdateFile(self, filePath, content):
+		# keep unchanged files (and their timestamps), so make does not rebuild anything
+		if filePath.exists():
+			with filePath.open('r') as fileHandle:
+				if (fileHandle.read() == content):
+					return
+		with filePath.open('w') as fileHandle:
+			fileHandle.write(content)
 
-		# execute make
-		make = Make(self.Host.Platform, logger=self.Host.Logger)
-		if self._guiMode: make.Parameters[Make.SwitchGui] = 1
-		testbench.Result = make.RunCocotb()
+	@staticmethod
+	def _HashFile(filePath):
+		with filePath.open('rb') as fileHandle:
+			return hashlib.sha256(fileHandle.read()).hexdigest()
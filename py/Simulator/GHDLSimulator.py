@@ -42,12 +42,15 @@ else:
 
 
 # load dependencies
+import re
+from os                     import replace as os_replace
 from pathlib                import Path
 
 from Base.Exceptions        import NotConfiguredException
 from Base.Logging           import Severity
 from Base.Project           import FileTypes, VHDLVersion, ToolChain, Tool
-from Base.Simulator         import SimulatorException, Simulator as BaseSimulator, VHDL_TESTBENCH_LIBRARY_NAME, SkipableSimulatorException
+from Base.Simulator         import SimulatorException, Simulator as BaseSimulator, VHDL_TESTBENCH_LIBRARY_NAME, SkipableSimulatorException, SimulationResult
+from PreCompiler.GHDLPreCompiler import PreCompiler as GHDLPreCompiler
 from ToolChains.GHDL        import GHDL, GHDLException, GHDLReanalyzeException
 from ToolChains.GTKWave     import GTKWave
 
@@ -55,20 +58,32 @@ from ToolChains.GTKWave     import GTKWave
 class Simulator(BaseSimulator):
 	_TOOL_CHAIN =            ToolChain.GHDL_GTKWave
 	_TOOL =                  Tool.GHDL
+	_PRECOMPILER =           GHDLPreCompiler
+
+	# waveform file format -> (file extension, GHDL run option)
+	__WAVEFORM_FORMATS__ = {
+		"vcd":    (".vcd",    GHDL.SwitchVCDWaveform),
+		"vcdgz":  (".vcd.gz", GHDL.SwitchVCDGZWaveform),
+		"fst":    (".fst",    GHDL.SwitchFastWaveform),
+		"ghw":    (".ghw",    GHDL.SwitchGHDLWaveform)
+	}
 
 	class __Directories__(BaseSimulator.__Directories__):
 		GTKWBinary = None
+		Waveforms =  None
 
-	def __init__(self, host, dryRun, guiMode):
+	def __init__(self, host, dryRun, guiMode, waveforms=False):
 		super().__init__(host, dryRun)
 
 		self._guiMode =       guiMode
+		self._waveforms =     waveforms
 		self._vhdlGenerics =  None
 		self._toolChain =     None
 
 		ghdlFilesDirectoryName =        host.PoCConfig['CONFIG.DirectoryNames']['GHDLFiles']
 		self.Directories.Working =      host.Directories.Temp / ghdlFilesDirectoryName
 		self.Directories.PreCompiled =  host.Directories.PreCompiled / ghdlFilesDirectoryName
+		self.Directories.Waveforms =    host.Directories.Root / host.PoCConfig['CONFIG.DirectoryNames']['WaveformFiles']
 
 		if (guiMode is True):
 			# prepare paths for GTKWave, if configured
@@ -180,37 +195,119 @@ class Simulator(BaseSimulator):
 
 		# configure RUNOPTS
 		ghdl.RunOptions[ghdl.SwitchIEEEAsserts] = "disable-at-0"		# enable, disable, disable-at-0
-		# set dump format to save simulation results to *.vcd file
+		# set dump format to save simulation results to a waveform file
+		waveformFilePath = None
 		if (self._guiMode):
-			waveformFileFormat =  self.Host.PoCConfig[testbench.ConfigSectionName]['ghdlWaveformFileFormat']
-			if (waveformFileFormat == "vcd"):
-				waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".vcd")
-				ghdl.RunOptions[ghdl.SwitchVCDWaveform] =    waveformFilePath
-			elif (waveformFileFormat == "vcdgz"):
-				waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".vcd.gz")
-				ghdl.RunOptions[ghdl.SwitchVCDGZWaveform] =  waveformFilePath
-			elif (waveformFileFormat == "fst"):
-				waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".fst")
-				ghdl.RunOptions[ghdl.SwitchFSTWaveform] =    waveformFilePath
-			elif (waveformFileFormat == "ghw"):
-				waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".ghw")
-				ghdl.RunOptions[ghdl.SwitchGHDLWaveform] =  waveformFilePath
-			else:                                            raise SimulatorException("Unknown waveform file format for GHDL.")
-
-		testbench.Result = ghdl.Run()
+			waveformFilePath, runOption = self._GetWaveformFile(testbench, 'ghdlWaveformFileFormat')
+			ghdl.RunOptions[runOption] =                waveformFilePath
+		elif (self._waveforms):
+			# batch mode: only selected signals, and only kept for failing testbenches
+			waveformFilePath, runOption = self._GetWaveformFile(testbench, 'ghdlBatchWaveformFileFormat')
+			ghdl.RunOptions[runOption] =                waveformFilePath
+			ghdl.RunOptions[ghdl.SwitchReadWaveOpt] =   self._WriteWaveOptFile(testbench)
+
+		testbench.Result = None
+		try:
+			testbench.Result = ghdl.Run()
+		finally:
+			# GUI mode keeps its waveform for the viewer
+			if ((waveformFilePath is not None) and (not self._guiMode)):
+				self._RetainWaveform(testbench, waveformFilePath)
+
+	def _GetWaveformFile(self, testbench, formatOptionName):
+		"""Return the waveform file path and the GHDL run option for the format in the given testbench option."""
+		waveformFileFormat = self.Host.PoCConfig[testbench.ConfigSectionName][formatOptionName]
+		try:
+			extension, runOption = self.__WAVEFORM_FORMATS__[waveformFileFormat]
+		except KeyError:
+			raise SimulatorException("Unknown waveform file format '{0}' for GHDL.".format(waveformFileFormat)) from None
+		return self.Directories.Working / (testbench.ModuleName + extension), runOption
+
+	def _WriteWaveOptFile(self, testbench):
+		"""Write a GHDL wave option file with the selected signals. Returns None to dump all signals."""
+		signals = self.Host.PoCConfig[testbench.ConfigSectionName]['ghdlWaveformSignals'].split()
+		if (len(signals) == 0):
+			gtkwSaveFilePath = self.Host.Directories.Root / self.Host.PoCConfig[testbench.ConfigSectionName]['gtkwSaveFile']
+			if (not gtkwSaveFilePath.exists()):
+				self._LogVerbose("No signals selected for the waveform. Dumping all signals.")
+				return None
+			self._LogVerbose("Selecting waveform signals from '{0!s}'.".format(gtkwSaveFilePath))
+			signals = self._ReadGTKWaveSignals(gtkwSaveFilePath)
+
+		waveOptFilePath = self.Directories.Working / (testbench.ModuleName + ".wopt")
+		try:
+			with waveOptFilePath.open('w') as fileHandle:
+				fileHandle.write("$ version 1.1\n")
+				for signal in signals:
+					fileHandle.write(signal + "\n")
+		except OSError as ex:
+			raise SkipableSimulatorException("Error while writing '{0!s}'.".format(waveOptFilePath)) from ex
+		return waveOptFilePath
+
+	_GTKW_SELECTS =   re.compile(r"(?:[\[(][^\])]*[\])])+$")
+
+	@classmethod
+	def _ReadGTKWaveSignals(cls, gtkwSaveFilePath):
+		"""
+		Convert all signals of a GTKWave save file into GHDL signal paths, e.g.
+		'top.arith_prng_tb.prng_value[7]' -> '/arith_prng_tb/prng_value'. Vectors
+		are read from their '#{...}' group lines; indexed scopes (generate
+		instances) are matched by a wildcard, e.g. '/gearbox_up_dc_tb/*/clock1'.
+		"""
+		signals = []
+		try:
+			with gtkwSaveFilePath.open('r') as fileHandle:
+				for line in fileHandle:
+					line = line.strip()
+					if line.startswith("#{"):
+						# a vector: '#{name} bit bit ...'; aliased names are resolved by the first bit
+						name, _, members = line[2:].partition("}")
+						members = members.split()
+						line = name if (name.startswith("top.") or (len(members) == 0)) else members[0]
+					# skip comments, options, flags, groups and blank lines
+					elif ((line == "") or (line[0] in "[*@-#!^")):   continue
+
+					parts = cls._GTKW_SELECTS.sub("", line.lower()).split(".")
+					if ((len(parts) > 1) and (parts[0] == "top")):
+						parts = parts[1:]
+					path = []
+					for part in parts[:-1]:
+						scope = cls._GTKW_SELECTS.sub("", part)
+						if (scope != ""):     path.append(scope)
+						if (scope != part):   path.append("*")
+					signal = "/" + "/".join(path + parts[-1:])
+					if (signal not in signals):
+						signals.append(signal)
+		except OSError as ex:
+			raise SkipableSimulatorException("Error while reading '{0!s}'.".format(gtkwSaveFilePath)) from ex
+		return signals
+
+	def _RetainWaveform(self, testbench, waveformFilePath):
+		"""Keep the waveform of a failing testbench in the waveform directory, if it's not too large."""
+		retainedFilePath = self.Directories.Waveforms / (str(testbench.Parent) + "".join(waveformFilePath.suffixes))
+		passed =           testbench.Result in (SimulationResult.Passed, SimulationResult.NoAsserts)
+		try:
+			if retainedFilePath.exists():
+				retainedFilePath.unlink()			# a waveform of a previous run
+			if (not waveformFilePath.exists()):
+				return
+
+			maxSize = int(self.Host.PoCConfig[testbench.ConfigSectionName]['ghdlWaveformMaxSize']) * 1024 * 1024
+			size =    waveformFilePath.stat().st_size
+			if passed:
+				waveformFilePath.unlink()
+			elif (size > maxSize):
+				self._LogWarning("Waveform '{0!s}' exceeds {1} MiB. Discarding it.".format(waveformFilePath, maxSize // (1024 * 1024)))
+				waveformFilePath.unlink()
+			else:
+				self.Directories.Waveforms.mkdir(parents=True, exist_ok=True)
+				os_replace(str(waveformFilePath), str(retainedFilePath))
+				self._LogQuiet("  Waveform of failing testbench: {0!s}".format(retainedFilePath))
+		except OSError as ex:
+			raise SkipableSimulatorException("Error while retaining waveform '{0!s}'.".format(waveformFilePath)) from ex
 
 	def _RunView(self, testbench):
-		# FIXME: get waveform database filename from testbench object
-		waveformFileFormat =  self.Host.PoCConfig[testbench.ConfigSectionName]['ghdlWaveformFileFormat']
-		if (waveformFileFormat == "vcd"):
-			waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".vcd")
-		elif (waveformFileFormat == "vcdgz"):
-			waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".vcd.gz")
-		elif (waveformFileFormat == "fst"):
-			waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".fst")
-		elif (waveformFileFormat == "ghw"):
-			waveformFilePath = self.Directories.Working / (testbench.ModuleName + ".ghw")
-		else:                                            raise SimulatorException("Unknown waveform file format for GHDL.")
+		waveformFilePath, _ = self._GetWaveformFile(testbench, 'ghdlWaveformFileFormat')
 
 		if (not waveformFilePath.exists()):
 			raise SkipableSimulatorException("Waveform file '{0!s}' not found.".format(waveformFilePath)) \
@@ -46,12 +46,14 @@ from Base.Exceptions              import NotConfiguredException
 from Base.Project                 import FileTypes, VHDLVersion, ToolChain, Tool
 from Base.Simulator               import SimulatorException, Simulator as BaseSimulator, VHDL_TESTBENCH_LIBRARY_NAME, SkipableSimulatorException
 from PoC.Config                   import Vendors
+from PreCompiler.QuestaPreCompiler import PreCompiler as QuestaPreCompiler
 from ToolChains.Mentor.QuestaSim  import QuestaSim, QuestaException
 
 
 class Simulator(BaseSimulator):
 	_TOOL_CHAIN =            ToolChain.Mentor_QuestaSim
 	_TOOL =                  Tool.Mentor_vSim
+	_PRECOMPILER =           QuestaPreCompiler
 
 	def __init__(self, host, dryRun, guiMode):
 		super().__init__(host, dryRun)
@@ -42,7 +42,7 @@ else:
 
 
 from collections                import OrderedDict
-from subprocess                 import check_output, STDOUT
+from subprocess                 import check_output, STDOUT, TimeoutExpired
 
 from Base.Configuration          import Configuration as BaseConfiguration, ConfigurationException
 from Base.Exceptions            import PlatformNotSupportedException
@@ -117,6 +117,10 @@ class QuartusMixIn:
 		self._version =              version
 		self._logger =              logger
 
+	@property
+	def Version(self):
+		return self._version
+
 
 class Quartus(QuartusMixIn):
 	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
@@ -128,6 +132,9 @@ class Quartus(QuartusMixIn):
 	def GetTclShell(self):
 		return TclShell(self._platform, self._binaryDirectoryPath, self._version, logger=self._logger)
 
+	def GetTclShellPool(self, size=1):
+		return TclShellPool(self._platform, self._binaryDirectoryPath, self._version, size, logger=self._logger)
+
 
 class Map(Executable, QuartusMixIn):
 	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
@@ -207,6 +214,9 @@ class Map(Executable, QuartusMixIn):
 				self._LogNormal("    " + ("-" * 76))
 
 class TclShell(Executable, QuartusMixIn):
+	_PROMPT =         "tcl> "
+	_CLOSE_TIMEOUT =  30		# seconds
+
 	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
 		QuartusMixIn.__init__(self, platform, binaryDirectoryPath, version, logger)
 
@@ -217,6 +227,17 @@ class TclShell(Executable, QuartusMixIn):
 
 		self.Parameters[self.Executable] = executablePath
 
+		self._hasOutput =    False
+		self._hasWarnings =  False
+		self._hasErrors =    False
+
+	@property
+	def HasWarnings(self):  return self._hasWarnings
+	@property
+	def HasErrors(self):    return self._hasErrors
+	@property
+	def IsRunning(self):    return (self._process is not None) and (self._process.poll() is None)
+
 	class Executable(metaclass=ExecutableArgument):
 		pass
 
@@ -228,6 +249,134 @@ class TclShell(Executable, QuartusMixIn):
 			SwitchShell
 	)
 
+	def Start(self):
+		self.Parameters[self.SwitchShell] = True
+		parameterList = self.Parameters.ToArgumentList()
+		self._LogVerbose("command: {0}".format(" ".join(parameterList)))
+
+		try:
+			self.StartProcess(parameterList)
+			self.Send("package require ::quartus::flow")
+			self.SendBoundary()
+		except Exception as ex:
+			raise QuartusException("Failed to launch quartus_sh.") from ex
+
+		# skip the banner and wait until the shell accepts commands
+		for line in self.GetReaderUntilBoundary():
+			self._LogDebug("    " + line)
+
+		if (not self.IsRunning):
+			raise QuartusException("quartus_sh terminated while starting a Tcl session.")
+		self._LogDebug("Quartus II is ready")
+
+	def IsHealthy(self):
+		"""Check with a round trip, that the shell is still alive and responsive."""
+		if (not self.IsRunning):
+			return False
+		try:
+			self.Send("puts \"POC HEALTH CHECK\"")
+			self.SendBoundary()
+		except OSError:
+			return False
+
+		healthy = False
+		for line in self.GetReaderUntilBoundary():
+			healthy |= line.endswith("POC HEALTH CHECK")
+		return healthy and self.IsRunning
+
+	def Map(self, qsfFilePath):
+		"""Create a project from the settings file and run Analysis & Synthesis.
+		The project is closed afterwards, so the next netlist starts from an empty
+		session."""
+		projectName = qsfFilePath.stem
+		try:
+			self.Send("cd {{{0}}}".format(qsfFilePath.parent.as_posix()))
+			self.Send("if {{[catch {{set fh [open {{{0}}}]; set settings [read $fh]; close $fh; project_new -overwrite {{{1}}}; eval $settings; export_assignments; execute_module -tool map}} msg]}} {{ puts \"Error: $msg\" }}".format(qsfFilePath.name, projectName))
+			self.Send("catch {project_close}")
+			self.SendBoundary()
+		except OSError as ex:
+			raise QuartusException("quartus_sh Tcl session is not responding.") from ex
+
+		self._hasOutput = False
+		self._hasWarnings = False
+		self._hasErrors = False
+		try:
+			iterator = iter(TclShellFilter(self._PromptFilter()))
+
+			line = next(iterator)
+			self._hasOutput = True
+			self._LogNormal("    quartus_sh messages for '{0!s}'".format(qsfFilePath))
+			self._LogNormal("    " + ("-" * 76))
+
+			while True:
+				self._hasWarnings |= (line.Severity is Severity.Warning)
+				self._hasErrors |= (line.Severity is Severity.Error)
+
+				line.IndentBy(2)
+				self._Log(line)
+				line = next(iterator)
+
+		except StopIteration:
+			pass
+		finally:
+			if self._hasOutput:
+				self._LogNormal("    " + ("-" * 76))
+
+		if (not self.IsRunning):
+			raise QuartusException("quartus_sh terminated unexpectedly while compiling '{0!s}'.".format(qsfFilePath))
+
+	def _PromptFilter(self):
+		for line in self.GetReaderUntilBoundary():
+			while line.startswith(self._PROMPT):
+				line = line[len(self._PROMPT):]
+			yield line
+
+	def Close(self):
+		if self.IsRunning:
+			try:
+				self.Send("exit")
+				self._process.wait(timeout=self._CLOSE_TIMEOUT)
+			except (OSError, TimeoutExpired):
+				# the session died or hangs
+				self._process.kill()
+				self._process.wait()
+		self._process = None
+
+
+class TclShellPool(QuartusMixIn):
+	"""A pool of long-lived quartus_sh sessions.
+
+	Sessions are reused for all netlists compiled by this process. A session is
+	checked before it is handed out and replaced by a new one, if it crashed.
+	"""
+	def __init__(self, platform, binaryDirectoryPath, version, size=1, logger=None):
+		QuartusMixIn.__init__(self, platform, binaryDirectoryPath, version, logger)
+
+		self._size =        size
+		self._idleShells =  []
+
+	def Acquire(self):
+		while (len(self._idleShells) > 0):
+			tclShell = self._idleShells.pop()
+			if tclShell.IsHealthy():
+				return tclShell
+			tclShell.Close()
+
+		tclShell = TclShell(self._platform, self._binaryDirectoryPath, self._version, logger=self._logger)
+		tclShell.Start()
+		return tclShell
+
+	def Release(self, tclShell):
+		if (tclShell.IsRunning and (len(self._idleShells) < self._size)):
+			self._idleShells.append(tclShell)
+		else:
+			tclShell.Close()
+
+	def Close(self):
+		for tclShell in self._idleShells:
+			tclShell.Close()
+		self._idleShells = []
+
 def MapFilter(gen):
 	iterator = iter(gen)
 
@@ -253,6 +402,23 @@ def MapFilter(gen):
 		else:
 			yield LogEntry(line, Severity.Normal)
 
+def TclShellFilter(gen):
+	for line in gen:
+		if line.startswith("Error"):
+			yield LogEntry(line, Severity.Error)
+		elif line.startswith("Warning"):
+			yield LogEntry(line, Severity.Warning)
+		elif line.startswith("Info ("):
+			yield LogEntry(line, Severity.Verbose)
+		elif line.startswith("    Info ("):
+			yield LogEntry(line, Severity.Verbose)
+		elif line.startswith("Info:"):
+			yield LogEntry(line, Severity.Info)
+		elif line.startswith("    Info:"):
+			yield LogEntry(line, Severity.Debug)
+		else:
+			yield LogEntry(line, Severity.Normal)
+
 class QuartusProject(BaseProject):
 	def __init__(self, host, name, projectFile=None):
 		super().__init__(name)
@@ -263,6 +263,10 @@ class GHDL(Executable):
 		_pattern =  "--{0}={1}"
 		_name =      "work"
 
+	class SwitchWorkingDirectory(metaclass=ShortValuedFlagArgument):
+		_pattern =  "--{0}={1}"
+		_name =      "workdir"
+
 	class ArgListLibraryReferences(metaclass=ValuedFlagListArgument):
 		_pattern =  "-{0}{1}"
 		_name =      "P"
@@ -289,6 +293,7 @@ class GHDL(Executable):
 		SwitchIEEEFlavor,
 		SwitchVHDLVersion,
 		SwitchVHDLLibrary,
+		SwitchWorkingDirectory,
 		ArgListLibraryReferences,
 		ArgSourceFile,
 		ArgTopLevel
@@ -314,12 +319,17 @@ class GHDL(Executable):
 		_pattern =  "--{0}={1}"
 		_name =      "wave"
 
+	class SwitchReadWaveOpt(metaclass=ShortValuedFlagArgument):
+		_pattern =  "--{0}={1}"
+		_name =      "read-wave-opt"
+
 	RunOptions = CommandLineArgumentList(
 		SwitchIEEEAsserts,
 		SwitchVCDWaveform,
 		SwitchVCDGZWaveform,
 		SwitchFastWaveform,
-		SwitchGHDLWaveform
+		SwitchGHDLWaveform,
+		SwitchReadWaveOpt
 	)
 
 	def GetGHDLAnalyze(self):
@@ -343,6 +353,9 @@ class GHDL(Executable):
 		for param in ghdl.Parameters:
 			if (param is not ghdl.Executable):
 				ghdl.Parameters[param] = None
+		# run options are class-level too, so don't inherit the waveform options of the previous testbench
+		for param in ghdl.RunOptions:
+			ghdl.RunOptions[param] = None
 		ghdl.Parameters[ghdl.CmdRun] =      True
 		return ghdl
 
@@ -84,20 +84,30 @@ class Make(Executable):
 	class SwitchGui(metaclass=ValuedFlagArgument):
 		_name = "GUI"
 
+	class SwitchTestCase(metaclass=ValuedFlagArgument):
+		_name = "TESTCASE"
+
 	Parameters = CommandLineArgumentList(
 		Executable,
-		SwitchGui
+		SwitchGui,
+		SwitchTestCase
 	)
 
 	def RunCocotb(self):
+		self.StartCocotb()
+		return self.WaitCocotb()
+
+	def StartCocotb(self, workingDirectory=None):
+		"""Start make, but do not wait for it. Parameters can be changed for the next Make instance afterwards."""
 		parameterList = self.Parameters.ToArgumentList()
 		self._LogVerbose("command: {0}".format(" ".join(parameterList)))
 
 		try:
-			self.StartProcess(parameterList)
+			self.StartProcess(parameterList, workingDirectory)
 		except Exception as ex:
 			raise GNUException("Failed to launch Make.") from ex
 
+	def WaitCocotb(self):
 		self._hasOutput = False
 		self._hasWarnings = False
 		self._hasErrors = False
@@ -142,6 +142,10 @@ class DiamondMixIn:
 		self._version = version
 		self._logger = logger
 
+	@property
+	def Version(self):
+		return self._version
+
 
 class Diamond(DiamondMixIn):
 	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
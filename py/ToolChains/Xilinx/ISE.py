@@ -118,6 +118,10 @@ class ISEMixIn:
 		self._version =              version
 		self._logger =              logger
 
+	@property
+	def Version(self):
+		return self._version
+
 
 class ISE(ISEMixIn):
 	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
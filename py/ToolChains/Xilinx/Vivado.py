@@ -33,7 +33,7 @@
 # ==============================================================================
 #
 # entry point
-from subprocess import check_output
+from subprocess import check_output, TimeoutExpired
 
 if __name__ != "__main__":
 	# place library initialization code here
@@ -117,6 +117,10 @@ class VivadoMixIn:
 		self._version =              version
 		self._logger =              logger
 
+	@property
+	def Version(self):
+		return self._version
+
 
 class Vivado(VivadoMixIn):
 	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
@@ -131,6 +135,9 @@ class Vivado(VivadoMixIn):
 	def GetSynthesizer(self):
 		return Synth(self._platform, self._binaryDirectoryPath, self._version, logger=self._logger)
 
+	def GetTclShell(self):
+		return TclShell(self._platform, self._binaryDirectoryPath, self._version, logger=self._logger)
+
 
 class XElab(Executable, VivadoMixIn):
 	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
@@ -426,6 +433,138 @@ class Synth(Executable, VivadoMixIn):
 				self._LogNormal("    " + ("-" * 76))
 
 
+class TclShell(Executable, VivadoMixIn):
+	_PROMPT =         "Vivado% "
+	_CLOSE_TIMEOUT =  30		# seconds
+
+	def __init__(self, platform, binaryDirectoryPath, version, logger=None):
+		VivadoMixIn.__init__(self, platform, binaryDirectoryPath, version, logger)
+		if (self._platform == "Windows"):    executablePath = binaryDirectoryPath / "vivado.bat"
+		elif (self._platform == "Linux"):    executablePath = binaryDirectoryPath / "vivado"
+		else:                                            raise PlatformNotSupportedException(self._platform)
+		super().__init__(platform, executablePath, logger=logger)
+
+		self.Parameters[self.Executable] =      executablePath
+		self.Parameters[self.FlagNoLog] =        True
+		self.Parameters[self.FlagNoJournal] =    True
+
+		self._hasOutput = False
+		self._hasWarnings = False
+		self._hasErrors = False
+
+	@property
+	def HasWarnings(self):
+		return self._hasWarnings
+
+	@property
+	def HasErrors(self):
+		return self._hasErrors
+
+	@property
+	def IsRunning(self):
+		return (self._process is not None) and (self._process.poll() is None)
+
+	class Executable(metaclass=ExecutableArgument):
+		_value =  None
+
+	class FlagNoLog(metaclass=ShortFlagArgument):
+		_name =    "nolog"
+		_value =  None
+
+	class FlagNoJournal(metaclass=ShortFlagArgument):
+		_name =    "nojournal"
+		_value =  None
+
+	class SwitchMode(metaclass=ShortTupleArgument):
+		_name =    "mode"
+		_value =  "tcl"
+
+	Parameters = CommandLineArgumentList(
+		Executable,
+		FlagNoLog,
+		FlagNoJournal,
+		SwitchMode
+	)
+
+	def Start(self):
+		parameterList = self.Parameters.ToArgumentList()
+		self._LogVerbose("command: {0}".format(" ".join(parameterList)))
+
+		try:
+			self.StartProcess(parameterList)
+		except Exception as ex:
+			raise VivadoException("Failed to launch vivado.") from ex
+
+		# skip the banner and wait until the shell accepts commands
+		self.SendBoundary()
+		for line in self.GetReaderUntilBoundary():
+			self._LogDebug("    " + line)
+
+		if (not self.IsRunning):
+			raise VivadoException("Vivado terminated while starting a Tcl session.")
+		self._LogDebug("Vivado is ready")
+
+	def Source(self, tclFilePath, workingDirectory, logFilePath):
+		"""Source a Tcl script in this session and reset the in-memory project
+		afterwards, so the next script starts from an empty session."""
+		try:
+			self.Send("cd {{{0}}}".format(workingDirectory.as_posix()))
+			self.Send("if {{[catch {{source -notrace {{{0}}}}} msg]}} {{ puts \"ERROR: $msg\" }}".format(tclFilePath.as_posix()))
+			self.Send("close_design -quiet")
+			self.Send("close_project -quiet")
+			self.SendBoundary()
+		except OSError as ex:
+			raise VivadoException("Vivado Tcl session is not responding.") from ex
+
+		self._hasOutput = False
+		self._hasWarnings = False
+		self._hasErrors = False
+		try:
+			with logFilePath.open('w') as logFileHandle:
+				iterator = iter(CompilerFilter(self._LogReader(logFileHandle)))
+
+				try:
+					line = next(iterator)
+					self._hasOutput = True
+					self._LogNormal("    vivado messages for '{0!s}'".format(tclFilePath))
+					self._LogNormal("    " + ("-" * 76))
+
+					while True:
+						self._hasWarnings |= (line.Severity is Severity.Warning)
+						self._hasErrors |= (line.Severity is Severity.Error)
+
+						line.IndentBy(2)
+						self._Log(line)
+						line = next(iterator)
+
+				except StopIteration:
+					pass
+		finally:
+			if self._hasOutput:
+				self._LogNormal("    " + ("-" * 76))
+
+		if (not self.IsRunning):
+			raise VivadoException("Vivado terminated unexpectedly while sourcing '{0!s}'.".format(tclFilePath))
+
+	def _LogReader(self, logFileHandle):
+		# strip the shell prompts and write a per-script log file
+		for line in self.GetReaderUntilBoundary():
+			while line.startswith(self._PROMPT):
+				line = line[len(self._PROMPT):]
+			logFileHandle.write(line + "\n")
+			yield line
+
+	def Close(self):
+		if self.IsRunning:
+			try:
+				self.Send("exit")
+				self._process.wait(timeout=self._CLOSE_TIMEOUT)
+			except (OSError, TimeoutExpired):
+				# the session died or hangs
+				self._process.kill()
+				self._process.wait()
+		self._process = None
+
 
 def ElaborationFilter(gen):
 	for line in gen:
@@ -33,19 +33,18 @@
 # ==============================================================================
 
 #import traceback
-import random
 
 import cocotb
 from cocotb.decorators import coroutine
 from cocotb.triggers import Timer, RisingEdge
 from cocotb.monitors import BusMonitor
 from cocotb.drivers import BusDriver
-from cocotb.binary import BinaryValue
 from cocotb.regression import TestFactory
 from cocotb.scoreboard import Scoreboard
 from cocotb.result import TestFailure
 
-from lru_dict import LeastRecentlyUsedDict
+from lru_dict import LeastRecentlyUsedSets
+from stimulus import Stimulus, Bits, Constrained, Weighted, transaction_type
 from utils import log2ceil
 
 # debug level
@@ -59,44 +58,8 @@ class InputDriver(BusDriver):
 	def __init__(self, dut):
 		BusDriver.__init__(self, dut, None, dut.Clock)
 
-class InputTransaction(object):
-	"""Creates transaction to be send by InputDriver"""
-	def __init__(self, tb, request=0, readWrite=0, invalidate=0, replace=0, address=0, cacheLineIn=0):
-		"tb must be an instance of the Testbench class"
-		if (replace==1) and ((request==1) or (invalidate==1)):
-			raise ValueError("InputTransaction.__init__ called with request=%d, invalidate=%d, replace=%d"
-											 % request, invalidate, replace)
-
-		self.Replace = BinaryValue(replace, 1)
-		self.Request = BinaryValue(request, 1)
-		self.ReadWrite = BinaryValue(readWrite, 1)
-		self.Invalidate = BinaryValue(invalidate, 1)
-		self.Address = BinaryValue(address, tb.address_bits, False)
-		self.CacheLineIn = BinaryValue(cacheLineIn, tb.data_bits, False)
-
-# ==============================================================================
-class InputMonitor(BusMonitor):
-	"""Observes inputs of DUT."""
-	_signals = [ "Request", "ReadWrite", "Invalidate", "Replace", "Address", "CacheLineIn" ]
-
-	def __init__(self, dut, callback=None, event=None):
-		BusMonitor.__init__(self, dut, None, dut.Clock, dut.Reset, callback=callback, event=event)
-		self.name = "in"
-
-	@coroutine
-	def _monitor_recv(self):
-		clkedge = RisingEdge(self.clock)
-
-		while True:
-			# Capture signals at rising-edge of clock.
-			yield clkedge
-			vec = (self.bus.Request.value.integer,
-						 self.bus.ReadWrite.value.integer,
-						 self.bus.Invalidate.value.integer,
-						 self.bus.Replace.value.integer,
-						 self.bus.Address.value.integer,
-						 self.bus.CacheLineIn.value.integer)
-			self._recv(vec)
+# Transaction to be send by InputDriver, all values are integers.
+InputTransaction = transaction_type("InputTransaction", InputDriver._signals)
 
 # ==============================================================================
 class OutputMonitor(BusMonitor):
@@ -136,7 +99,6 @@ class Testbench(object):
 
 	def __init__(self, dut):
 		self.dut = dut
-		self.stopped = False
 		self.address_bits = dut.ADDRESS_BITS.value
 		self.data_bits = dut.DATA_BITS.value
 
@@ -156,118 +118,101 @@ class Testbench(object):
 		if replacement_policy != "LRU":
 			raise TestFailure("Unsupported configuration: REPLACEMENT_POLICY=%s" % replacement_policy)
 
-		# TODO: create LRU dictionary for each cache set
-		self.lrus = tuple([LeastRecentlyUsedDict(size_limit=self.associativity) for _ in range(self.cache_sets)])
-
 		init_val = (None, 0, 0, None)
 
 		self.input_drv = InputDriver(dut)
 		self.output_mon = OutputMonitor(dut)
 
-		# Create a scoreboard on the outputs
+		# Create a scoreboard on the outputs. The expected outputs are computed by
+		# the ReferenceModel when the stimuli are generated, so no model callback
+		# is needed for the input transactions.
 		self.expected_output = [ init_val ]
 		self.scoreboard = Testbench.MyScoreboard(dut)
 		self.scoreboard.add_interface(self.output_mon, self.expected_output)
 
-		# Reconstruct the input transactions from the pins
-		# and send them to our 'model'
-		self.input_mon = InputMonitor(dut, callback=self.model)
 
-	def model(self, transaction):
-		'''Model the DUT based on the input transaction.'''
-		request, readWrite, invalidate, replace, address, cacheLineIn = transaction
-		if DEBUG >= 1: print("=== model called with stopped={0!r}, Request={1}, ReadWrite={2}, Invalidate={3}, Replace={4}, Address={5}, CacheLineIn={6}".
-												 format(self.stopped, request, readWrite, invalidate, replace, address, cacheLineIn))
+# ==============================================================================
+class ReferenceModel(object):
+	"""Models the DUT with one LRU list for each cache set."""
+	def __init__(self, tb):
+		"tb must be an instance of the Testbench class"
+		self.lrus = LeastRecentlyUsedSets(tb.cache_sets, tb.associativity)
+		self.index_mask = tb.index_mask
+		self.associativity = tb.associativity
 
+	def contains(self, address):
+		return self.lrus.contains(address & self.index_mask, address)
+
+	def step(self, transaction):
+		"""
+		Apply one InputTransaction and return the expected output
+		(cacheLineOut, cacheHit, cacheMiss, oldAddress), None means ignore.
+		"""
+		request, readWrite, invalidate, replace, address, cacheLineIn = transaction
+		lrus = self.lrus
 		index = address & self.index_mask
-		#tag = (address >> self.index_bits) & self.tag_mask
 
 		# expected outputs, None means ignore
 		cacheLineOut, cacheHit, cacheMiss, oldAddress = None, 0, 0, None
-		if not self.stopped:
-			if request == 1:
-				if address in self.lrus[index]:
-					cacheHit = 1
-					if readWrite == 1:
-						self.lrus[index][address] = cacheLineIn
-					else:
-						cacheLineOut = self.lrus[index][address]
-						self.lrus[index][address] = cacheLineOut # move to recently-used position
-
-					if invalidate == 1:
-						del self.lrus[index][address]
-
+		if request == 1:
+			if lrus.contains(index, address):
+				cacheHit = 1
+				if readWrite == 1:
+					lrus.set(index, address, cacheLineIn)
 				else:
-					cacheMiss = 1
+					cacheLineOut = lrus.get(index, address)
+					lrus.moveMRU(index, address) # move to recently-used position
 
-			elif replace == 1:
-				# check if a valid cache line will be replaced
-				if len(self.lrus[index]) == self.associativity:
-					oldAddress, cacheLineOut = self.lrus[index].iteritems().next()
+				if invalidate == 1:
+					lrus.delete(index, address)
 
-				# actual replace
-				self.lrus[index][address] = cacheLineIn
+			else:
+				cacheMiss = 1
 
-			if DEBUG >= 1: print("=== model: lrus[{0}] = {1!s}".format(index, self.lrus[index].items()))
-			self.expected_output.append( (cacheLineOut, cacheHit, cacheMiss, oldAddress) )
+		elif replace == 1:
+			# check if a valid cache line will be replaced
+			if lrus.count(index) == self.associativity:
+				oldAddress, cacheLineOut = lrus.peekLRU(index)
 
-	def stop(self):
-		"""
-		Stop generation of expected output transactions.
-		One more clock cycle must be executed afterwards, so that, output of
-		D-FF can be checked.
-		"""
-		self.stopped = True
+			# actual replace
+			lrus.set(index, address, cacheLineIn)
+
+		if DEBUG >= 1: print("=== model: lrus[{0}] = {1!s}".format(index, lrus.items(index)))
+		return (cacheLineOut, cacheHit, cacheMiss, oldAddress)
 
 
 # ==============================================================================
-def random_input_gen(tb,n=100000):
+def random_input_gen(tb, stimulus, n=100000):
 	"""
-	Generate random input data to be applied by InputDriver.
-	Returns up to n instances of InputTransaction.
-	tb must an instance of the Testbench class.
+	Lazily generate n random InputTransactions together with the expected output.
+	Yields (transaction, expected output) tuples.
+	tb must an instance of the Testbench class, stimulus an instance of Stimulus.
 	"""
-	address_high  = 2**tb.address_bits-1
-	data_high = 2**tb.data_bits-1
-
+	model = ReferenceModel(tb)
+
+	# 10% for each possible command: (request, readWrite, invalidate, replace)
+	command_gen = Weighted([
+		((1, 0, 0, 0), 10),
+		((1, 1, 0, 0), 10),
+		((1, 0, 1, 0), 10),
+		((1, 1, 1, 0), 10),
+		((0, 0, 0, 1), 10),
+		((0, 0, 0, 0), 10)
+	])
+	address_gen = Bits(tb.address_bits)
 	# it is forbidden to replace a cache line when the new address is already within the cache
-	# we cannot directly access the content of the LRU list in the testbench because this function is called asynchronously
-	lru_tags = tuple([LeastRecentlyUsedDict(size_limit=tb.associativity) for _ in range(tb.cache_sets)])
+	replace_address_gen = Constrained(address_gen, lambda address: not model.contains(address))
+	data_gen = Bits(tb.data_bits)
 
 	for i in range(n):
 		if DEBUG and (i % 1000 == 0): print("Generating transaction #{0} ...".format(i))
 
-		command = random.randint(1,60)
-		request, readWrite, invalidate, replace = 0, 0, 0, 0
-		# 10% for each possible command
-		if   command > 50: request = 1; readWrite = 0; invalidate = 0
-		elif command > 40: request = 1; readWrite = 1; invalidate = 0
-		elif command > 30: request = 1; readWrite = 0; invalidate = 1
-		elif command > 20: request = 1; readWrite = 1; invalidate = 1
-		elif command > 10: replace = 1
-
-		# Upon request, check if address is in LRU list.
-		while True:
-			address = random.randint(0,address_high)
-			index = address & tb.index_mask
-			tag = (address >> tb.index_bits) &  tb.tag_mask
-			#print "while loop: %d, %d, %d" % (address, index, tag)
-			if (replace == 0) or (tag not in lru_tags[index]): break
-
-		# Update LRU list
-		if request == 1:
-			if tag in lru_tags[index]:
-				if invalidate == 1:
-					del lru_tags[index][tag] # free cache line
-				else:
-					lru_tags[index][tag] = 1 # tag access
-		elif replace == 1:
-			lru_tags[index][tag] = 1 # allocate cache line
-
-		if DEBUG >= 2: print("=== random_input_gen: request={0}, readWrite={1}, invalidate={2}, replace={3}, address={4}".format(request, readWrite, invalidate, replace, address))
-		if DEBUG >= 2: print("=== random_input_gen: lru_tags[{0}]={1!s}".format(index, lru_tags[index].items()))
+		request, readWrite, invalidate, replace = command_gen(stimulus)
+		address = replace_address_gen(stimulus) if replace == 1 else address_gen(stimulus)
+		transaction = InputTransaction(request, readWrite, invalidate, replace, address, data_gen(stimulus))
 
-		yield InputTransaction(tb, request, readWrite, invalidate, replace, address, random.randint(0,data_high))
+		if DEBUG >= 2: print("=== random_input_gen: {0!s}".format(transaction))
+		yield transaction, model.step(transaction)
 
 @cocotb.coroutine
 def clock_gen(signal):
@@ -283,20 +228,24 @@ def run_test(dut):
 	tb = Testbench(dut)
 	dut.Reset <= 0
 
-	input_gen = random_input_gen(tb)
+	# Generate the stimulus lazily, the expected output of each transaction is
+	# known before it is sent.
+	input_gen = random_input_gen(tb, Stimulus())
 
 	# Issue first transaction immediately.
-	yield tb.input_drv.send(input_gen.next(), False)
+	transaction, expected = next(input_gen)
+	tb.expected_output.append(expected)
+	yield tb.input_drv.send(transaction, False)
 
 	# Issue next transactions.
-	for t in input_gen:
-		yield tb.input_drv.send(t)
+	for transaction, expected in input_gen:
+		tb.expected_output.append(expected)
+		yield tb.input_drv.send(transaction)
 
 	# Wait for rising-edge of clock to execute last transaction from above.
-	# Apply idle command in following clock cycle, but stop generation of expected output data.
+	# Apply idle command in following clock cycle, no output is expected for it.
 	# Finish clock cycle to capture the resulting output from the last transaction above.
-	yield tb.input_drv.send(InputTransaction(tb))
-	tb.stop()
+	yield tb.input_drv.send(InputTransaction())
 	yield RisingEdge(dut.Clock)
 
 	# Print result of scoreboard.
@@ -15,6 +15,9 @@
 #	of key:value pairs. The maximum size of the dictionary can be specified 
 #	during object creation. 
 #
+#	LeastRecentlyUsedSets holds many small LRU lists (e.g., one per cache set)
+#	in flat arrays instead of one dictionary per set.
+#
 # License:
 # ==============================================================================
 # Copyright 2007-2016 Technische Universitaet Dresden - Germany
@@ -33,17 +36,29 @@
 # limitations under the License.
 # ==============================================================================
 
-from collections import OrderedDict
+try:
+	from collections.abc import MutableMapping
+except ImportError:
+	from collections import MutableMapping
+from array import array
+
+# indices into the links of the doubly-linked list
+_PREV, _NEXT, _KEY, _VALUE = 0, 1, 2, 3
+# marks a free way in LeastRecentlyUsedSets
+_FREE = object()
 
-class LeastRecentlyUsedDict(OrderedDict):
+class LeastRecentlyUsedDict(MutableMapping):
 	"""
 	The entries in this dictionary are ordered by the last addition or update 
 	of key:value pairs. The maximum size of the dictionary can be specified 
 	during object creation. 
 
-	Based on this StackOverflow answer: http://stackoverflow.com/a/2437645/5466118
-	and the example on: https://docs.python.org/2/library/collections.html#ordereddict-examples-and-recipes
+	The first (oldest) entry is the least-recently used one, the last entry is
+	the most-recently used one. All operations besides iteration are O(1): the
+	entries are kept in a circular doubly-linked list of [prev, next, key, value]
+	links, which is indexed by a dictionary.
 	"""
+	__slots__ = ("_size_limit", "_map", "_root")
 
 	def __init__(self, *args, **kwds):
 		"""
@@ -51,19 +66,85 @@ class LeastRecentlyUsedDict(OrderedDict):
 		dictionary.
 		"""
 		self._size_limit = kwds.pop("size_limit", None)
-		OrderedDict.__init__(self, *args, **kwds)
-		self._check_size_limit()
+		self._map = {}
+		self._root = root = []
+		root[:] = [root, root, None, None]
+		self.update(*args, **kwds)
+
+	def __len__(self):
+		return len(self._map)
+
+	def __contains__(self, key):
+		return key in self._map
+
+	def __getitem__(self, key):
+		return self._map[key][_VALUE]
 
 	def __setitem__(self, key, value):
-		if key in self:
-			del self[key]
-		OrderedDict.__setitem__(self, key, value)
-		self._check_size_limit()
-
-	def _check_size_limit(self):
-		if self._size_limit is not None:
-			while len(self) > self._size_limit:
+		"""Add or update key and mark it as most-recently used."""
+		link = self._map.get(key)
+		if link is None:
+			root = self._root
+			last = root[_PREV]
+			last[_NEXT] = root[_PREV] = self._map[key] = [last, root, key, value]
+			if (self._size_limit is not None) and (len(self._map) > self._size_limit):
 				self.popitem(last=False)
+		else:
+			link[_VALUE] = value
+			self._move(link, True)
+
+	def __delitem__(self, key):
+		link = self._map.pop(key)
+		link[_PREV][_NEXT] = link[_NEXT]
+		link[_NEXT][_PREV] = link[_PREV]
+
+	def __iter__(self):
+		root = self._root
+		link = root[_NEXT]
+		while link is not root:
+			yield link[_KEY]
+			link = link[_NEXT]
+
+	def __repr__(self):
+		return "{0}({1!r})".format(self.__class__.__name__, list(self.items()))
+
+	# Python 2 style iterators, used by the testbenches
+	def iterkeys(self):
+		return iter(self)
+
+	def itervalues(self):
+		for key in self:
+			yield self._map[key][_VALUE]
+
+	def iteritems(self):
+		for key in self:
+			yield (key, self._map[key][_VALUE])
+
+	def clear(self):
+		self._map.clear()
+		root = self._root
+		root[:] = [root, root, None, None]
+
+	def popitem(self, last=True):
+		"""Remove and return the most-recently (last=True) or least-recently used entry."""
+		if not self._map:
+			raise KeyError("dictionary is empty")
+		link = self._root[_PREV] if last else self._root[_NEXT]
+		del self[link[_KEY]]
+		return (link[_KEY], link[_VALUE])
+
+	def _move(self, link, last):
+		root = self._root
+		link[_PREV][_NEXT] = link[_NEXT]
+		link[_NEXT][_PREV] = link[_PREV]
+		if last:
+			prev = root[_PREV]
+			link[_PREV], link[_NEXT] = prev, root
+			prev[_NEXT] = root[_PREV] = link
+		else:
+			first = root[_NEXT]
+			link[_PREV], link[_NEXT] = root, first
+			first[_PREV] = root[_NEXT] = link
 
 	@property
 	def size_limit(self):
@@ -72,24 +153,208 @@ class LeastRecentlyUsedDict(OrderedDict):
 
 	def moveLRU(self, key, value=None):
 		"""
-		Mark key as least-recently used. 
+		Mark key as least-recently used (move it to the front).
+		Does nothing, if key is not within dictionary.
+		If no value is specified, then the current value of the key is used.
+		"""
+		link = self._map.get(key)
+		if link is not None:
+			if value is not None:
+				link[_VALUE] = value
+			self._move(link, False)
+
+	def moveMRU(self, key, value=None):
+		"""
+		Mark key as most-recently used (move it to the back).
 		Does nothing, if key is not within dictionary.
 		If no value is specified, then the current value of the key is used.
 		"""
-		if key in self:
-			old = self.copy()
-			if value is None:
-				value = self[key]
-
-			# build new list
-			self.clear()
-			self[key] = value
-			for k, v in old.iteritems():
-				if k == key: continue
-				self[k] = v
-
-#d = LeastRecentlyUsedDict(size_limit=5)
-#for key in range(4,-1,-1): d[key]=1
-#print "old=%s" % d
-#d.markLRU(2)
-#print "new=%s" % d
+		link = self._map.get(key)
+		if link is not None:
+			if value is not None:
+				link[_VALUE] = value
+			self._move(link, True)
+
+	def peekLRU(self):
+		"""Return the least-recently used (key, value) pair without changing the order."""
+		if not self._map:
+			raise KeyError("dictionary is empty")
+		link = self._root[_NEXT]
+		return (link[_KEY], link[_VALUE])
+
+
+class LeastRecentlyUsedSets(object):
+	"""
+	A fixed number of small LRU lists with a fixed size limit (the
+	associativity), e.g. one LRU list per set of a set-associative cache.
+
+	All keys and values are stored in two flat lists with one slot per way. The
+	order of each set is kept in a flat array of way numbers, from least- to
+	most-recently used. No per-set dictionaries are allocated: looking up a key
+	and moving a way within its set cost O(ways), which is bounded by the
+	associativity.
+
+	sets[index] returns a view, which behaves like a LeastRecentlyUsedDict of
+	this set.
+	"""
+	__slots__ = ("_sets", "_ways", "_keys", "_values", "_order", "_fill")
+
+	def __init__(self, sets, ways):
+		self._sets =    int(sets)
+		self._ways =    int(ways)
+		self._keys =    [_FREE] * (self._sets * self._ways)
+		self._values =  [None] * (self._sets * self._ways)
+		self._order =   array("H", [way for _ in range(self._sets) for way in range(self._ways)])
+		self._fill =    array("H", [0] * self._sets)
+
+	def __len__(self):
+		return self._sets
+
+	def __getitem__(self, index):
+		if not (0 <= index < self._sets):
+			raise IndexError("set index out of range")
+		return _LeastRecentlyUsedSet(self, index)
+
+	@property
+	def size_limit(self):
+		"""Get the size limit (associativity) of each set."""
+		return self._ways
+
+	def count(self, index):
+		return self._fill[index]
+
+	def contains(self, index, key):
+		return self._find(index * self._ways, key) is not None
+
+	def get(self, index, key):
+		base = index * self._ways
+		way = self._find(base, key)
+		if way is None:
+			raise KeyError(key)
+		return self._values[base + way]
+
+	def set(self, index, key, value):
+		"""
+		Add or update key in set index and mark it as most-recently used.
+		Returns the evicted (key, value) pair if the set was full, otherwise None.
+		"""
+		base = index * self._ways
+		way = self._find(base, key)
+		evicted = None
+		if way is None:
+			fill = self._fill[index]
+			if fill == self._ways:
+				way = self._order[base]
+				evicted = (self._keys[base + way], self._values[base + way])
+				self._move(base, 0, fill - 1)
+			else:
+				# the first free way follows the used ones
+				way = self._order[base + fill]
+				self._fill[index] = fill + 1
+			self._keys[base + way] = key
+		else:
+			self._move(base, self._position(base, index, way), self._fill[index] - 1)
+		self._values[base + way] = value
+		return evicted
+
+	def delete(self, index, key):
+		base = index * self._ways
+		way = self._find(base, key)
+		if way is None:
+			raise KeyError(key)
+		fill = self._fill[index] - 1
+		self._move(base, self._position(base, index, way), fill)
+		self._fill[index] = fill
+		self._keys[base + way] = _FREE
+		self._values[base + way] = None
+
+	def moveLRU(self, index, key):
+		"""Mark key in set index as least-recently used. Does nothing, if key is not within the set."""
+		base = index * self._ways
+		way = self._find(base, key)
+		if way is not None:
+			self._move(base, self._position(base, index, way), 0)
+
+	def moveMRU(self, index, key):
+		"""Mark key in set index as most-recently used. Does nothing, if key is not within the set."""
+		base = index * self._ways
+		way = self._find(base, key)
+		if way is not None:
+			self._move(base, self._position(base, index, way), self._fill[index] - 1)
+
+	def peekLRU(self, index):
+		"""Return the least-recently used (key, value) pair of set index without changing the order."""
+		if self._fill[index] == 0:
+			raise KeyError("set is empty")
+		base = index * self._ways
+		way = self._order[base]
+		return (self._keys[base + way], self._values[base + way])
+
+	def items(self, index):
+		"""Return all (key, value) pairs of set index from least- to most-recently used."""
+		base = index * self._ways
+		return [(self._keys[base + way], self._values[base + way]) for way in self._order[base:base + self._fill[index]]]
+
+	def _find(self, base, key):
+		# returns the way of key or None
+		try:
+			return self._keys.index(key, base, base + self._ways) - base
+		except ValueError:
+			return None
+
+	def _position(self, base, index, way):
+		return self._order[base:base + self._fill[index]].index(way)
+
+	def _move(self, base, source, destination):
+		# move the way at position source to position destination and shift all ways in between
+		order = self._order
+		way = order[base + source]
+		if source < destination:
+			order[base + source:base + destination] = order[base + source + 1:base + destination + 1]
+		elif source > destination:
+			order[base + destination + 1:base + source + 1] = order[base + destination:base + source]
+		order[base + destination] = way
+
+
+class _LeastRecentlyUsedSet(object):
+	"""A dictionary-like view of one set in LeastRecentlyUsedSets."""
+	__slots__ = ("_sets", "_index")
+
+	def __init__(self, sets, index):
+		self._sets =  sets
+		self._index = index
+
+	def __len__(self):
+		return self._sets.count(self._index)
+
+	def __contains__(self, key):
+		return self._sets.contains(self._index, key)
+
+	def __getitem__(self, key):
+		return self._sets.get(self._index, key)
+
+	def __setitem__(self, key, value):
+		self._sets.set(self._index, key, value)
+
+	def __delitem__(self, key):
+		self._sets.delete(self._index, key)
+
+	def __iter__(self):
+		return iter([key for key, _ in self.items()])
+
+	@property
+	def size_limit(self):
+		"""Get the size limit."""
+		return self._sets.size_limit
+
+	def items(self):
+		return self._sets.items(self._index)
+
+	def moveLRU(self, key):
+		self._sets.moveLRU(self._index, key)
+
+	def moveMRU(self, key):
+		self._sets.moveMRU(self._index, key)
+
+	def peekLRU(self):
+		return self._sets.peekLRU(self._index)
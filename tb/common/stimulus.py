@@ -0,0 +1,163 @@
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:				 		Martin Zabel
+#                     Patrick Lehmann
+#
+# Python Module:		  Seeded stimulus generation used by various Cocotb Testbenches
+#
+# Description:
+# ------------------------------------
+#	Provides a seeded random number generator and constrained-random building
+#	blocks to generate stimuli lazily.
+#
+#	Transactions are plain named tuples of integers, whose field names match the
+#	signal names of a BusDriver. They can be sent without any conversion into
+#	BinaryValue objects.
+#
+#	The seed of each Stimulus is logged. A failing test is replayed exactly by
+#	setting the environment variable STIMULUS_SEED to the logged seed.
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#											Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#		http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import logging
+import os
+import random
+from bisect import bisect_right
+from collections import namedtuple
+
+# environment variable to replay a recorded seed
+SEED_VARIABLE = "STIMULUS_SEED"
+
+
+def transaction_type(name, signals):
+	"""
+	Create a named tuple for the given signal names, all fields default to 0.
+	Instances can be sent directly by a BusDriver with the same signals.
+	"""
+	cls = namedtuple(name, signals)
+	cls.__new__.__defaults__ = (0,) * len(cls._fields)
+	return cls
+
+
+class Stimulus(random.Random):
+	"""
+	Random number generator with a recorded seed.
+	If seed is None, the seed is read from STIMULUS_SEED or chosen randomly.
+	"""
+	def __init__(self, seed=None, name="stimulus"):
+		if seed is None:
+			seed = os.environ.get(SEED_VARIABLE)
+		if seed is None:
+			seed = random.SystemRandom().getrandbits(32)
+		self._seed = int(seed)
+		random.Random.__init__(self, self._seed)
+
+		logging.getLogger("cocotb." + name).info(
+			"Using seed {0} (replay with {1}={0}).".format(self._seed, SEED_VARIABLE))
+
+	@property
+	def initial_seed(self):
+		"""Seed used to initialise this generator."""
+		return self._seed
+
+	def replay(self):
+		"""Return a new generator, which reproduces all values of this one from the start."""
+		return Stimulus(self._seed)
+
+	def stream(self, generate, n):
+		"""Lazily yield n values returned by generate(self)."""
+		while n > 0:
+			n -= 1
+			yield generate(self)
+
+
+class Constant(object):
+	"""Building block, which always returns value."""
+	def __init__(self, value):
+		self.value = value
+
+	def __call__(self, rng):
+		return self.value
+
+
+class Uniform(object):
+	"""Building block for uniformly distributed integers in [low, high]."""
+	def __init__(self, low, high):
+		if high < low:
+			raise ValueError("Uniform: high={0} is less than low={1}.".format(high, low))
+		span = high - low + 1
+		self.low = low
+		self._span = span
+		# power-of-2 ranges are drawn directly from getrandbits, which is much cheaper
+		self._bits = (span.bit_length() - 1) if (span & (span - 1) == 0) else None
+
+	def __call__(self, rng):
+		if self._bits is None:
+			return self.low + rng.randrange(self._span)
+		elif self._bits == 0:
+			return self.low
+		return self.low + rng.getrandbits(self._bits)
+
+
+class Bits(Uniform):
+	"""Building block for unsigned integers with the given bit width."""
+	def __init__(self, width):
+		Uniform.__init__(self, 0, 2**width - 1)
+
+
+class Weighted(object):
+	"""
+	Building block, which chooses one of the given values with a probability
+	proportional to its weight. choices is a list of (value, weight) tuples.
+	"""
+	def __init__(self, choices):
+		self._values = []
+		self._limits = []
+		total = 0
+		for value, weight in choices:
+			if weight <= 0: continue
+			total += weight
+			self._values.append(value)
+			self._limits.append(total)
+		if total == 0:
+			raise ValueError("Weighted: at least one choice needs a positive weight.")
+		self._choose = Uniform(0, total - 1)
+
+	def __call__(self, rng):
+		return self._values[bisect_right(self._limits, self._choose(rng))]
+
+
+class Constrained(object):
+	"""
+	Building block, which draws from block until accept(value) is true.
+	Raises ValueError, if no value is accepted after retries tries.
+	"""
+	def __init__(self, block, accept, retries=1000):
+		self.block = block
+		self.accept = accept
+		self.retries = retries
+
+	def __call__(self, rng):
+		for _ in range(self.retries):
+			value = self.block(rng)
+			if self.accept(value): return value
+		raise ValueError("Constrained: no value accepted after {0} tries.".format(self.retries))
@@ -30,18 +30,17 @@
 # ==============================================================================
 
 #import traceback
-import random
 
 import cocotb
 from cocotb.decorators import coroutine
 from cocotb.triggers import Timer, RisingEdge
 from cocotb.monitors import BusMonitor
 from cocotb.drivers import BusDriver
-from cocotb.binary import BinaryValue
 from cocotb.regression import TestFactory
 from cocotb.scoreboard import Scoreboard
 
 from lru_dict import LeastRecentlyUsedDict
+from stimulus import Stimulus, Bits, Weighted, transaction_type
 
 # ==============================================================================
 class InputDriver(BusDriver):
@@ -51,12 +50,8 @@ class InputDriver(BusDriver):
 	def __init__(self, dut):
 		BusDriver.__init__(self, dut, None, dut.Clock)
 
-class InputTransaction(object):
-	"""Creates transaction to be send by InputDriver"""
-	def __init__(self, insert, invalidate, keyin):
-		self.Insert = BinaryValue(insert, 1)
-		self.Free = BinaryValue(invalidate, 1)
-		self.KeyIn = BinaryValue(keyin, 5, False)
+# Transaction to be send by InputDriver, all values are integers.
+InputTransaction = transaction_type("InputTransaction", InputDriver._signals)
 
 # ==============================================================================
 class InputMonitor(BusMonitor):
@@ -133,7 +128,7 @@ class Testbench(object):
 				self.lru.moveLRU(keyin)
 
 			#print "=== model: lru=%s" % self.lru.items()
-			keyout = self.lru.iterkeys().next()
+			keyout = self.lru.peekLRU()[0]
 			#print "=== model: KeyOut=%d" % keyout
 			self.expected_output.append(keyout)
 
@@ -147,19 +142,17 @@ class Testbench(object):
 
 
 # ==============================================================================
-def random_input_gen(n=2000):
+def random_input_gen(stimulus, n=2000):
 	"""
 	Generate random input data to be applied by InputDriver.
-	Returns up to n instances of InputTransaction.
+	Lazily returns up to n instances of InputTransaction.
 	"""
-	for _ in range(n):
-		command = random.randint(1,100)
-		insert, free = 0, 0
-		# 89% insert, 1% free, 10% idle
-		if command > 11: insert = 1
-		elif command > 10: free = 1
-		#print "=== random_input_gen: command=%d, insert=%d, free=%d" % (command, insert, free)
-		yield InputTransaction(insert, free, random.randint(0, 31))
+	# 89% insert, 1% free, 10% idle
+	command_gen = Weighted([ ((1, 0), 89), ((0, 1), 1), ((0, 0), 10) ])
+	keyin_gen = Bits(5)
+	for insert, free in stimulus.stream(command_gen, n):
+		#print "=== random_input_gen: insert=%d, free=%d" % (insert, free)
+		yield InputTransaction(insert, free, keyin_gen(stimulus))
 
 @cocotb.coroutine
 def clock_gen(signal):
@@ -175,10 +168,10 @@ def run_test(dut):
 	tb = Testbench(dut)
 	dut.Reset <= 0
 
-	input_gen = random_input_gen()
+	input_gen = random_input_gen(Stimulus())
 
 	# Issue first transaction immediately.
-	yield tb.input_drv.send(input_gen.next(), False)
+	yield tb.input_drv.send(next(input_gen), False)
 
 	# Issue next transactions.
 	for t in input_gen:
@@ -187,7 +180,7 @@ def run_test(dut):
 	# Wait for rising-edge of clock to execute last transaction from above.
 	# Apply idle command in following clock cycle, but stop generation of expected output data.
 	# Finish clock cycle to capture the resulting output from the last transaction above.
-	yield tb.input_drv.send(InputTransaction(0, 0, 0))
+	yield tb.input_drv.send(InputTransaction())
 	tb.stop()
 	yield RisingEdge(dut.Clock)
 
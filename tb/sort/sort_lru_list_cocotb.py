@@ -30,19 +30,18 @@
 # ==============================================================================
 
 #import traceback
-import random
 
 import cocotb
 from cocotb.decorators import coroutine
 from cocotb.triggers import Timer, RisingEdge
 from cocotb.monitors import BusMonitor
 from cocotb.drivers import BusDriver
-from cocotb.binary import BinaryValue
 from cocotb.regression import TestFactory
 from cocotb.scoreboard import Scoreboard
 from cocotb.result import TestFailure
 
 from lru_dict import LeastRecentlyUsedDict
+from stimulus import Stimulus, Bits, Weighted, transaction_type
 
 # ==============================================================================
 class InputDriver(BusDriver):
@@ -52,12 +51,8 @@ class InputDriver(BusDriver):
 	def __init__(self, dut):
 		BusDriver.__init__(self, dut, None, dut.Clock)
 
-class InputTransaction(object):
-	"""Creates transaction to be send by InputDriver"""
-	def __init__(self, insert, remove, datain):
-		self.Insert = BinaryValue(insert, 1)
-		self.Remove = BinaryValue(remove, 1)
-		self.DataIn  = BinaryValue(datain, 8, False)
+# Transaction to be send by InputDriver, all values are integers.
+InputTransaction = transaction_type("InputTransaction", InputDriver._signals)
 
 # ==============================================================================
 class InputMonitor(BusMonitor):
@@ -162,7 +157,7 @@ class Testbench(object):
 				#print "=== model: to few elements, yet."
 				self.expected_output.append( (0, 0) )
 			else:
-				dataout = self.lru.itervalues().next()
+				dataout = self.lru.peekLRU()[1]
 				#print "=== model: LRU element=%d" % dataout
 				self.expected_output.append( (1, dataout) )
 
@@ -176,19 +171,17 @@ class Testbench(object):
 
 
 # ==============================================================================
-def random_input_gen(n=5000):
+def random_input_gen(stimulus, n=5000):
 	"""
 	Generate random input data to be applied by InputDriver.
-	Returns up to n instances of InputTransaction.
+	Lazily returns up to n instances of InputTransaction.
 	"""
-	for _ in range(n):
-		command, datain = random.randint(1,100), random.randint(0, 255)
-		insert, remove = 0, 0
-		# 80% insert, 10% remove, 10% idle
-		if command > 20: insert = 1
-		elif command > 10: remove = 1
-		#print "=== random_input_gen: insert=%d, datain=%d" % (insert, free, datain)
-		yield InputTransaction(insert, remove, datain)
+	# 80% insert, 10% remove, 10% idle
+	command_gen = Weighted([ ((1, 0), 80), ((0, 1), 10), ((0, 0), 10) ])
+	datain_gen = Bits(8)
+	for insert, remove in stimulus.stream(command_gen, n):
+		#print "=== random_input_gen: insert=%d, remove=%d" % (insert, remove)
+		yield InputTransaction(insert, remove, datain_gen(stimulus))
 
 @cocotb.coroutine
 def clock_gen(signal):
@@ -204,10 +197,10 @@ def run_test(dut):
 	tb = Testbench(dut, (0, 0))
 	dut.Reset <= 0
 
-	input_gen = random_input_gen()
+	input_gen = random_input_gen(Stimulus())
 
 	# Issue first transaction immediately.
-	yield tb.input_drv.send(input_gen.next(), False)
+	yield tb.input_drv.send(next(input_gen), False)
 
 	# Issue next transactions.
 	for t in input_gen:
@@ -216,7 +209,7 @@ def run_test(dut):
 	# Wait for rising-edge of clock to execute last transaction from above.
 	# Apply idle command in following clock cycle, but stop generation of expected output data.
 	# Finish clock cycle to capture the resulting output from the last transaction above.
-	yield tb.input_drv.send(InputTransaction(0, 0, 0))
+	yield tb.input_drv.send(InputTransaction())
 	tb.stop()
 	yield RisingEdge(dut.Clock)
 
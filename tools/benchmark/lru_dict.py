@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Script:    Micro-benchmark of the LRU containers used by the Cocotb testbenches
+#
+# Description:
+# ------------------------------------
+#		Compares the former OrderedDict based LeastRecentlyUsedDict (delete and
+#		reinsert per update, full rebuild per moveLRU) with the linked-list based
+#		implementation in tb/common/lru_dict.py, and the memory footprint of one
+#		LRU dictionary per cache set with LeastRecentlyUsedSets.
+#
+#		Usage: tools/benchmark/lru_dict.py [<elements>] [<operations>]
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# load dependencies
+import random
+import sys
+import tracemalloc
+from collections        import OrderedDict
+from pathlib            import Path
+from time               import perf_counter
+
+PoCRoot = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PoCRoot / "tb" / "common"))
+
+from lru_dict           import LeastRecentlyUsedDict, LeastRecentlyUsedSets
+
+
+class FormerLeastRecentlyUsedDict(OrderedDict):
+	# the implementation before the linked-list rewrite (iteritems replaced by items)
+	def __init__(self, *args, **kwds):
+		self._size_limit = kwds.pop("size_limit", None)
+		OrderedDict.__init__(self, *args, **kwds)
+		self._check_size_limit()
+
+	def __setitem__(self, key, value):
+		if key in self:
+			del self[key]
+		OrderedDict.__setitem__(self, key, value)
+		self._check_size_limit()
+
+	def _check_size_limit(self):
+		if self._size_limit is not None:
+			while len(self) > self._size_limit:
+				self.popitem(last=False)
+
+	def moveLRU(self, key, value=None):
+		if key in self:
+			old = self.copy()
+			if value is None:
+				value = self[key]
+			self.clear()
+			self[key] = value
+			for k, v in old.items():
+				if k == key: continue
+				self[k] = v
+
+	def peekLRU(self):
+		return next(iter(self.items()))
+
+
+def Workload(elements, operations):
+	# like sort_lru_cache_cocotb: insert (update) or free (moveLRU), then read the LRU key
+	rng = random.Random(42)
+	return [(rng.randint(0, 1), rng.randint(0, elements - 1)) for _ in range(operations)]
+
+def RunSortModel(lruClass, elements, workload):
+	lru = lruClass(size_limit=elements)
+	for key in range(elements - 1, -1, -1):
+		lru[key] = 1
+
+	start = perf_counter()
+	for insert, key in workload:
+		if insert:
+			lru[key] = 1
+		else:
+			lru.moveLRU(key)
+		lru.peekLRU()
+	return perf_counter() - start, list(lru.items())
+
+def MeasureMemory(function):
+	tracemalloc.start()
+	result = function()
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return size, result
+
+def FillSets(lrus, sets, ways):
+	for index in range(sets):
+		for way in range(ways):
+			lrus[index][(way << 16) | index] = way
+	return lrus
+
+def main():
+	elements =    int(sys.argv[1]) if (len(sys.argv) > 1) else 32
+	operations =  int(sys.argv[2]) if (len(sys.argv) > 2) else 100000
+
+	print("LRU benchmark: {0} elements, {1} operations (insert or moveLRU, then peek)".format(elements, operations))
+	workload = Workload(elements, operations)
+	formerTime, formerResult = RunSortModel(FormerLeastRecentlyUsedDict, elements, workload)
+	newTime, newResult =       RunSortModel(LeastRecentlyUsedDict, elements, workload)
+	if (formerResult != newResult):
+		print("ERROR: results differ.")
+		return 1
+	print("  {0:<36} {1:>10.3f} s".format("former LeastRecentlyUsedDict", formerTime))
+	print("  {0:<36} {1:>10.3f} s {2:>7.2f}x".format("LeastRecentlyUsedDict", newTime, formerTime / newTime))
+
+	sets, ways = 1024, 4
+	print("Memory of {0} cache sets with {1} ways (cache_par model):".format(sets, ways))
+	dictSize, dictLrus = MeasureMemory(lambda: FillSets(tuple([LeastRecentlyUsedDict(size_limit=ways) for _ in range(sets)]), sets, ways))
+	setsSize, setsLrus = MeasureMemory(lambda: FillSets(LeastRecentlyUsedSets(sets, ways), sets, ways))
+	if any(list(dictLrus[index].items()) != setsLrus[index].items() for index in range(sets)):
+		print("ERROR: results differ.")
+		return 1
+	print("  {0:<36} {1:>10.1f} KiB".format("LeastRecentlyUsedDict per set", dictSize / 1024))
+	print("  {0:<36} {1:>10.1f} KiB {2:>7.2f}x".format("LeastRecentlyUsedSets", setsSize / 1024, dictSize / setsSize))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
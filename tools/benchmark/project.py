@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Script:    Scaling benchmark of the file sets in Base.Project
+#
+# Description:
+# ------------------------------------
+#		Builds projects with up to the given number of files (default: 10^4; VHDL
+#		files in several libraries, Verilog and constraint files) and compares the
+#		former list based file sets (linear search per insert, full filter per
+#		query) with the hashed file sets and per-type indices of Base.Project.
+#
+#		Usage: tools/benchmark/project.py [<files>] [<queries>]
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# load dependencies
+import sys
+import tracemalloc
+from pathlib            import Path
+from time               import perf_counter
+
+PoCRoot = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PoCRoot / "py"))
+
+from Base.Project       import Project, FileSet, VHDLLibrary, FileTypes, VHDLSourceFile, VerilogSourceFile, ConstraintFile
+
+
+LIBRARIES = ["poc", "osvvm", "unisim", "test", "work"]
+
+
+class ListFileSet(FileSet):
+	"""The former file set: a plain list, deduplicated by a linear search."""
+	def __init__(self, name, project = None):
+		super().__init__(name, project)
+		self._files = []
+
+	@property
+	def Files(self):
+		return self._files
+
+	def _AppendFile(self, file):
+		for f in self._files:
+			if (f.FileName == file.FileName):  break
+		else:
+			self._files.append(file)
+
+class ListVHDLLibrary(VHDLLibrary):
+	def __init__(self, name, project = None):
+		super().__init__(name, project)
+		self._files = []
+
+	@property
+	def Files(self):
+		return self._files
+
+	def AddFile(self, file):
+		file.VHDLLibrary = self
+		for f in self._files:
+			if (f.FileName == file.FileName):  break
+		else:
+			self._files.append(file)
+
+class ListProject(Project):
+	def Files(self, fileType=FileTypes.Any, fileSet=None, vhdlLibrary=None):
+		for file in self._defaultFileSet.Files:
+			if (file.FileType in fileType):
+				yield file
+
+	def ExtractVHDLLibrariesFromVHDLSourceFiles(self):
+		for file in self.Files(fileType=FileTypes.VHDLSourceFile):
+			libraryName = file.LibraryName.lower()
+			if libraryName not in self._vhdlLibraries:
+				self._vhdlLibraries[libraryName] = library =  ListVHDLLibrary(libraryName)
+			else:
+				library = self._vhdlLibraries[libraryName]
+			library.AddFile(file)
+			file.VHDLLibrary = library
+
+
+def CreateFiles(count):
+	# 80% VHDL files, 15% Verilog files, 5% constraint files; every 10th file is added twice
+	files = []
+	for i in range(count):
+		if ((i % 20) < 16):
+			library = LIBRARIES[i % len(LIBRARIES)]
+			files.append(VHDLSourceFile(Path("/poc/src/{0}/file_{1}.vhdl".format(library, i)), library))
+		elif ((i % 20) < 19):
+			files.append(VerilogSourceFile(Path("/poc/src/verilog/file_{0}.v".format(i))))
+		else:
+			files.append(ConstraintFile(Path("/poc/ucf/file_{0}.ucf".format(i))))
+	return files + files[::10]
+
+def Build(projectClass, fileSetClass, files):
+	project = projectClass("bench")
+	project.AddFileSet(fileSetClass("bench", project))
+	project.DefaultFileSet = "bench"
+	for file in files:
+		project.AddFile(file)
+	return project
+
+def Query(project, queries):
+	counts = []
+	for _ in range(queries):
+		counts.append(sum(1 for _ in project.Files(fileType=FileTypes.VHDLSourceFile)))
+		counts.append(sum(1 for _ in project.Files(fileType=FileTypes.VerilogSourceFile)))
+		counts.append(sum(1 for _ in project.Files(fileType=FileTypes.VHDLSourceFile | FileTypes.VerilogSourceFile)))
+	return counts
+
+def Measure(projectClass, fileSetClass, count, queries):
+	files =   CreateFiles(count)
+
+	start =   perf_counter()
+	project = Build(projectClass, fileSetClass, files)
+	build =   perf_counter() - start
+
+	start =   perf_counter()
+	counts =  Query(project, queries)
+	query =   perf_counter() - start
+
+	start =   perf_counter()
+	project.ExtractVHDLLibrariesFromVHDLSourceFiles()
+	extract = perf_counter() - start
+
+	order =   [file.FileName for file in project.Files(fileType=FileTypes.VHDLSourceFile | FileTypes.VerilogSourceFile)]
+	libraries = {library.Name: [file.FileName for file in library.Files] for library in project.VHDLLibraries}
+	return (build, query, extract), (counts, order, libraries)
+
+def MeasureMemory(count):
+	tracemalloc.start()
+	files = CreateFiles(count)
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del files
+	return size / count
+
+def main():
+	maximum = int(sys.argv[1]) if (len(sys.argv) > 1) else 10000
+	queries = int(sys.argv[2]) if (len(sys.argv) > 2) else 10
+
+	print("Project file set benchmark: up to {0} files, {1} queries per file type".format(maximum, queries))
+	print("{0:>8} {1:>10} {2:>10} {3:>10} {4:>10} {5:>10} {6:>10} {7:>8}".format(
+		"files", "add list", "add hash", "query list", "query hash", "libs list", "libs hash", "speedup"))
+	for count in sorted({maximum // 100, maximum // 10, maximum} - {0}):
+		listTimes, listResult = Measure(ListProject, ListFileSet, count, queries)
+		hashTimes, hashResult = Measure(Project, FileSet, count, queries)
+		if (listResult != hashResult):
+			print("ERROR: results differ for {0} files.".format(count))
+			return 1
+
+		print("{0:>8} {1:>8.3f} s {2:>8.3f} s {3:>8.3f} s {4:>8.3f} s {5:>8.3f} s {6:>8.3f} s {7:>7.1f}x".format(
+			count, listTimes[0], hashTimes[0], listTimes[1], hashTimes[1], listTimes[2], hashTimes[2], sum(listTimes) / sum(hashTimes)))
+
+	print("memory per file object: {0:.0f} bytes".format(MeasureMemory(maximum)))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Script:    Benchmark of the rule engine used by all PoC compilers
+#
+# Description:
+# ------------------------------------
+#		Applies the replace rules of the MIG *.rules files in src/xil/mig and
+#		xst/xil/mig to generated files of the given size (default: 8 MiB) and
+#		compares the rule-by-rule implementation (one read, compile and write per
+#		rule) with Base.Compiler.RuleEngine (one pass and one write per file).
+#
+#		Usage: tools/benchmark/rules.py [<file size in MiB>] [<repetitions>]
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# load dependencies
+import re
+import sys
+from pathlib            import Path
+from tempfile           import TemporaryDirectory
+from time               import perf_counter
+
+PoCRoot = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PoCRoot / "py"))
+
+from Base.Compiler      import RuleEngine, ReplaceTask, AppendLineTask
+from Parser.RulesParser import ReplaceRuleMixIn, AppendLineRuleMixIn
+from PoC.Solution       import RulesFile
+
+
+class BenchmarkRulesFile(RulesFile):
+	def Parse(self):
+		# rules files need no project variables, so parse without a PoC project
+		self._Parse()
+		self._Resolve()
+
+
+def Interpolate(value, topLevel):
+	# replace all ${...} references like Compiler._RunPostReplace would do
+	return re.sub(r"\$\{([^}]+)\}", lambda match: topLevel if (match.group(1) == "TopLevel") else "bench", value)
+
+def ReadTasks(rulesFilePath, workingDirectory):
+	topLevel =  rulesFilePath.stem
+	rulesFile = BenchmarkRulesFile(rulesFilePath)
+	rulesFile.Parse()
+
+	tasks = []
+	for rule in rulesFile.PreProcessRules + rulesFile.PostProcessRules:
+		if isinstance(rule, ReplaceRuleMixIn):
+			filePath = workingDirectory / Path(Interpolate(rule.FilePath, topLevel)).name
+			tasks.append(ReplaceTask(filePath, Interpolate(rule.SearchPattern, topLevel), Interpolate(rule.ReplacePattern, topLevel),
+															 rule.RegExpOption_MultiLine, rule.RegExpOption_DotAll, rule.RegExpOption_CaseInsensitive))
+		elif isinstance(rule, AppendLineRuleMixIn):
+			filePath = workingDirectory / Path(Interpolate(rule.FilePath, topLevel)).name
+			tasks.append(AppendLineTask(filePath, Interpolate(rule.AppendPattern, topLevel)))
+	return tasks
+
+def GenerateContent(topLevel, size):
+	# a MIG-like VHDL file: entity with generics, a long architecture body
+	lines = [
+		"entity {0} is".format(topLevel),
+		"  generic (",
+		"    C3_NUM_DQ_PINS : integer := 16;",
+		"    DQ_WIDTH : integer := 64",
+		"  );",
+		"  port (",
+		"    sys_clk : in std_logic",
+		"  );",
+		"end entity;",
+		"",
+		"architecture arc of {0} is".format(topLevel),
+		"  constant C3_CLKOUT2_DIVIDE       : integer := 16;",
+		"  constant C3_CLKFBOUT_MULT        : integer := 2;",
+		"  signal rst0_sync_r               : std_logic_vector(7 downto 0);",
+		"  signal powerup_pll_locked        : std_logic;",
+		"begin",
+		"  se_input_clk : if C_INPUT_CLK_TYPE = \"SINGLE_ENDED\" generate",
+		"  end generate;"
+	]
+	header =  "\n".join(lines) + "\n"
+	footer =  "end  arc;\n"
+	index =   0
+	body =    []
+	length =  len(header) + len(footer)
+	while (length < size):
+		line = "  sig_{0} <= c3_p0_cmd_addr({1} downto 0) when rising_edge(c3_clk0);\n".format(index, index % 30)
+		body.append(line)
+		length += len(line)
+		index +=  1
+	return header + "".join(body) + footer
+
+def RunRuleByRule(tasks):
+	# the implementation before the rule engine: every rule reads, compiles and writes
+	for task in tasks:
+		with task.FilePath.open('r') as fileHandle:
+			content = fileHandle.read()
+		if isinstance(task, AppendLineRuleMixIn):
+			content += task.AppendPattern + "\n"
+		else:
+			regExpFlags = 0
+			if task.RegExpOption_CaseInsensitive: regExpFlags |= re.IGNORECASE
+			if task.RegExpOption_MultiLine:       regExpFlags |= re.MULTILINE
+			if task.RegExpOption_DotAll:          regExpFlags |= re.DOTALL
+			regExp = re.compile(task.SearchPattern, regExpFlags)
+			content, _ = re.subn(regExp, task.ReplacePattern, content)
+		with task.FilePath.open('w') as fileHandle:
+			fileHandle.write(content)
+
+def RunRuleEngine(tasks):
+	RuleEngine().ExecuteReplaceTasks(tasks, "post")
+
+def Measure(function, tasks, contents, repetitions):
+	results = []
+	best =    None
+	for _ in range(repetitions):
+		for filePath, content in contents.items():
+			with filePath.open('w') as fileHandle:
+				fileHandle.write(content)
+		start = perf_counter()
+		function(tasks)
+		duration = perf_counter() - start
+		best =     duration if (best is None) else min(best, duration)
+	for filePath in contents:
+		with filePath.open('r') as fileHandle:
+			results.append(fileHandle.read())
+	return best, results
+
+def main():
+	size =        int(float(sys.argv[1]) * 1024 * 1024) if (len(sys.argv) > 1) else (8 * 1024 * 1024)
+	repetitions = int(sys.argv[2]) if (len(sys.argv) > 2) else 3
+
+	print("Rule engine benchmark: {0:.1f} MiB per file, best of {1} runs".format(size / (1024 * 1024), repetitions))
+	print("{0:<48} {1:>6} {2:>6} {3:>12} {4:>12} {5:>8}".format("rules file", "files", "rules", "rule-by-rule", "rule engine", "speedup"))
+	for rulesFilePath in sorted(PoCRoot.glob("*/xil/mig/*.rules")):
+		with TemporaryDirectory() as tempDirectory:
+			tasks = ReadTasks(rulesFilePath, Path(tempDirectory))
+			if (len(tasks) == 0):
+				continue
+
+			contents = {}
+			for task in tasks:
+				if (task.FilePath not in contents):
+					contents[task.FilePath] = GenerateContent(rulesFilePath.stem, size)
+
+			ruleByRuleTime, ruleByRuleResult =  Measure(RunRuleByRule, tasks, contents, repetitions)
+			ruleEngineTime, ruleEngineResult =  Measure(RunRuleEngine, tasks, contents, repetitions)
+			if (ruleByRuleResult != ruleEngineResult):
+				print("ERROR: results differ for '{0!s}'.".format(rulesFilePath))
+				return 1
+
+			print("{0:<48} {1:>6} {2:>6} {3:>10.3f} s {4:>10.3f} s {5:>7.2f}x".format(
+				str(rulesFilePath.relative_to(PoCRoot)), len(contents), len(tasks), ruleByRuleTime, ruleEngineTime, ruleByRuleTime / ruleEngineTime))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# EMACS settings: -*-	tab-width: 2; indent-tabs-mode: t; python-indent-offset: 2 -*-
+# vim: tabstop=2:shiftwidth=2:noexpandtab
+# kate: tab-width 2; replace-tabs off; indent-width 2;
+#
+# ==============================================================================
+# Authors:          Patrick Lehmann
+#
+# Python Script:    Checks the GHDL wave options read from GTKWave save files
+#
+# Description:
+# ------------------------------------
+#		Converts some of PoC's GTKWave save files (*.gtkw) into GHDL signal paths,
+#		like 'poc.sh ghdl' does for batch mode waveforms, and compares them with
+#		the expected signals. Afterwards, all save files in 'sim' are converted
+#		and checked for malformed signal paths.
+#
+#		Usage: tools/check/gtkwave.py
+#
+# License:
+# ==============================================================================
+# Copyright 2007-2016 Technische Universitaet Dresden - Germany
+#                     Chair for VLSI-Design, Diagnostics and Architecture
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#
+# load dependencies
+import sys
+from pathlib            import Path
+
+PoCRoot = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PoCRoot / "py"))
+
+from Simulator.GHDLSimulator  import Simulator
+
+
+EXPECTED = {
+	"sim/arith/arith_prng_tb.gtkw": [
+		"/arith_prng_tb/clock", "/arith_prng_tb/reset", "/arith_prng_tb/prng_value", "/arith_prng_tb/test_got"
+	],
+	# vectors are only listed by their '#{...}' group lines
+	"sim/sort/sortnet/sortnet_BitonicSort_tb.gtkw": [
+		"/sortnet_bitonicsort_tb/clock", "/sortnet_bitonicsort_tb/generator_valid", "/sortnet_bitonicsort_tb/generator_iskey",
+		"/sortnet_bitonicsort_tb/generator_data", "/sortnet_bitonicsort_tb/generator_meta", "/sortnet_bitonicsort_tb/sort_valid",
+		"/sortnet_bitonicsort_tb/sort_iskey", "/sortnet_bitonicsort_tb/sort_data"
+	],
+	# signals in generate instances, which GTKWave shows as 'gearbox_up_dc_tb[0]'
+	"sim/misc/gearbox/gearbox_up_dc_tb.gtkw": [
+		"/gearbox_up_dc_tb/*/clock1", "/gearbox_up_dc_tb/*/clock2", "/gearbox_up_dc_tb/*/align", "/gearbox_up_dc_tb/*/valid",
+		"/gearbox_up_dc_tb/*/datain", "/gearbox_up_dc_tb/*/dataout"
+	]
+}
+
+
+def IsWellFormed(signal):
+	return (signal.startswith("/") and not signal.startswith("/top/") and ("//" not in signal) and
+					not any(c in signal for c in "[](){} "))
+
+def main():
+	failed = 0
+	for saveFile, expected in sorted(EXPECTED.items()):
+		signals = Simulator._ReadGTKWaveSignals(PoCRoot / saveFile)
+		if (signals != expected):
+			print("ERROR: {0}".format(saveFile))
+			print("  expected: {0}".format(expected))
+			print("  read:     {0}".format(signals))
+			failed += 1
+
+	saveFiles = sorted((PoCRoot / "sim").rglob("*.gtkw"))
+	for saveFile in saveFiles:
+		signals =   Simulator._ReadGTKWaveSignals(saveFile)
+		malformed = [signal for signal in signals if not IsWellFormed(signal)]
+		if ((len(signals) == 0) or (len(malformed) > 0)):
+			print("ERROR: {0!s}: {1} signals, malformed: {2}".format(saveFile.relative_to(PoCRoot), len(signals), malformed))
+			failed += 1
+
+	print("Checked {0} GTKWave save files: {1}".format(len(saveFiles), "FAILED" if failed else "passed"))
+	return 1 if failed else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())